@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Command-line catalog queries, without the desktop app
+Loads the catalog once, runs category/subcategory/domain/text queries and
+streams the matching courses to stdout as TSV, JSON Lines or CSV, or
+serves them over a local HTTP/JSON API
+
+    python -m course_link_getter "python -django" --category Programming
+    python -m course_link_getter - --format jsonl < queries.txt
+    python -m course_link_getter --serve --port 8765
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+# Add the course_link_getter directory to Python path
+app_dir = Path(__file__).parent
+sys.path.insert(0, str(app_dir))
+
+from core.export import EXPORT_FIELDS, write_rows
+from core.server import DEFAULT_HOST, DEFAULT_PORT, serve
+from core.store import SORT_COLUMNS, CatalogStore
+
+DEFAULT_CATALOG = app_dir / "assets" / "catalog.sample.json"
+
+OUTPUT_FORMATS = ("tsv", "jsonl", "csv")
+
+# Columns that --fields can select
+OUTPUT_FIELDS = ("id", "title", "category", "subcategory", "link", "domain")
+
+
+def field_list(text: str) -> List[str]:
+    """argparse type for a comma-separated list of OUTPUT_FIELDS."""
+    fields = [field.strip() for field in text.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in OUTPUT_FIELDS]
+    if unknown or not fields:
+        raise argparse.ArgumentTypeError(
+            f"unknown field(s) {', '.join(unknown) or '(none)'}; choose from {', '.join(OUTPUT_FIELDS)}"
+        )
+    return fields
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m course_link_getter",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("query", nargs="?",
+                        help="search query in the search bar syntax; '-' reads one query per line from "
+                             "stdin and adds a leading 'query' column to the output")
+    parser.add_argument("--catalog", type=Path, default=DEFAULT_CATALOG, help="catalog JSON file")
+    parser.add_argument("--language", default="en", help="language of titles (multilingual catalogs)")
+    parser.add_argument("--no-snapshot", action="store_true",
+                        help="parse the JSON even if a current snapshot exists, and do not write one")
+    parser.add_argument("--category", help="only courses in this category")
+    parser.add_argument("--subcategory", help="only courses in this subcategory")
+    parser.add_argument("--domain", help="only courses whose link is on this domain, host or path")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="tsv", help="output format (default: tsv)")
+    parser.add_argument("--fields", type=field_list, default=list(EXPORT_FIELDS),
+                        help=f"comma-separated output columns (default: {','.join(EXPORT_FIELDS)})")
+    parser.add_argument("--no-header", action="store_true", help="omit the TSV/CSV header row")
+    parser.add_argument("--limit", type=int, help="at most this many courses per query")
+    order = parser.add_mutually_exclusive_group()
+    order.add_argument("--ranked", action="store_true", help="best title matches first")
+    order.add_argument("--sort", choices=SORT_COLUMNS, help="sort by a column instead of catalog order")
+    parser.add_argument("--descending", action="store_true", help="reverse the --sort order")
+    parser.add_argument("--serve", action="store_true",
+                        help="serve the catalog over HTTP (/courses, /courses/<id>, /categories) instead")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"--serve address (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"--serve port (default: {DEFAULT_PORT})")
+    args = parser.parse_args(argv)
+    if args.descending and not args.sort:
+        parser.error("--descending requires --sort")
+    return args
+
+
+def load_store(catalog: Path, language_code: str, use_snapshot: bool) -> Optional[CatalogStore]:
+    """Load the catalog into a compact store, reusing (and refreshing) its snapshot."""
+    store = CatalogStore(compact=True)
+    # Load messages go to stderr, stdout only carries results
+    with contextlib.redirect_stdout(sys.stderr):
+        loaded = store.load_from_json(str(catalog), language_code, use_snapshot=use_snapshot)
+    return store if loaded else None
+
+
+def run_query(store: CatalogStore, query: Optional[str], args: argparse.Namespace) -> Sequence[int]:
+    """Return the positions of the courses matching one query, in output order."""
+    if args.ranked:
+        positions = store.ranked_search(query, args.category, args.subcategory, domain=args.domain)
+    else:
+        positions = store.query_positions(query, args.category, args.subcategory, args.domain)
+        if args.sort:
+            positions = store.sort_positions(positions, args.sort, args.descending)
+    if args.limit is not None:
+        positions = positions[:max(args.limit, 0)]
+    return positions
+
+
+def run(store: CatalogStore, args: argparse.Namespace) -> int:
+    out = sys.stdout.buffer
+    header = not args.no_header
+    if args.query != "-":
+        write_rows(store, run_query(store, args.query, args), out, args.format, args.fields,
+                   language_code=store.language_code, header=header)
+        out.flush()
+        return 0
+
+    for line in sys.stdin:
+        query = line.strip()
+        if not query:
+            continue
+        write_rows(store, run_query(store, query, args), out, args.format, args.fields,
+                   language_code=store.language_code, header=header, constants={"query": query})
+        # One header for the whole batch, and each result out as soon as it is ready
+        header = False
+        out.flush()
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    store = load_store(args.catalog, args.language, use_snapshot=not args.no_snapshot)
+    if store is None:
+        print(f"Failed to load catalog: {args.catalog}", file=sys.stderr)
+        return 1
+    if args.serve:
+        serve(store, args.host, args.port)
+        return 0
+    try:
+        return run(store, args)
+    except BrokenPipeError:
+        # The reader stopped early (e.g. "| head"); silence the flush at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
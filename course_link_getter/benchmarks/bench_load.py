@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Load-time benchmark for CatalogStore validation modes
+Reports the time to turn parsed catalog rows into stored courses, per 100k rows
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add the course_link_getter directory to Python path
+app_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(app_dir))
+
+from bench_memory import make_rows
+from core.models import Course
+from core.store import CatalogStore
+
+
+def time_per_100k(build, rows: list, repeat: int) -> float:
+    """Best-of-``repeat`` seconds for ``build(rows)``, scaled to 100k rows."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build(rows)
+        best = min(best, time.perf_counter() - start)
+    return best * 100_000 / len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000, help="number of synthetic courses")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per mode (best is reported)")
+    args = parser.parse_args()
+
+    # Round-trip through JSON so the rows look exactly like a parsed catalog
+    rows = json.loads(json.dumps(make_rows(args.rows)))
+
+    modes = [
+        ("per-row Course(**row)", lambda r: [Course(**row) for row in r]),
+        ("per-row model_construct", lambda r: [Course.model_construct(**row) for row in r]),
+        ("bulk validated", lambda r: CatalogStore()._make_courses(r, trusted=False)),
+        ("trusted", lambda r: CatalogStore()._make_courses(r, trusted=True)),
+        ("bulk validated, compact", lambda r: CatalogStore(compact=True)._make_courses(r, trusted=False)),
+        ("trusted, compact", lambda r: CatalogStore(compact=True)._make_courses(r, trusted=True)),
+    ]
+
+    print(f"{args.rows} courses, best of {args.repeat}")
+    print(f"{'mode':<26} {'s / 100k rows':>14}")
+    for name, build in modes:
+        print(f"{name:<26} {time_per_100k(build, rows, args.repeat):>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for CatalogStore course storage
+Compares a list of pydantic Course models with the compact columnar backend
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Add the course_link_getter directory to Python path
+app_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(app_dir))
+
+from core.models import Course
+from core.store import CatalogStore
+
+CATEGORIES = {
+    "English": ["IELTS", "TOEIC", "Speaking"],
+    "Programming": ["Python", "Web", "Data"],
+    "Design": ["UI/UX", "Graphic"],
+}
+WORDS = ["Complete", "Guide", "Python", "Web", "Data", "IELTS", "Academic", "Design",
+         "Mastery", "Advanced", "Beginner", "Course", "Speaking", "Graphic", "Bootcamp"]
+
+
+def make_rows(count: int, seed: int = 42) -> list:
+    """Generate synthetic course rows shaped like the sample catalog."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        category = rng.choice(list(CATEGORIES))
+        rows.append({
+            "id": f"course-{i:07d}",
+            "title": " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 6))) + f" {i}",
+            "category": category,
+            "subcategory": rng.choice(CATEGORIES[category]),
+            "link": f"https://www.example.com/courses/{i}",
+        })
+    return rows
+
+
+def measure(payload: str, compact: bool) -> tuple:
+    """Return (course storage bytes, total store bytes) for one backend.
+    
+    The rows are decoded inside the traced region so that the strings the
+    store keeps alive are counted as well.
+    """
+    gc.collect()
+    tracemalloc.start()
+    rows = json.loads(payload)
+    store = CatalogStore(compact=compact)
+    store.courses = store._make_course_storage(Course(**row) for row in rows)
+    del rows
+    gc.collect()
+    storage_bytes, _ = tracemalloc.get_traced_memory()
+    store._rebuild_indexes()
+    total_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    return storage_bytes, total_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000, help="number of synthetic courses")
+    args = parser.parse_args()
+
+    payload = json.dumps(make_rows(args.rows))
+    print(f"{args.rows} courses")
+    print(f"{'backend':<10} {'courses MB':>12} {'bytes/row':>10} {'with indexes MB':>16}")
+    for name, compact in (("pydantic", False), ("columnar", True)):
+        storage_bytes, total_bytes = measure(payload, compact)
+        print(f"{name:<10} {storage_bytes / 1e6:>12.1f} {storage_bytes / args.rows:>10.0f} {total_bytes / 1e6:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
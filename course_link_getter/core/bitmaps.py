@@ -0,0 +1,61 @@
+from collections import deque
+from itertools import compress, repeat
+from operator import setitem
+from typing import Iterable, List, Optional
+
+# Bitmaps with fewer than 1/SPARSE_RATIO of their bits set are read back
+# by searching for the set bits rather than by scanning every row
+SPARSE_RATIO = 32
+
+# Byte-per-row marks <-> ASCII binary digits
+_MARKS_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_DIGITS_TO_MARKS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def to_bitmap(positions: Iterable[int], size: int) -> int:
+    """Return a bitmap (a Python int with bit ``p`` set per position ``p``).
+
+    Row sets are combined with the int operators: ``a & b`` (AND),
+    ``a | b`` (OR), ``a & ~b`` (AND NOT), and ``bitmap.bit_count()``
+    counts the rows. The positions are marked in a bytearray and turned
+    into an int through its binary digits, so building and reading
+    bitmaps run in C like the operators do.
+    """
+    if size <= 0:
+        return 0
+    return int(to_marks(positions, size).translate(_MARKS_TO_DIGITS)[::-1], 2)
+
+
+def to_marks(positions: Iterable[int], size: int) -> bytearray:
+    """Return ``size`` bytes with a 1 at each of the positions and 0 elsewhere."""
+    marks = bytearray(size)
+    if isinstance(positions, range) and positions.step == 1:
+        marks[positions.start:positions.stop] = bytes([1]) * len(positions)
+    else:
+        # operator.setitem maps faster than the bound marks.__setitem__
+        deque(map(setitem, repeat(marks), positions, repeat(1)), maxlen=0)
+    return marks
+
+
+def from_bitmap(bitmap: int, limit: Optional[int] = None) -> List[int]:
+    """Return the sorted positions set in a bitmap (only the first ``limit`` with a limit)."""
+    count = bitmap.bit_count() if limit is None else min(limit, bitmap.bit_count())
+    if not count:
+        return []
+    digits = format(bitmap, 'b').encode('ascii')[::-1]
+    if count * SPARSE_RATIO < len(digits):
+        # Sparse: jump from one set bit to the next instead of visiting every row
+        positions = []
+        find = digits.find
+        position = find(b"1")
+        while len(positions) < count:
+            positions.append(position)
+            position = find(b"1", position + 1)
+        return positions
+    positions = list(compress(range(len(digits)), digits.translate(_DIGITS_TO_MARKS)))
+    return positions if limit is None else positions[:limit]
+
+
+def full_bitmap(size: int) -> int:
+    """Bitmap of all positions below ``size``."""
+    return (1 << size) - 1
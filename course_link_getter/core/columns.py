@@ -0,0 +1,119 @@
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+from .models import Course
+
+# (id, title, category, subcategory, link)
+CourseRow = Tuple[str, Union[str, Dict[str, str]], str, str, str]
+
+
+class CourseColumns(Sequence):
+    """Column-oriented course storage.
+
+    Ids, titles and links live in parallel lists, categories and
+    subcategories are stored once each and referenced by integer code.
+    ``Course`` objects are only built when a row is accessed.
+    """
+
+    def __init__(self, courses: Iterable[Course] = ()):
+        self.ids: List[str] = []
+        self.titles: List[Union[str, Dict[str, str]]] = []
+        self.links: List[str] = []
+        self.category_codes = array('I')
+        self.subcategory_codes = array('I')
+        self.category_names: List[str] = []
+        self.subcategory_names: List[str] = []
+        self._category_lookup: Dict[str, int] = {}
+        self._subcategory_lookup: Dict[str, int] = {}
+        for course in courses:
+            self.append(course)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CourseView(self, range(len(self))[index])
+        return self.course_at(index)
+
+    def append(self, course: Course):
+        """Store a course as one row of the columns."""
+        self.append_row(course.id, course.title, course.category, course.subcategory, course.link)
+
+    def append_row(self, id: str, title: Union[str, Dict[str, str]], category: str, subcategory: str, link: str):
+        """Store one row from raw field values."""
+        self.ids.append(id)
+        self.titles.append(title)
+        self.links.append(link)
+        self.category_codes.append(self._code(category, self.category_names, self._category_lookup))
+        self.subcategory_codes.append(self._code(subcategory, self.subcategory_names, self._subcategory_lookup))
+
+    def extend(self, courses: Iterable[Course]):
+        for course in courses:
+            self.append(course)
+
+    def course_at(self, position: int) -> Course:
+        """Materialize the course stored at ``position``."""
+        if position < 0:
+            position += len(self.ids)
+        return Course.from_trusted({
+            "id": self.ids[position],
+            "title": self.titles[position],
+            "category": self.category_names[self.category_codes[position]],
+            "subcategory": self.subcategory_names[self.subcategory_codes[position]],
+            "link": self.links[position],
+        })
+
+    def iter_rows(self) -> Iterator[CourseRow]:
+        """Iterate raw rows without building Course objects."""
+        categories = self.category_names
+        subcategories = self.subcategory_names
+        for id, title, category_code, subcategory_code, link in zip(
+            self.ids, self.titles, self.category_codes, self.subcategory_codes, self.links
+        ):
+            yield id, title, categories[category_code], subcategories[subcategory_code], link
+
+    def iter_courses(self) -> Iterator[Course]:
+        """Materialize every row in order."""
+        for id, title, category, subcategory, link in self.iter_rows():
+            yield Course.from_trusted({
+                "id": id, "title": title, "category": category, "subcategory": subcategory, "link": link,
+            })
+
+    def view(self, positions: Iterable[int]) -> "CourseView":
+        """Return a lazy sequence of the courses at ``positions``."""
+        return CourseView(self, positions)
+
+    def copy(self) -> "CourseView":
+        return self.view(range(len(self)))
+
+    @staticmethod
+    def _code(name: str, names: List[str], lookup: Dict[str, int]) -> int:
+        code = lookup.get(name)
+        if code is None:
+            code = len(names)
+            name = sys.intern(name)
+            names.append(name)
+            lookup[name] = code
+        return code
+
+
+class CourseView(Sequence):
+    """Lazy, read-only sequence of selected rows of a CourseColumns."""
+
+    def __init__(self, columns: CourseColumns, positions: Iterable[int]):
+        self.columns = columns
+        self.positions = positions if isinstance(positions, (range, array, list)) else list(positions)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CourseView(self.columns, self.positions[index])
+        return self.columns.course_at(self.positions[index])
+
+    def copy(self) -> "CourseView":
+        return CourseView(self.columns, self.positions)
@@ -0,0 +1,305 @@
+import csv
+import json
+import os
+import struct
+import sys
+import threading
+from array import array
+from json.encoder import encode_basestring
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+# Formats understood by export_rows, by file suffix
+EXPORT_FORMATS = {".csv": "csv", ".tsv": "tsv", ".jsonl": "jsonl", ".clgc": "columnar"}
+
+# Columns written when no explicit field list is given
+EXPORT_FIELDS = ("title", "category", "subcategory", "link")
+
+# Rows gathered and written per chunk (and per progress report)
+EXPORT_CHUNK_ROWS = 20000
+
+# Write buffer of the output file
+EXPORT_BUFFER_SIZE = 1024 * 1024
+
+COLUMNAR_MAGIC = b"CLGCOLS\0"
+COLUMNAR_VERSION = 1
+
+# Column encodings of the columnar format
+_PLAIN = 0
+_DICTIONARY = 1
+
+# magic, version, field count
+_COLUMNAR_PREAMBLE = struct.Struct("<8sII")
+_U32 = struct.Struct("<I")
+
+
+class ExportCancelled(Exception):
+    """Raised by export_rows when its cancel event is set."""
+
+
+def export_format(path: str) -> Optional[str]:
+    """Return the export format implied by a file name, or None."""
+    return EXPORT_FORMATS.get(Path(path).suffix.lower())
+
+
+def export_rows(store, positions: Sequence[int], path: str, format: str = "csv",
+                fields: Sequence[str] = EXPORT_FIELDS, language_code: Optional[str] = None,
+                progress: Optional[Callable[[int, int], None]] = None,
+                cancel: Optional[threading.Event] = None,
+                chunk_rows: int = EXPORT_CHUNK_ROWS) -> int:
+    """Write the courses at ``positions`` of a CatalogStore to ``path``.
+
+    Rows are read straight from the store's columns one chunk at a time and
+    written through a large buffer, so memory use does not grow with the
+    size of the export. Titles are written in ``language_code``, by default
+    the store's active language. ``progress(done, total)`` is called after
+    every chunk. Setting ``cancel`` stops the export with ExportCancelled.
+
+    The file is written under a temporary name and renamed into place
+    when complete, so a cancelled or failed export leaves no partial file.
+    Returns the number of rows written.
+    """
+    if format not in _WRITERS:
+        raise ValueError(f"Unknown export format: {format}")
+
+    target = Path(path)
+    temp = target.with_name(target.name + ".tmp")
+    try:
+        with open(temp, 'wb', buffering=EXPORT_BUFFER_SIZE) as f:
+            done = write_rows(store, positions, f, format, fields, language_code,
+                              progress=progress, cancel=cancel, chunk_rows=chunk_rows)
+        os.replace(temp, target)
+        return done
+    except BaseException:
+        try:
+            temp.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def write_rows(store, positions: Sequence[int], f, format: str = "csv",
+               fields: Sequence[str] = EXPORT_FIELDS, language_code: Optional[str] = None,
+               progress: Optional[Callable[[int, int], None]] = None,
+               cancel: Optional[threading.Event] = None,
+               chunk_rows: int = EXPORT_CHUNK_ROWS, header: bool = True,
+               constants: Optional[Dict[str, str]] = None) -> int:
+    """Write the courses at ``positions`` to an open binary file ``f``.
+
+    The streaming part of ``export_rows``, also used to write results to
+    standard output. ``constants`` are extra leading columns with the same
+    value on every row (e.g. the query that produced them), and ``header``
+    controls the header row of CSV and TSV. Returns the number of rows
+    written.
+    """
+    if format not in _WRITERS:
+        raise ValueError(f"Unknown export format: {format}")
+
+    constants = constants or {}
+    writer = _WRITERS[format](f, [*constants, *fields], header)
+    total = len(positions)
+    done = 0
+    for start in range(0, total, chunk_rows):
+        if cancel is not None and cancel.is_set():
+            raise ExportCancelled()
+        chunk = positions[start:start + chunk_rows]
+        columns = [[value] * len(chunk) for value in constants.values()]
+        writer.write_chunk(columns + _read_columns(store, chunk, fields, language_code))
+        done += len(chunk)
+        if progress is not None:
+            progress(done, total)
+    writer.close()
+    return done
+
+
+def _read_columns(store, positions: Sequence[int], fields: Sequence[str],
+                  language_code: Optional[str]) -> List[List[str]]:
+    """Fetch one list of values per field for a chunk of positions."""
+    accessors = {
+        "id": store.id_at,
+        "title": lambda position: store.title_at(position, language_code),
+        "category": store.category_at,
+        "subcategory": store.subcategory_at,
+        "link": store.link_at,
+        "domain": store.domain_at,
+    }
+    return [list(map(accessors[field], positions)) for field in fields]
+
+
+class _CsvWriter:
+    """Header row, then one CSV record per course."""
+
+    def __init__(self, f, fields: Sequence[str], header: bool = True):
+        self.f = f
+        self.buffer = _TextBuffer()
+        self.writer = csv.writer(self.buffer)
+        if header:
+            self.writer.writerow(fields)
+
+    def write_chunk(self, columns: List[List[str]]):
+        self.writer.writerows(zip(*columns))
+        self.f.write(self.buffer.take().encode('utf-8'))
+
+    def close(self):
+        self.f.write(self.buffer.take().encode('utf-8'))
+
+
+class _TsvWriter:
+    """Header row, then one tab-separated line per course.
+
+    Tabs, line breaks and backslashes inside values are written as
+    ``\\t``, ``\\n``, ``\\r`` and ``\\\\``, so every course stays on one line.
+    """
+
+    _ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+    def __init__(self, f, fields: Sequence[str], header: bool = True):
+        self.f = f
+        if header:
+            self.write_chunk([[field] for field in fields])
+
+    def write_chunk(self, columns: List[List[str]]):
+        escaped = [[value.translate(self._ESCAPES) for value in values] for values in columns]
+        self.f.write("".join("\t".join(row) + "\n" for row in zip(*escaped)).encode('utf-8'))
+
+    def close(self):
+        pass
+
+
+class _JsonLinesWriter:
+    """One JSON object per line.
+
+    Values are escaped a column at a time and spliced into a fixed line
+    template, instead of building and dumping a dict per row.
+    """
+
+    def __init__(self, f, fields: Sequence[str], header: bool = True):
+        self.f = f
+        members = ", ".join(json.dumps(field).replace("{", "{{").replace("}", "}}") + ": {}" for field in fields)
+        self.line = "{{" + members + "}}\n"
+
+    def write_chunk(self, columns: List[List[str]]):
+        escaped = [list(map(encode_basestring, values)) for values in columns]
+        self.f.write("".join(map(self.line.format, *escaped)).encode('utf-8'))
+
+    def close(self):
+        pass
+
+
+class _ColumnarWriter:
+    """Column-oriented binary format, one row group per chunk.
+
+    Layout (little-endian)::
+
+        magic, version, field count, then per field: u32 length + UTF-8 name
+        row groups: u32 row count, then per field:
+            u8 encoding
+            plain:      u32 lengths[rows], UTF-8 bytes
+            dictionary: u32 size, u32 lengths[size], UTF-8 bytes, u32 codes[rows]
+        a row group with zero rows ends the file
+
+    Columns with few distinct values per group (categories) are dictionary
+    encoded. ``read_columnar`` reads the format back.
+    """
+
+    def __init__(self, f, fields: Sequence[str], header: bool = True):
+        self.f = f
+        f.write(_COLUMNAR_PREAMBLE.pack(COLUMNAR_MAGIC, COLUMNAR_VERSION, len(fields)))
+        for field in fields:
+            name = field.encode('utf-8')
+            f.write(_U32.pack(len(name)))
+            f.write(name)
+
+    def write_chunk(self, columns: List[List[str]]):
+        if not columns or not columns[0]:
+            return
+        self.f.write(_U32.pack(len(columns[0])))
+        for values in columns:
+            distinct = dict.fromkeys(values)
+            if len(distinct) * 2 <= len(values):
+                codes = {value: code for code, value in enumerate(distinct)}
+                self.f.write(bytes((_DICTIONARY,)))
+                self.f.write(_U32.pack(len(distinct)))
+                self._write_strings(list(distinct))
+                self.f.write(_le_bytes(array('I', map(codes.__getitem__, values))))
+            else:
+                self.f.write(bytes((_PLAIN,)))
+                self._write_strings(values)
+
+    def _write_strings(self, values: List[str]):
+        encoded = [value.encode('utf-8') for value in values]
+        self.f.write(_le_bytes(array('I', map(len, encoded))))
+        self.f.write(b"".join(encoded))
+
+    def close(self):
+        self.f.write(_U32.pack(0))
+
+
+_WRITERS = {"csv": _CsvWriter, "tsv": _TsvWriter, "jsonl": _JsonLinesWriter, "columnar": _ColumnarWriter}
+
+
+def read_columnar(path: str) -> Iterator[Dict[str, Any]]:
+    """Iterate the rows of a columnar export as dictionaries."""
+    with open(path, 'rb') as f:
+        magic, version, field_count = _COLUMNAR_PREAMBLE.unpack(f.read(_COLUMNAR_PREAMBLE.size))
+        if magic != COLUMNAR_MAGIC or version != COLUMNAR_VERSION:
+            raise ValueError(f"Not a columnar export: {path}")
+        fields = [f.read(_read_u32(f)).decode('utf-8') for _ in range(field_count)]
+        while True:
+            rows = _read_u32(f)
+            if rows == 0:
+                return
+            columns = []
+            for _ in fields:
+                encoding = f.read(1)[0]
+                if encoding == _DICTIONARY:
+                    names = _read_strings(f, _read_u32(f))
+                    columns.append([names[code] for code in _read_u32_array(f, rows)])
+                else:
+                    columns.append(_read_strings(f, rows))
+            for values in zip(*columns):
+                yield dict(zip(fields, values))
+
+
+def _read_u32(f) -> int:
+    return _U32.unpack(f.read(_U32.size))[0]
+
+
+def _read_u32_array(f, count: int) -> array:
+    values = array('I')
+    values.frombytes(f.read(count * values.itemsize))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def _read_strings(f, count: int) -> List[str]:
+    lengths = _read_u32_array(f, count)
+    data = f.read(sum(lengths))
+    strings = []
+    offset = 0
+    for length in lengths:
+        strings.append(data[offset:offset + length].decode('utf-8'))
+        offset += length
+    return strings
+
+
+def _le_bytes(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes()
+
+
+class _TextBuffer:
+    """Minimal write-only text sink for csv.writer, emptied after each chunk."""
+
+    def __init__(self):
+        self.parts: List[str] = []
+
+    def write(self, text: str):
+        self.parts.append(text)
+
+    def take(self) -> str:
+        text = "".join(self.parts)
+        self.parts = []
+        return text
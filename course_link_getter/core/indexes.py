@@ -0,0 +1,660 @@
+import heapq
+import itertools
+import re
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .bitmaps import from_bitmap, to_bitmap
+from .text import normalize
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# TitleIndex stops intersecting posting lists once a group has more than
+# PROBE_RATIO times as many positions as there are candidates left; the
+# substring check on the candidates' keys is cheaper from there
+PROBE_RATIO = 4
+
+
+def tokenize(text: str) -> List[str]:
+    """Split already-normalized text into word tokens."""
+    return _TOKEN_RE.findall(text)
+
+
+class TitleIndex:
+    """Inverted index from title tokens to course positions.
+
+    Built once when a catalog is loaded. Every title is stored as its
+    normalized key (see ``core.text.normalize``), and searches keep the
+    substring semantics of ``normalize(query) in key``: the token postings
+    only narrow down the candidates, and every candidate is then checked
+    against its precomputed key.
+    """
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.postings: Dict[str, List[int]] = {}
+        # Postings of the token each title starts with, for title-start ranking
+        self.first_postings: Dict[str, List[int]] = {}
+        self._vocabulary: Optional[List[str]] = None
+        self._vocabulary_blob = ""
+        self._vocabulary_starts: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, title: str):
+        """Index the title of the next course position."""
+        position = len(self.keys)
+        key = normalize(title)
+        self.keys.append(key)
+        for token in set(tokenize(key)):
+            self.postings.setdefault(token, []).append(position)
+        first = _TOKEN_RE.match(key)
+        if first:
+            self.first_postings.setdefault(first.group(), []).append(position)
+        self._vocabulary = None
+
+    def build_vocabulary(self):
+        """Prepare the sorted term list used for prefix and infix lookups."""
+        self._sorted_vocabulary()
+
+    def search(self, text: str, within: Optional[List[int]] = None,
+               within_set: Optional[Set[int]] = None) -> List[int]:
+        """Return sorted positions whose title contains ``text`` (case- and accent-insensitive).
+
+        ``within`` optionally restricts the search to a sorted list of
+        positions, such as a category bucket; ``within_set`` is the same
+        positions as a set, if the caller has one.
+        """
+        query = normalize(text)
+        keys = self.keys
+        if within is not None:
+            candidates = self._candidates(query, limit=len(within))
+            if candidates is None:
+                return [i for i in within if query in keys[i]]
+            candidates = (within_set if within_set is not None else set(within)).intersection(candidates)
+        else:
+            candidates = self._candidates(query, limit=len(keys) // 2)
+        if candidates is None:
+            return [i for i, key in enumerate(keys) if query in key]
+        if _TOKEN_RE.fullmatch(query):
+            # Every candidate holds a term containing the whole query
+            matches = list(candidates)
+        else:
+            matches = [i for i in candidates if query in keys[i]]
+        if isinstance(candidates, set):
+            matches.sort()
+        return matches
+
+    def rank(self, text: str, matches: Sequence[int], limit: int,
+             within: Optional[Set[int]] = None) -> List[int]:
+        """Return the ``limit`` most relevant of ``matches`` (the result of ``search``).
+
+        Matches at the start of the title rank first, then whole-word
+        matches, then matches at the start of a word, then the rest; ties
+        keep catalog order. ``within`` is the set ``matches`` was restricted
+        to, if any. A single-word query is ranked with set operations on the
+        postings and a heap per tier, so a page costs O(N log K); other
+        queries score each match and keep the best K on a heap.
+        """
+        query = normalize(text)
+        if not _TOKEN_RE.fullmatch(query):
+            keys = self.keys
+            whole_word = re.compile(r"(?<!\w)" + re.escape(query) + r"(?!\w)")
+            word_start = re.compile(r"(?<!\w)" + re.escape(query))
+
+            def tier(position: int) -> int:
+                key = keys[position]
+                if key.startswith(query):
+                    return 0
+                if whole_word.search(key):
+                    return 1
+                if word_start.search(key):
+                    return 2
+                return 3
+
+            return heapq.nsmallest(limit, matches, key=lambda position: (tier(position), position))
+
+        prefix_terms = self._prefix_terms(query)
+        title_start = set().union(*(self.first_postings.get(term, ()) for term in prefix_terms))
+        whole_word = set(self.postings.get(query, ()))
+        word_start = set().union(*(self.postings[term] for term in prefix_terms))
+        if within is not None:
+            title_start &= within
+            whole_word &= within
+            word_start &= within
+
+        ranked: List[int] = []
+        for bucket in (title_start, whole_word - title_start, word_start - whole_word - title_start):
+            if len(ranked) >= limit:
+                return ranked
+            ranked.extend(heapq.nsmallest(limit - len(ranked), bucket))
+        if len(ranked) < limit:
+            ranked.extend(heapq.nsmallest(limit - len(ranked), set(matches) - word_start))
+        return ranked
+
+    def _prefix_terms(self, prefix: str) -> List[str]:
+        """Vocabulary terms starting with ``prefix``."""
+        vocabulary = self._sorted_vocabulary()
+        start = bisect_left(vocabulary, prefix)
+        end = start
+        while end < len(vocabulary) and vocabulary[end].startswith(prefix):
+            end += 1
+        return vocabulary[start:end]
+
+    def _candidates(self, query: str, limit: int) -> Optional[Iterable[int]]:
+        """Intersect the posting lists of every query token.
+
+        Returns None when the query has no usable token, or when even the
+        most selective token matches more than ``limit`` positions so that
+        scanning directly is cheaper. A single matching term is returned as
+        its (already sorted) posting list.
+        """
+        groups = self._token_groups(query)
+        if groups is None:
+            return None
+        if not groups:
+            return set()
+
+        if groups[0][0] > limit:
+            return None
+        if len(groups) == 1 and len(groups[0][1]) == 1:
+            return self.postings[groups[0][1][0]]
+        postings = self.postings
+        candidates = set(itertools.chain.from_iterable(postings[t] for t in groups[0][1]))
+        for size, terms in groups[1:]:
+            if size > limit or len(candidates) * PROBE_RATIO < size:
+                break
+            # Probe the group's posting lists instead of building a set of them
+            candidates = candidates.intersection(itertools.chain.from_iterable(postings[t] for t in terms))
+            if not candidates:
+                break
+        return candidates
+
+    def estimate(self, text: str) -> int:
+        """Upper bound on the number of titles containing ``text``, from posting sizes."""
+        groups = self._token_groups(normalize(text))
+        if groups is None:
+            return len(self.keys)
+        return groups[0][0] if groups else 0
+
+    def _token_groups(self, query: str) -> Optional[List[Tuple[int, List[str]]]]:
+        """(posting count, matching terms) per query token, most selective first.
+
+        None when the query has no token, an empty list when some token
+        matches no term at all.
+        """
+        spans = [(m.group(), m.start() > 0, m.end() < len(query)) for m in _TOKEN_RE.finditer(query)]
+        if not spans:
+            return None
+        groups = []
+        for token, closed_left, closed_right in spans:
+            terms = self._matching_terms(token, closed_left, closed_right)
+            if not terms:
+                return []
+            groups.append((sum(len(self.postings[t]) for t in terms), terms))
+        groups.sort(key=lambda group: group[0])
+        return groups
+
+    def _matching_terms(self, token: str, closed_left: bool, closed_right: bool) -> List[str]:
+        """Find vocabulary terms a query token can be part of.
+
+        A token followed by more query text must end a title token, and a
+        token preceded by query text must start one.
+        """
+        if closed_left and closed_right:
+            return [token] if token in self.postings else []
+        if closed_left:
+            return self._prefix_terms(token)
+        if closed_right:
+            return self._scan_vocabulary(token + "\n")
+        return self._scan_vocabulary(token)
+
+    def _scan_vocabulary(self, needle: str) -> List[str]:
+        """Find the terms containing ``needle`` with C-level ``str.find``.
+
+        Terms are stored newline-terminated in one string, so a needle
+        ending in a newline only matches at the end of a term.
+        """
+        vocabulary = self._sorted_vocabulary()
+        blob = self._vocabulary_blob
+        starts = self._vocabulary_starts
+        terms = []
+        offset = blob.find(needle)
+        while offset != -1:
+            term_number = bisect_right(starts, offset) - 1
+            terms.append(vocabulary[term_number])
+            if term_number + 1 == len(starts):
+                break
+            offset = blob.find(needle, starts[term_number + 1])
+        return terms
+
+    def _sorted_vocabulary(self) -> List[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+            self._vocabulary_blob = "".join(term + "\n" for term in self._vocabulary)
+            self._vocabulary_starts = []
+            offset = 0
+            for term in self._vocabulary:
+                self._vocabulary_starts.append(offset)
+                offset += len(term) + 1
+        return self._vocabulary
+
+
+class CategoryIndex:
+    """Hash buckets from category and subcategory names to course positions.
+
+    Every bucket is a sorted list. The (category, subcategory) pair of
+    every position is also kept as an integer code, for counting
+    categories over a result.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.by_category: Dict[str, List[int]] = {}
+        self.by_subcategory: Dict[str, List[int]] = {}
+        self.by_pair: Dict[Tuple[str, str], List[int]] = {}
+        self.pair_names: List[Tuple[str, str]] = []
+        self.pair_codes = array('I')
+        self._pair_lookup: Dict[Tuple[str, str], int] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, category: str, subcategory: str):
+        """Index the category of the next course position."""
+        position = self.count
+        self.count += 1
+        pair = (category, subcategory)
+        code = self._pair_lookup.get(pair)
+        if code is None:
+            code = self._pair_lookup[pair] = len(self.pair_names)
+            self.pair_names.append(pair)
+        self.pair_codes.append(code)
+        self.by_category.setdefault(category, []).append(position)
+        self.by_subcategory.setdefault(subcategory, []).append(position)
+        self.by_pair.setdefault(pair, []).append(position)
+
+    def lookup(self, category: Optional[str] = None, subcategory: Optional[str] = None) -> List[int]:
+        """Return the sorted positions in a category and/or subcategory bucket."""
+        if category and subcategory:
+            return self.by_pair.get((category, subcategory), [])
+        if category:
+            return self.by_category.get(category, [])
+        if subcategory:
+            return self.by_subcategory.get(subcategory, [])
+        return list(range(self.count))
+
+    def pair_counts(self, positions: Optional[Iterable[int]] = None) -> Dict[Tuple[str, str], int]:
+        """Number of courses per (category, subcategory), over ``positions`` or all courses.
+
+        One C-level pass over the pair codes; category and subcategory
+        counts are sums over the (few) pairs.
+        """
+        if positions is None:
+            return {pair: len(bucket) for pair, bucket in self.by_pair.items()}
+        names = self.pair_names
+        code_counts = Counter(map(self.pair_codes.__getitem__, positions))
+        return {names[code]: count for code, count in code_counts.items()}
+
+
+class UniqueIndex:
+    """Dictionary from a key that should be unique (a course id, a link) to its position.
+
+    Lookups return the first position of a key. Later positions with the
+    same key are kept in ``duplicates`` as (key, first position, position),
+    so a load can report them.
+    """
+
+    def __init__(self):
+        self.positions: Dict[str, int] = {}
+        self.duplicates: List[Tuple[str, int, int]] = []
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, key: str):
+        """Index the key of the next position."""
+        position = self.count
+        self.count += 1
+        first = self.positions.setdefault(key, position)
+        if first != position:
+            self.duplicates.append((key, first, position))
+
+    def extend(self, keys: Sequence[str]):
+        """Index the keys of the next positions.
+
+        Into an empty index the dictionary is built in one C-level pass
+        (in reverse, so the first position of a key wins); only when that
+        finds duplicates are the keys added one by one.
+        """
+        if not self.positions:
+            positions = dict(zip(reversed(keys), range(self.count + len(keys) - 1, self.count - 1, -1)))
+            if len(positions) == len(keys):
+                self.positions = positions
+                self.count += len(keys)
+                return
+        for key in keys:
+            self.add(key)
+
+    def get(self, key: str) -> Optional[int]:
+        return self.positions.get(key)
+
+    def get_all(self, key: str) -> List[int]:
+        """Every position with a key, in order."""
+        first = self.positions.get(key)
+        if first is None:
+            return []
+        return [first] + [position for duplicate, _, position in self.duplicates if duplicate == key]
+
+
+# Second-level labels under which country-code TLDs register domains (example.co.uk)
+_SECOND_LEVEL_LABELS = frozenset({"ac", "co", "com", "edu", "gov", "net", "org", "ne", "or", "go", "gv", "nic"})
+
+
+def split_link(link: str) -> Tuple[str, str]:
+    """Return the host (lowercased, without "www.", port or credentials) and the path of a link."""
+    link = link.strip()
+    scheme = link.find("://")
+    host, slash, path = link[scheme + 3 if scheme != -1 else 0:].partition("/")
+    path = slash + path
+    for separator in "?#":
+        if separator in host:
+            host, path = host.partition(separator)[0], ""
+        path = path.partition(separator)[0]
+    if "@" in host:
+        host = host.rpartition("@")[2]
+    if ":" in host:
+        host = host.partition(":")[0]
+    host = host.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return host, path
+
+
+def link_key(link: str) -> str:
+    """Key under which a link must be unique.
+
+    The host as in ``split_link`` (so the scheme and "www." do not count),
+    then the path and query without the fragment or a trailing slash.
+    """
+    link = link.strip()
+    end = link.find("/", link.find("//") + 2)
+    if end == -1:
+        end = len(link)
+    return split_link(link[:end])[0] + _link_tail(link[end:])
+
+
+# Last characters of a link tail that _link_tail removes
+_TAIL_ENDINGS = frozenset("/ \t\r\n")
+
+
+def _link_tail(tail: str) -> str:
+    return tail.partition("#")[0].strip().rstrip("/")
+
+
+def registrable_domain(host: str) -> str:
+    """Guess the registrable domain of a host: "learn.example.co.uk" -> "example.co.uk".
+
+    A heuristic rather than the public suffix list: the last two labels,
+    or three under a country code's common second-level label.
+    """
+    labels = host.split(".")
+    if len(labels) <= 2 or labels[-1].isdigit():
+        return host
+    if len(labels[-1]) == 2 and labels[-2] in _SECOND_LEVEL_LABELS:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+class LinkIndex:
+    """Hash buckets from link hosts, domains and first path segments to positions.
+
+    The registrable domain of every position is also kept as an integer
+    code for counting domains over a result, and every link under its
+    ``link_key`` in ``links``, for finding a course by URL.
+    """
+
+    def __init__(self):
+        self.by_host: Dict[str, List[int]] = {}
+        self.by_domain: Dict[str, List[int]] = {}
+        # (domain, first path segment) -> positions, for path prefix lookups
+        self.by_section: Dict[Tuple[str, str], List[int]] = {}
+        self.domain_names: List[str] = []
+        self.domain_codes = array('I')
+        self.links = UniqueIndex()
+        # "scheme://host" prefix -> (host, domain, domain code); links share few origins
+        self._origins: Dict[str, Tuple[str, str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.domain_codes)
+
+    def add(self, link: str):
+        """Index the link of the next course position."""
+        position = len(self.domain_codes)
+        end = link.find("/", link.find("//") + 2)
+        if end == -1:
+            end = len(link)
+        origin = link[:end]
+        parts = self._origins.get(origin)
+        if parts is None:
+            parts = self._origins[origin] = self._parse_origin(origin)
+        host, domain, code = parts
+        tail = link[end:]
+        if "#" in tail or tail[-1:] in _TAIL_ENDINGS:
+            tail = _link_tail(tail)
+        self.links.add(host + tail)
+        self.domain_codes.append(code)
+        self.by_domain[domain].append(position)
+        self.by_host.setdefault(host, []).append(position)
+        segment = link[end + 1:].partition("/")[0]
+        if "?" in segment or "#" in segment:
+            segment = segment.partition("?")[0].partition("#")[0]
+        if segment:
+            self.by_section.setdefault((domain, segment), []).append(position)
+
+    def _parse_origin(self, origin: str) -> Tuple[str, str, int]:
+        host = split_link(origin)[0]
+        domain = registrable_domain(host)
+        if domain not in self.by_domain:
+            self.by_domain[domain] = []
+            self.domain_names.append(domain)
+        return host, domain, self.domain_names.index(domain)
+
+    def domain_at(self, position: int) -> str:
+        return self.domain_names[self.domain_codes[position]]
+
+    def find(self, link: str) -> Optional[int]:
+        """Position of the (first) course with the same ``link_key`` as ``link``, or None."""
+        return self.links.get(link_key(link))
+
+    def lookup(self, query: str, link_at: Optional[Callable[[int], str]] = None) -> List[int]:
+        """Return the sorted positions whose link is on a domain, host or path prefix.
+
+        ``query`` is a registrable domain ("britishcouncil.org"), a host
+        ("learn.example.co.uk") or either followed by a path prefix
+        ("britishcouncil.org/english"); a scheme and "www." are ignored.
+        The first path segment is a bucket lookup; deeper prefixes are
+        checked against the links with ``link_at``.
+        """
+        host, path = split_link(query)
+        segments = [segment for segment in path.split("/") if segment]
+        domain = host if host in self.by_domain else registrable_domain(host)
+        if segments:
+            positions = self.by_section.get((domain, segments[0]), [])
+        else:
+            positions = self.by_domain.get(domain, [])
+        if host != domain:
+            host_positions = self.by_host.get(host, [])
+            if segments:
+                hosted = set(host_positions)
+                positions = [position for position in positions if position in hosted]
+            else:
+                positions = host_positions
+        if len(segments) > 1 and link_at is not None:
+            prefix = "/" + "/".join(segments)
+            positions = [
+                position for position in positions
+                if (split_link(link_at(position))[1] + "/").startswith(prefix + "/")
+            ]
+        return positions
+
+    def counts(self, positions: Optional[Iterable[int]] = None) -> Dict[str, int]:
+        """Number of courses per domain, over ``positions`` or the whole catalog."""
+        if positions is None:
+            return {domain: len(bucket) for domain, bucket in self.by_domain.items()}
+        names = self.domain_names
+        code_counts = Counter(map(self.domain_codes.__getitem__, positions))
+        return {names[code]: count for code, count in code_counts.items()}
+
+
+# Posting lists of recently matched terms kept as bitmaps by FuzzyIndex
+FUZZY_BITMAP_CACHE_SIZE = 64
+
+
+class _DeadlineReached(Exception):
+    """Raised inside FuzzyIndex.search when its time budget is used up."""
+
+
+def trigrams(term: str) -> Set[str]:
+    """Character trigrams of a term, padded so short terms still have some."""
+    padded = f"${term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyIndex:
+    """Trigram index over the vocabulary of a TitleIndex, for typo-tolerant search.
+
+    Typos happen inside words, so the trigrams of the distinct title terms
+    are indexed rather than whole titles, which keeps the index small.
+    A query token is matched to the terms with the highest Dice similarity
+    of their trigram sets, and titles are scored by how well their terms
+    match every query token.
+    """
+
+    def __init__(self, title_index: TitleIndex):
+        self.title_index = title_index
+        self.size = len(title_index.keys)
+        self.terms = list(title_index._sorted_vocabulary())
+        self.grams: Dict[str, List[int]] = {}
+        self.gram_counts: List[int] = []
+        for term_id, term in enumerate(self.terms):
+            term_grams = trigrams(term)
+            self.gram_counts.append(len(term_grams))
+            for gram in term_grams:
+                self.grams.setdefault(gram, []).append(term_id)
+        self._term_bitmaps: "OrderedDict[str, int]" = OrderedDict()
+
+    def similar_terms(self, token: str, min_similarity: float, limit: int,
+                      deadline: Optional[float] = None) -> List[Tuple[float, str]]:
+        """Return up to ``limit`` (similarity, term) pairs, most similar first."""
+        token_grams = trigrams(token)
+        counts: Counter = Counter()
+        for gram in token_grams:
+            if deadline is not None and time.perf_counter() > deadline:
+                raise _DeadlineReached
+            counts.update(self.grams.get(gram, ()))
+        size = len(token_grams)
+        gram_counts = self.gram_counts
+        scored = []
+        for term_id, shared in counts.items():
+            similarity = 2.0 * shared / (size + gram_counts[term_id])
+            if similarity >= min_similarity:
+                scored.append((similarity, self.terms[term_id]))
+        return heapq.nlargest(limit, scored)
+
+    def search(self, text: str, limit: int, deadline: float, min_similarity: float = 0.3,
+               max_combinations: int = 256, within: Optional[int] = None) -> List[Tuple[float, int]]:
+        """Return up to ``limit`` (score, position) pairs, best first.
+
+        A title's score is the mean over query tokens of the similarity of
+        its best matching term (0 when none matches). Positions are grouped
+        by their best term per token, and the combinations of groups are
+        visited in descending score order with bitmap intersections, so the
+        search stops as soon as ``limit`` results are collected. ``within``
+        is a bitmap of the positions allowed. Work also stops at
+        ``deadline`` (a ``time.perf_counter`` value), checked before every
+        term lookup, group and combination, returning the best matches
+        found so far.
+        """
+        tokens = list(dict.fromkeys(tokenize(normalize(text))))
+        if not tokens:
+            return []
+        # Fewer similar terms per token for long queries keeps the
+        # number of combinations bounded
+        terms_per_token = max(1, int(max_combinations ** (1 / len(tokens))) - 1)
+        postings = self.title_index.postings
+        results: List[Tuple[float, int]] = []
+
+        def check_deadline():
+            if time.perf_counter() > deadline:
+                raise _DeadlineReached
+
+        # Built lazily, since the best combinations usually fill ``limit``:
+        # group i of a token holds the positions whose best term is term i
+        token_groups: List[List[int]] = [[] for _ in tokens]
+        token_matches: List[int] = [0 for _ in tokens]
+
+        def group(t: int, index: int) -> int:
+            groups = token_groups[t]
+            while len(groups) <= index:
+                check_deadline()
+                term_group = self._term_bitmap(token_terms[t][len(groups)][1]) & ~token_matches[t]
+                token_matches[t] |= term_group
+                groups.append(term_group)
+            return groups[index]
+
+        def matches(t: int) -> int:
+            if token_terms[t]:
+                group(t, len(token_terms[t]) - 1)
+            return token_matches[t]
+
+        try:
+            token_terms = [self.similar_terms(token, min_similarity, terms_per_token, deadline) for token in tokens]
+
+            # One choice per token: a term index, or None for "no matching term"
+            combinations = []
+            for choice in itertools.product(*(list(range(len(terms))) + [None] for terms in token_terms)):
+                if all(index is None for index in choice):
+                    continue
+                score = sum(token_terms[t][index][0] for t, index in enumerate(choice) if index is not None)
+                combinations.append((score, choice))
+            combinations.sort(key=lambda combination: -combination[0])
+
+            count = len(tokens)
+            for score, choice in combinations:
+                if len(results) >= limit:
+                    break
+                check_deadline()
+                if count == 1 and choice[0] == 0 and within is None:
+                    # The best term of a one-word query: its posting list is the group
+                    for position in postings[token_terms[0][0][1]][:limit]:
+                        results.append((score, position))
+                    continue
+                positions = -1 if within is None else within
+                for t, index in enumerate(choice):
+                    if index is not None:
+                        positions &= group(t, index)
+                for t, index in enumerate(choice):
+                    if index is None and positions:
+                        positions &= ~matches(t)
+                for position in from_bitmap(positions, limit - len(results)):
+                    results.append((score / count, position))
+        except _DeadlineReached:
+            pass
+        return results
+
+    def _term_bitmap(self, term: str) -> int:
+        """Bitmap of a term's posting list, kept among the recently used."""
+        bitmap = self._term_bitmaps.get(term)
+        if bitmap is not None:
+            self._term_bitmaps.move_to_end(term)
+            return bitmap
+        bitmap = self._term_bitmaps[term] = to_bitmap(self.title_index.postings[term], self.size)
+        if len(self._term_bitmaps) > FUZZY_BITMAP_CACHE_SIZE:
+            self._term_bitmaps.popitem(last=False)
+        return bitmap
@@ -1,7 +1,15 @@
 from pydantic import BaseModel, Field
+from operator import itemgetter
 from typing import List, Dict, Optional, Union
 
 
+def resolve_title(title: Union[str, Dict[str, str]], language_code: str = "en") -> str:
+    """Resolve a plain or multilingual title to a display string."""
+    if isinstance(title, dict):
+        return title.get(language_code, title.get("en", "Unknown Title"))
+    return title
+
+
 class Category(BaseModel):
     """Represents a category with its subcategories."""
     name: str = Field(..., description="Category name")
@@ -16,8 +24,25 @@ class Course(BaseModel):
     subcategory: str = Field(..., description="Subcategory name")
     link: str = Field(..., description="Course URL")
     
+    @classmethod
+    def from_trusted(cls, data: Dict) -> "Course":
+        """Build a course from already-checked data without validation.
+        
+        Cheaper than ``model_construct``, which also resolves aliases and
+        defaults; every Course field is required, so neither applies here.
+        Raises KeyError when a field is missing.
+        """
+        course = cls.__new__(cls)
+        object.__setattr__(course, '__dict__', dict(zip(_COURSE_FIELDS, _get_course_fields(data))))
+        object.__setattr__(course, '__pydantic_fields_set__', set(_COURSE_FIELDS))
+        object.__setattr__(course, '__pydantic_extra__', None)
+        object.__setattr__(course, '__pydantic_private__', None)
+        return course
+    
     def get_title(self, language_code: str = "en") -> str:
         """Get course title in specified language."""
-        if isinstance(self.title, dict):
-            return self.title.get(language_code, self.title.get("en", "Unknown Title"))
-        return self.title
\ No newline at end of file
+        return resolve_title(self.title, language_code)
+
+
+_COURSE_FIELDS = tuple(Course.model_fields)
+_get_course_fields = itemgetter(*_COURSE_FIELDS)
@@ -0,0 +1,109 @@
+import re
+from typing import List, Optional
+
+# Field prefixes understood in queries, and the course field each one searches
+QUERY_FIELDS = {
+    "title": "title",
+    "category": "category",
+    "cat": "category",
+    "sub": "subcategory",
+    "subcategory": "subcategory",
+    "link": "link",
+    "domain": "domain",
+    "site": "domain",
+    "id": "id",
+}
+
+# Optional "-", optional "field:", then a quoted phrase or a bare word
+_CLAUSE_RE = re.compile(r'(-?)(?:(\w+):)?(?:"([^"]*)"?|(\S+))')
+
+
+class QueryClause:
+    """One condition of a query.
+
+    Title, category, subcategory and link clauses match when the field
+    contains ``value`` (case- and accent-insensitively for titles and
+    names, case-insensitively for links); domain clauses match links on a
+    domain, host or path prefix, and id clauses match the exact id.
+    A negated clause excludes the courses it matches.
+    """
+
+    __slots__ = ("field", "value", "negated")
+
+    def __init__(self, field: str, value: str, negated: bool = False):
+        self.field = field
+        self.value = value
+        self.negated = negated
+
+    def __repr__(self) -> str:
+        return f"QueryClause({self.field!r}, {self.value!r}, negated={self.negated})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, QueryClause):
+            return NotImplemented
+        return (self.field, self.value, self.negated) == (other.field, other.value, other.negated)
+
+
+class QueryPlan:
+    """A parsed search query; all of its clauses must hold.
+
+    Built once per query by ``parse_query`` and run by
+    ``CatalogStore.query_positions``, which orders the clauses by how
+    selective they are.
+    """
+
+    def __init__(self, clauses: List[QueryClause]):
+        self.clauses = clauses
+
+    def __repr__(self) -> str:
+        return f"QueryPlan({self.clauses!r})"
+
+    def __bool__(self) -> bool:
+        return bool(self.clauses)
+
+    @property
+    def included(self) -> List[QueryClause]:
+        return [clause for clause in self.clauses if not clause.negated]
+
+    @property
+    def excluded(self) -> List[QueryClause]:
+        return [clause for clause in self.clauses if clause.negated]
+
+    def plain_text(self) -> Optional[str]:
+        """The title text when the query is a single plain title term, else None."""
+        if len(self.clauses) == 1:
+            clause = self.clauses[0]
+            if clause.field == "title" and not clause.negated:
+                return clause.value
+        return None
+
+    def rank_text(self) -> Optional[str]:
+        """The first title term that results must contain, used for ranking."""
+        for clause in self.included:
+            if clause.field == "title":
+                return clause.value
+        return None
+
+
+def parse_query(text: str) -> QueryPlan:
+    """Parse search box text into a QueryPlan.
+
+    Whitespace-separated terms are ANDed; ``"..."`` is a phrase, ``-term``
+    excludes, and ``category:``, ``sub:``, ``link:``, ``domain:`` (or
+    ``site:``), ``id:`` and ``title:`` restrict a term to that field, e.g.
+    ``python -django category:"web development"``. Unknown prefixes such
+    as ``http:`` are part of the term.
+    """
+    clauses = []
+    for match in _CLAUSE_RE.finditer(text):
+        negated, name, quoted, word = match.groups()
+        value = quoted if quoted is not None else word
+        field = QUERY_FIELDS.get(name.lower()) if name else "title"
+        if field is None:
+            # Not a field prefix: the whole token is a title term
+            field = "title"
+            value = match.group(0)[len(negated):]
+        value = value.strip()
+        if value:
+            clauses.append(QueryClause(field, value, bool(negated)))
+    return QueryPlan(clauses)
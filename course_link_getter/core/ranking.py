@@ -0,0 +1,52 @@
+from collections.abc import Sequence
+from typing import Callable, Iterator, List, Optional
+
+
+class RankedPositions(Sequence):
+    """Store positions in relevance (or sort) order, ranked a page at a time.
+
+    ``rank(limit)`` returns the ``limit`` best positions. Only the first
+    page is ranked up front; reading past the ranked prefix ranks again
+    with (at least) twice the limit, so scrolling through a result costs
+    O(N log K) per step instead of a full sort. Iterating the sequence
+    ranks everything in one go. ``members`` holds the same positions in
+    any order, for callers that only need the set.
+    """
+
+    def __init__(self, rank: Callable[[int], List[int]], total: int, page_size: int,
+                 members: Optional[Sequence[int]] = None):
+        self._rank = rank
+        self._total = total
+        self._page_size = page_size
+        self._ranked: List[int] = []
+        self.members = members
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            indices = range(self._total)[index]
+            if indices:
+                self._ensure(max(indices[0], indices[-1]) + 1)
+            return [self._ranked[i] for i in indices]
+        if index < 0:
+            index += self._total
+        if not 0 <= index < self._total:
+            raise IndexError("ranked position index out of range")
+        self._ensure(index + 1)
+        return self._ranked[index]
+
+    def __iter__(self) -> Iterator[int]:
+        self._ensure(self._total)
+        return iter(self._ranked)
+
+    @property
+    def ranked_count(self) -> int:
+        """Number of positions ranked so far."""
+        return len(self._ranked)
+
+    def _ensure(self, count: int):
+        if count > len(self._ranked):
+            limit = max(count, 2 * len(self._ranked), self._page_size)
+            self._ranked = self._rank(min(limit, self._total))
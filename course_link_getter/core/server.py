@@ -0,0 +1,335 @@
+import asyncio
+import io
+import json
+import sys
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, unquote, urlencode, urlsplit
+
+from .export import write_rows
+from .store import CatalogStore
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Courses per page of /courses, by default and at most
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+# Rows per chunk of a streamed /courses response
+STREAM_CHUNK_ROWS = 5000
+
+# Seconds an idle keep-alive connection is kept open
+KEEP_ALIVE_TIMEOUT = 15
+
+# Longest accepted request line plus headers, in bytes
+MAX_HEADER_BYTES = 16 * 1024
+
+# Fields of every course in a JSON response
+COURSE_FIELDS = ("id", "title", "category", "subcategory", "link")
+
+# Streamed formats of /courses, and their content types
+STREAM_FORMATS = {
+    "jsonl": "application/x-ndjson",
+    "tsv": "text/tab-separated-values; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+class HttpError(Exception):
+    """An error response: status and message."""
+
+    def __init__(self, status: HTTPStatus, message: Optional[str] = None):
+        super().__init__(message or status.phrase)
+        self.status = status
+        self.message = message or status.phrase
+
+
+class CatalogServer:
+    """Local HTTP/JSON service over one shared CatalogStore.
+
+    Endpoints (GET or HEAD)::
+
+        /categories              category tree of the active language
+        /courses                 paginated query results
+        /courses/<id>            one course, by id
+
+    /courses takes ``q`` (search bar syntax), ``category``,
+    ``subcategory``, ``domain``, ``ranked=1``, ``offset`` and ``limit``,
+    and returns ``{"total", "offset", "limit", "courses", "next"}``, where
+    ``next`` is the URL of the following page (or null). ``facets=1`` adds
+    the category, subcategory and domain counts. With ``format=jsonl``,
+    ``tsv`` or ``csv`` every match from ``offset`` on (up to ``limit``, if
+    given) is streamed with chunked transfer encoding instead.
+
+    Connections are kept alive (HTTP/1.1 by default, HTTP/1.0 on request)
+    until idle for KEEP_ALIVE_TIMEOUT seconds. Queries run in the default
+    executor, so a slow query does not hold up other connections; the
+    store's lock keeps its indexes consistent.
+    """
+
+    def __init__(self, store: CatalogStore, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.store = store
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+        # Open connections and the tasks serving them, closed along with the server
+        self._connections: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+
+    async def start(self) -> Tuple[str, int]:
+        """Start listening; returns the bound (host, port), so port 0 picks a free one."""
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port,
+                                                  limit=MAX_HEADER_BYTES)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        return self.host, self.port
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Stop listening, close the open (idle keep-alive) connections and wait for them."""
+        if self._server is not None:
+            self._server.close()
+            tasks = list(self._connections.values())
+            for writer in list(self._connections):
+                writer.close()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer requests on one connection until it closes, idles out or asks to close."""
+        self._connections[writer] = asyncio.current_task()
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._send_error(writer, HttpError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE), False)
+                    break
+                try:
+                    method, target, version, headers = _parse_head(head)
+                except HttpError as e:
+                    await self._send_error(writer, e, False)
+                    break
+                keep_alive = _wants_keep_alive(version, headers)
+                # Requests have no use for a body; read it to reach the next request
+                length = headers.get("content-length", "0")
+                if not length.isdigit():
+                    await self._send_error(writer, HttpError(HTTPStatus.BAD_REQUEST, "Bad Content-Length"), False)
+                    break
+                if int(length):
+                    await reader.readexactly(int(length))
+                try:
+                    await self._respond(writer, method, target, keep_alive)
+                except HttpError as e:
+                    await self._send_error(writer, e, keep_alive)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as e:
+                    print(f"Error serving {method} {target}: {e}")
+                    await self._send_error(writer, HttpError(HTTPStatus.INTERNAL_SERVER_ERROR), False)
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _respond(self, writer: asyncio.StreamWriter, method: str, target: str, keep_alive: bool):
+        if method not in ("GET", "HEAD"):
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED)
+        url = urlsplit(target)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        path = url.path.rstrip("/") or "/"
+        head_only = method == "HEAD"
+
+        if path == "/categories":
+            body = [category.model_dump() for category in self.store.list_categories()]
+        elif path == "/courses":
+            stream_format = params.get("format", "json")
+            if stream_format in STREAM_FORMATS:
+                await self._stream_courses(writer, params, stream_format, keep_alive, head_only)
+                return
+            if stream_format != "json":
+                raise HttpError(HTTPStatus.BAD_REQUEST, f"Unknown format: {stream_format}")
+            body = await self._run(self._courses_page, url.path, params)
+        elif path.startswith("/courses/"):
+            body = await self._run(self._course, unquote(path[len("/courses/"):]))
+        else:
+            raise HttpError(HTTPStatus.NOT_FOUND)
+        await self._send(writer, HTTPStatus.OK, _json_bytes(body), "application/json", keep_alive, head_only)
+
+    def _courses_page(self, path: str, params: Dict[str, str]) -> Dict[str, Any]:
+        """One page of /courses."""
+        offset = _int_param(params, "offset", 0)
+        limit = min(_int_param(params, "limit", PAGE_SIZE), MAX_PAGE_SIZE)
+        if limit < 1:
+            # A zero-size page would link to itself as the next page
+            raise HttpError(HTTPStatus.BAD_REQUEST, "limit must be at least 1")
+        positions, facets = self._query(params, with_facets=params.get("facets") == "1")
+        total = len(positions)
+        page = {
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "courses": [self._course_json(position) for position in positions[offset:offset + limit]],
+            "next": None,
+        }
+        if offset + limit < total:
+            page["next"] = f"{path}?{urlencode({**params, 'offset': offset + limit, 'limit': limit})}"
+        if facets is not None:
+            page["facets"] = facets
+        return page
+
+    def _course(self, course_id: str) -> Dict[str, Any]:
+        position = self.store.position_of(course_id)
+        if position is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"No course with id {course_id!r}")
+        return self._course_json(position)
+
+    def _query(self, params: Dict[str, str],
+               with_facets: bool = False) -> Tuple[Sequence[int], Optional[Dict[str, Dict[str, int]]]]:
+        """Positions matching the query parameters (and their facet counts, if asked for)."""
+        query = params.get("q")
+        filters = {
+            "category": params.get("category") or None,
+            "subcategory": params.get("subcategory") or None,
+            "domain": params.get("domain") or None,
+        }
+        ranked = params.get("ranked") == "1"
+        if with_facets:
+            return self.store.search(query, ranked=ranked, **filters)
+        if ranked:
+            return self.store.ranked_search(query, **filters), None
+        return self.store.query_positions(query, **filters), None
+
+    def _course_json(self, position: int) -> Dict[str, str]:
+        store = self.store
+        return {
+            "id": store.id_at(position),
+            "title": store.title_at(position),
+            "category": store.category_at(position),
+            "subcategory": store.subcategory_at(position),
+            "link": store.link_at(position),
+        }
+
+    async def _stream_courses(self, writer: asyncio.StreamWriter, params: Dict[str, str], format: str,
+                              keep_alive: bool, head_only: bool):
+        """Send every match from ``offset`` on as chunks of JSON Lines, TSV or CSV."""
+        offset = _int_param(params, "offset", 0)
+        limit = _int_param(params, "limit", None)
+        positions, _ = await self._run(self._query, params)
+        end = len(positions) if limit is None else min(len(positions), offset + limit)
+        writer.write(_response_head(HTTPStatus.OK, STREAM_FORMATS[format], keep_alive,
+                                    [("Transfer-Encoding", "chunked")]))
+        if head_only:
+            await writer.drain()
+            return
+        # An empty result still gets its CSV/TSV header row
+        for start in range(offset, max(end, offset + 1), STREAM_CHUNK_ROWS):
+            try:
+                chunk = await self._run(self._encode_rows, positions[start:min(start + STREAM_CHUNK_ROWS, end)],
+                                        format, start == offset)
+            except Exception as e:
+                # The status line is already sent; cut the response short instead
+                print(f"Error streaming courses: {e}")
+                raise ConnectionAbortedError(str(e))
+            if chunk:
+                writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    def _encode_rows(self, positions: Sequence[int], format: str, header: bool) -> bytes:
+        buffer = io.BytesIO()
+        write_rows(self.store, positions, buffer, format, COURSE_FIELDS, header=header)
+        return buffer.getvalue()
+
+    async def _run(self, function, *args):
+        """Run store work in the default executor, off the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+    async def _send(self, writer: asyncio.StreamWriter, status: HTTPStatus, body: bytes,
+                    content_type: str, keep_alive: bool, head_only: bool = False):
+        writer.write(_response_head(status, content_type, keep_alive, [("Content-Length", str(len(body)))]))
+        if not head_only:
+            writer.write(body)
+        await writer.drain()
+
+    async def _send_error(self, writer: asyncio.StreamWriter, error: HttpError, keep_alive: bool):
+        body = _json_bytes({"error": error.message, "status": error.status.value})
+        await self._send(writer, error.status, body, "application/json", keep_alive)
+
+
+def _parse_head(head: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+    """Split a request head into (method, target, version, lowercased headers)."""
+    try:
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+    if not version.startswith("HTTP/1."):
+        raise HttpError(HTTPStatus.HTTP_VERSION_NOT_SUPPORTED)
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    return method, target, version, headers
+
+
+def _wants_keep_alive(version: str, headers: Dict[str, str]) -> bool:
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+def _response_head(status: HTTPStatus, content_type: str, keep_alive: bool,
+                   extra: List[Tuple[str, str]]) -> bytes:
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}", f"Content-Type: {content_type}"]
+    lines += [f"{name}: {value}" for name, value in extra]
+    if keep_alive:
+        lines += ["Connection: keep-alive", f"Keep-Alive: timeout={KEEP_ALIVE_TIMEOUT}"]
+    else:
+        lines.append("Connection: close")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def _json_bytes(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def _int_param(params: Dict[str, str], name: str, default: Optional[int]) -> Optional[int]:
+    value = params.get(name)
+    if value is None:
+        return default
+    if not value.isdigit():
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"{name} must be a non-negative integer")
+    return int(value)
+
+
+def serve(store: CatalogStore, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+    """Run a CatalogServer until interrupted."""
+    server = CatalogServer(store, host, port)
+
+    async def main():
+        bound_host, bound_port = await server.start()
+        print(f"Serving {len(store)} courses on http://{bound_host}:{bound_port}", file=sys.stderr)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,161 @@
+import hashlib
+import io
+import json
+import mmap
+import os
+import pickle
+import struct
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Bump whenever the pickled payload layout changes
+SNAPSHOT_VERSION = 8
+SNAPSHOT_MAGIC = b"CLGSNAP\0"
+SNAPSHOT_SUFFIX = ".snapshot"
+
+# magic, version, header length
+_PREAMBLE = struct.Struct("<8sII")
+
+
+def snapshot_path(source: Path) -> Path:
+    """Return the snapshot location for a JSON catalog (next to the source)."""
+    return source.with_name(source.name + SNAPSHOT_SUFFIX)
+
+
+def source_fingerprint(source: Path) -> Dict[str, Any]:
+    """Describe the exact catalog file a snapshot was built from."""
+    stat = source.stat()
+    digest = hashlib.sha256()
+    with open(source, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return {
+        "path": str(source.resolve()),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": digest.hexdigest(),
+    }
+
+
+class _FrameWriter:
+    """Collects pickle output through a Python-level ``write``.
+
+    The pickler calls it once per frame (about 64 KiB), and calls into
+    Python code are where the interpreter lets other threads run, so
+    pickling a large payload in the background does not hold the GIL
+    (and freeze the UI thread) for the whole dump.
+    """
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def write(self, data) -> int:
+        return self.buffer.write(data)
+
+
+class _FrameReader:
+    """Feeds a buffer to the unpickler through Python-level reads (see _FrameWriter)."""
+
+    def __init__(self, view: memoryview):
+        self.view = view
+        self.offset = 0
+
+    def read(self, size: int = -1) -> bytes:
+        start = self.offset
+        self.offset = len(self.view) if size < 0 else min(start + size, len(self.view))
+        return bytes(self.view[start:self.offset])
+
+    def readinto(self, buffer) -> int:
+        count = min(len(buffer), len(self.view) - self.offset)
+        buffer[:count] = self.view[self.offset:self.offset + count]
+        self.offset += count
+        return count
+
+    def readline(self) -> bytes:
+        end = bytes(self.view[self.offset:]).find(b"\n")
+        return self.read(-1 if end < 0 else end + 1)
+
+
+def encode_payload(payload: Dict[str, Any]) -> bytes:
+    """Serialize a snapshot payload for ``write_snapshot``."""
+    writer = _FrameWriter()
+    pickle.dump(payload, writer, protocol=pickle.HIGHEST_PROTOCOL)
+    return writer.buffer.getvalue()
+
+
+def write_snapshot(source: Path, data: bytes) -> bool:
+    """Write an encoded payload to the snapshot file of ``source``.
+
+    The file is written under a temporary name and renamed into place, so
+    a reader never sees a partially written snapshot.
+    """
+    target = snapshot_path(source)
+    temp = target.with_name(target.name + ".tmp")
+    try:
+        header = json.dumps(source_fingerprint(source)).encode('utf-8')
+        with open(temp, 'wb') as f:
+            f.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header)))
+            f.write(header)
+            f.write(data)
+        # Not writable by others whatever the umask, or read_snapshot would refuse it
+        os.chmod(temp, 0o644)
+        os.replace(temp, target)
+        return True
+    except Exception as e:
+        print(f"Error writing catalog snapshot: {e}")
+        try:
+            temp.unlink()
+        except OSError:
+            pass
+        return False
+
+
+def _is_private(path: Path) -> bool:
+    """Whether only the current user can have written ``path`` (always True off POSIX)."""
+    if not hasattr(os, "getuid"):
+        return True
+    stat = path.stat()
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
+
+def read_snapshot(source: Path) -> Optional[Dict[str, Any]]:
+    """Load the snapshot of ``source`` if it exists and is still current.
+
+    Returns None when the snapshot is missing, was written by another
+    snapshot version, or does not match the source path, modification
+    time, size or content hash.
+
+    Snapshots are pickles, and unpickling can run arbitrary code, so on
+    POSIX a snapshot is only read if the current user owns it and nobody
+    else can write to it. The file is memory-mapped so that the pickle is
+    read in place rather than copied into memory first; unpickling still
+    rebuilds every object.
+    """
+    target = snapshot_path(source)
+    if not target.exists() or not source.exists():
+        return None
+    if not _is_private(target):
+        print(f"Ignoring catalog snapshot not owned by this user or writable by others: {target}")
+        return None
+    try:
+        with open(target, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            magic, version, header_length = _PREAMBLE.unpack_from(mapped, 0)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                return None
+            header_end = _PREAMBLE.size + header_length
+            header = json.loads(mapped[_PREAMBLE.size:header_end].decode('utf-8'))
+
+            # Cheap checks first; the content hash needs a full read
+            stat = source.stat()
+            if (header.get("path") != str(source.resolve())
+                    or header.get("mtime_ns") != stat.st_mtime_ns
+                    or header.get("size") != stat.st_size):
+                return None
+            if header != source_fingerprint(source):
+                return None
+
+            with memoryview(mapped) as view, view[header_end:] as data:
+                return pickle.load(_FrameReader(data))
+    except Exception as e:
+        print(f"Ignoring unreadable catalog snapshot: {e}")
+        return None
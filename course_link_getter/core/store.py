@@ -1,32 +1,150 @@
+import gc
 import json
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import compress, islice, repeat
+from operator import getitem
 from pathlib import Path
-from typing import List, Optional
-from .models import Course, Category
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from pydantic import TypeAdapter, ValidationError
+from .models import Course, Category, resolve_title
+from .bitmaps import from_bitmap, full_bitmap, to_bitmap, to_marks
+from .columns import CourseColumns, CourseRow
+from .indexes import CategoryIndex, FuzzyIndex, LinkIndex, TitleIndex, UniqueIndex
+from .query import QueryClause, QueryPlan, parse_query
+from .ranking import RankedPositions
+from .snapshot import encode_payload, read_snapshot, write_snapshot
+from .streaming import iter_json_object
+from .text import normalize
+
+
+# Number of recent text queries kept for incremental refinement
+QUERY_CACHE_SIZE = 32
+
+# Most recently used bucket/term bitmaps and bucket sets kept
+BITMAP_CACHE_SIZE = 128
+BUCKET_SET_CACHE_SIZE = 8
+
+# Columns results can be sorted by
+SORT_COLUMNS = ("title", "category", "subcategory")
+
+# Results larger than 1/SORT_SCAN_RATIO of the catalog are sorted by
+# scanning the precomputed order instead of a comparison sort
+SORT_SCAN_RATIO = 8
+
+# A title clause is checked against the rows the other clauses left when
+# the term matches over CLAUSE_SCAN_RATIO times as many rows; otherwise
+# its catalog-wide bitmap is built (and cached)
+CLAUSE_SCAN_RATIO = 8
+
+# Typo-tolerant search: ranked results returned, and time budget per query
+FUZZY_LIMIT = 500
+FUZZY_BUDGET_MS = 20
+
+# Relevance-ranked search: positions ranked per page
+RANKED_PAGE_SIZE = 1000
+
+# Validates a whole list of course rows in one pydantic-core call
+_COURSE_LIST_ADAPTER = TypeAdapter(List[Course])
+
+
+@contextmanager
+def _gc_paused():
+    """Pause the cyclic garbage collector while building many objects.
+    
+    Course rows never form reference cycles, but every allocation still
+    counts towards a collection, so bulk loads spend much of their time in
+    collector passes that find nothing.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
 
 
 class CatalogStore:
-    """Manages course catalog data loading, saving, and querying."""
+    """Manages course catalog data loading, saving, and querying.
     
-    def __init__(self):
-        self.courses: List[Course] = []
+    With ``compact=True`` courses are kept in a column-oriented
+    CourseColumns instead of a list of Course models, and ``list_all`` /
+    ``filter`` return lazy sequences that build Course objects on access.
+    """
+    
+    def __init__(self, compact: bool = False):
+        self.compact = compact
+        self.courses: Sequence[Course] = self._make_course_storage()
         self.categories: List[Category] = []
+        # Category tree of every catalog language; ``categories`` is the active one
+        self._category_trees: Dict[str, List[Category]] = {}
+        # Per-row problems found by the last load ("courses[12]: link: Field required")
+        self.load_errors: List[str] = []
+        # Indices in the catalog's courses array of the rows the last load skipped
+        self._skipped_rows: List[int] = []
+        # Language of display titles, title search and title sorting
+        self.language_code = "en"
+        # Per language: display title of every position, and its search index
+        self._title_tables: Dict[str, List[str]] = {}
+        self._title_indexes: Dict[str, TitleIndex] = {}
+        self._titles: List[str] = []
+        self._title_index = TitleIndex()
+        # Trigram index over the active title vocabulary, built on first fuzzy search
+        self._fuzzy_index: Optional[FuzzyIndex] = None
+        self._category_index = CategoryIndex()
+        # Host, domain and path buckets of the course links, and each link's position
+        self._link_index = LinkIndex()
+        # Position of every course id
+        self._id_index = UniqueIndex()
+        # Guards the indexes and query cache when filtering from worker threads
+        self._lock = threading.RLock()
+        # One FuzzyIndex build at a time (it runs outside ``_lock``)
+        self._fuzzy_build_lock = threading.Lock()
+        # Keyed by (category, subcategory, domain, normalized query)
+        self._query_cache: "OrderedDict[Tuple[Optional[str], Optional[str], Optional[str], str], List[int]]" = OrderedDict()
+        # Category/domain buckets as sets, for membership tests (LRU)
+        self._bucket_sets: "OrderedDict[Tuple[Optional[str], Optional[str], Optional[str]], Set[int]]" = OrderedDict()
+        # Bitmaps of index buckets and title matches, keyed by (kind, name) (LRU)
+        self._bitmaps: "OrderedDict[Tuple[str, Any], int]" = OrderedDict()
+        # Per sort column: (positions in sorted order, rank of every position)
+        self._sort_orders: Dict[str, Tuple[array, array]] = {}
     
-    def load_from_json(self, path: str, language_code: str = "en") -> bool:
-        """Load catalog data from JSON file with language support."""
+    def load_from_json(self, path: str, language_code: str = "en", use_snapshot: bool = False,
+                       trusted: bool = False) -> bool:
+        """Load catalog data from JSON file with language support.
+        
+        With ``use_snapshot`` a current binary snapshot is loaded instead when
+        there is one. Invalid rows are skipped and reported in ``load_errors``;
+        ``trusted`` skips validation.
+        """
+        self.load_errors = []
+        self._skipped_rows = []
+        self.language_code = language_code
         try:
             json_path = Path(path)
             if not json_path.exists():
                 print(f"Catalog file not found: {json_path}")
                 return False
             
+            if use_snapshot and self.load_snapshot(str(json_path), language_code):
+                return True
+            
             with open(json_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
             # Check if this is a multilingual catalog
             if 'metadata' in data and 'categories' in data and isinstance(data['categories'], dict):
-                return self._load_multilingual_catalog(data, language_code)
+                loaded = self._load_multilingual_catalog(data, language_code, trusted)
             else:
-                return self._load_legacy_catalog(data)
+                loaded = self._load_legacy_catalog(data, trusted)
+            
+            if loaded and use_snapshot:
+                self.save_snapshot(str(json_path))
+            return loaded
                 
         except (json.JSONDecodeError, KeyError) as e:
             print(f"Error parsing catalog data: {e}")
@@ -35,43 +153,374 @@ class CatalogStore:
             print(f"Error loading catalog: {e}")
             return False
     
-    def _load_multilingual_catalog(self, data: dict, language_code: str) -> bool:
+    def iter_load_json(self, path: str, language_code: str = "en", batch_size: int = 1000,
+                       use_snapshot: bool = False, trusted: bool = False) -> Iterator[Sequence[Course]]:
+        """Load catalog data incrementally, yielding the courses in batches.
+        
+        The ``courses`` array is parsed element by element, and every batch is
+        added to the store and its indexes before it is yielded, so callers
+        can show the first courses while the rest of the file is still read.
+        ``use_snapshot`` and ``trusted`` work as in ``load_from_json``.
+        """
+        self.load_errors = []
+        self._skipped_rows = []
+        self.language_code = language_code
+        json_path = Path(path)
+        if not json_path.exists():
+            print(f"Catalog file not found: {json_path}")
+            return
+        
+        if use_snapshot and self.load_snapshot(str(json_path), language_code):
+            for start in range(0, len(self.courses), batch_size):
+                yield self.courses[start:start + batch_size]  # lazy views of the columns
+            return
+        
+        with self._lock:
+            self.courses = self._make_course_storage()
+            self._set_category_trees({})
+            self._rebuild_indexes()
+        
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                rows = []
+                offset = 0
+                for key, value in iter_json_object(f, stream_key='courses'):
+                    if key == 'courses':
+                        rows.append(value)
+                        if len(rows) >= batch_size:
+                            batch = self._parse_courses(rows, trusted, offset)
+                            offset += len(rows)
+                            rows = []
+                            self._append_courses(batch)
+                            yield batch
+                    elif key == 'categories':
+                        # Multilingual catalogs keep one category list per language
+                        if not isinstance(value, dict):
+                            value = {'en': value}
+                        self._set_category_trees({
+                            code: self._build_categories(categories) for code, categories in value.items()
+                        })
+                if rows:
+                    batch = self._parse_courses(rows, trusted, offset)
+                    self._append_courses(batch)
+                    yield batch
+            
+            self._record_duplicates()
+            self._report_load_errors()
+            if use_snapshot:
+                self.save_snapshot(str(json_path))
+        except (json.JSONDecodeError, KeyError) as e:
+            print(f"Error parsing catalog data: {e}")
+        except Exception as e:
+            print(f"Error loading catalog: {e}")
+    
+    def save_snapshot(self, path: str) -> bool:
+        """Write the loaded courses and indexes (all languages) to a snapshot next to ``path``.
+        
+        The lock is only held to collect the tables and indexes; pickling
+        them, hashing the source and writing the file run without it. If
+        courses are added meanwhile, nothing is written.
+        """
+        with self._lock:
+            self._ensure_indexes()
+            courses = self.courses
+            count = len(courses)
+            columns = courses if isinstance(courses, CourseColumns) else CourseColumns(courses)
+            payload = {
+                "category_trees": {
+                    code: [cat.model_dump() for cat in categories]
+                    for code, categories in self._category_trees.items()
+                },
+                "columns": columns,
+                "title_tables": dict(self._title_tables),
+                "title_indexes": dict(self._title_indexes),
+                "category_index": self._category_index,
+                "link_index": self._link_index,
+                "id_index": self._id_index,
+                "load_errors": list(self.load_errors),
+            }
+        data = encode_payload(payload)
+        with self._lock:
+            if self.courses is not courses or len(courses) != count:
+                print("Catalog changed while the snapshot was written; skipping it")
+                return False
+        return write_snapshot(Path(path), data)
+    
+    def load_snapshot(self, path: str, language_code: str = "en") -> bool:
+        """Load courses and prebuilt indexes from a current snapshot of ``path``.
+        
+        ``language_code`` becomes the active language. The courses stay in
+        the snapshot's column layout with either backend, so no Course
+        objects are built until rows are read.
+        """
+        payload = read_snapshot(Path(path))
+        if payload is None:
+            return False
+        
+        columns = payload["columns"]
+        with self._lock:
+            self.courses = columns
+            self._set_category_trees({
+                code: self._build_categories(categories)
+                for code, categories in payload["category_trees"].items()
+            })
+            self._title_tables = payload["title_tables"]
+            self._title_indexes = payload["title_indexes"]
+            self._category_index = payload["category_index"]
+            self._link_index = payload["link_index"]
+            self._id_index = payload["id_index"]
+            self.load_errors = list(payload.get("load_errors", []))
+            self._activate_language(language_code)
+            self.categories = self._categories_for(language_code)
+        self._report_load_errors()
+        return True
+    
+    def _parse_courses(self, rows: list, trusted: bool, offset: int = 0) -> List[Course]:
+        """Build Course models from raw rows, recording invalid rows in ``load_errors``.
+        
+        ``offset`` is the index of the first row in the catalog's courses
+        array, used in error messages.
+        """
+        with _gc_paused():
+            if trusted:
+                courses = []
+                for index, row in enumerate(rows, offset):
+                    try:
+                        courses.append(Course.from_trusted(row))
+                    except (KeyError, TypeError) as e:
+                        self.load_errors.append(f"courses[{index}]: missing field {e}")
+                        self._skipped_rows.append(index)
+                return courses
+            return self._validate_courses(rows, offset)
+    
+    def _validate_courses(self, rows: list, offset: int) -> List[Course]:
+        """Validate rows in bulk; on failure drop and report the invalid ones."""
+        try:
+            return _COURSE_LIST_ADAPTER.validate_python(rows)
+        except ValidationError as e:
+            problems = {}
+            for error in e.errors():
+                if not error['loc'] or not isinstance(error['loc'][0], int):
+                    raise
+                field = ".".join(str(part) for part in error['loc'][1:]) or "row"
+                problems.setdefault(error['loc'][0], []).append(f"{field}: {error['msg']}")
+            for index, messages in sorted(problems.items()):
+                self.load_errors.append(f"courses[{index + offset}]: {'; '.join(messages)}")
+                self._skipped_rows.append(index + offset)
+            valid_rows = [row for index, row in enumerate(rows) if index not in problems]
+            return _COURSE_LIST_ADAPTER.validate_python(valid_rows)
+    
+    def _make_courses(self, rows: list, trusted: bool) -> Sequence[Course]:
+        """Create the course container for a full load from raw rows."""
+        if not (trusted and self.compact):
+            return self._make_course_storage(self._parse_courses(rows, trusted))
+        
+        # Trusted compact loads copy fields straight into the columns
+        columns = CourseColumns()
+        with _gc_paused():
+            for index, row in enumerate(rows):
+                try:
+                    columns.append_row(row['id'], row['title'], row['category'], row['subcategory'], row['link'])
+                except (KeyError, TypeError) as e:
+                    self.load_errors.append(f"courses[{index}]: missing field {e}")
+                    self._skipped_rows.append(index)
+        return columns
+    
+    def _record_duplicates(self):
+        """Add the duplicate course ids and links of the loaded catalog to ``load_errors``.
+        
+        Duplicates are kept in the store; ``get`` and ``find_by_link``
+        return the first course with the id or link.
+        """
+        row = self._source_row
+        for course_id, first, position in self._id_index.duplicates:
+            self.load_errors.append(
+                f"courses[{row(position)}]: duplicate id {course_id!r}, first used by courses[{row(first)}]"
+            )
+        for _, first, position in self._link_index.links.duplicates:
+            self.load_errors.append(
+                f"courses[{row(position)}]: duplicate link {self.link_at(position)!r}, "
+                f"first used by courses[{row(first)}]"
+            )
+    
+    def _source_row(self, position: int) -> int:
+        """Index in the catalog's courses array of the course at a store position."""
+        row = position
+        for skipped in self._skipped_rows:
+            if skipped > row:
+                break
+            row += 1
+        return row
+    
+    def _report_load_errors(self):
+        """Print a summary of the problems found by the last load."""
+        if not self.load_errors:
+            return
+        print(f"Found {len(self.load_errors)} catalog problems (invalid courses are skipped):")
+        for message in self.load_errors[:10]:
+            print(f"  {message}")
+        if len(self.load_errors) > 10:
+            print(f"  ... and {len(self.load_errors) - 10} more")
+    
+    def _make_course_storage(self, courses: Iterable[Course] = ()) -> Sequence[Course]:
+        """Create the course container for the configured backend."""
+        if self.compact:
+            return CourseColumns(courses)
+        return list(courses)
+    
+    def _iter_rows(self) -> Iterator[CourseRow]:
+        """Iterate raw course fields without materializing compact rows."""
+        if isinstance(self.courses, CourseColumns):
+            return self.courses.iter_rows()
+        return ((c.id, c.title, c.category, c.subcategory, c.link) for c in self.courses)
+    
+    def _select(self, positions: List[int]) -> Sequence[Course]:
+        """Return the courses at the given positions."""
+        if isinstance(self.courses, CourseColumns):
+            return self.courses.view(positions)
+        return [self.courses[i] for i in positions]
+    
+    def _build_categories(self, categories_data: list) -> List[Category]:
+        """Build Category models from raw catalog entries."""
+        return [
+            Category(
+                name=cat_data['name'],
+                subcategories=cat_data.get('subcategories', [])
+            )
+            for cat_data in categories_data
+        ]
+    
+    def _set_category_trees(self, trees: Dict[str, List[Category]]):
+        """Keep every language's categories and select the active language's."""
+        self._category_trees = trees
+        self.categories = self._categories_for(self.language_code)
+    
+    def _categories_for(self, language_code: str) -> List[Category]:
+        """Categories of a language, falling back to English like titles do."""
+        return self._category_trees.get(language_code, self._category_trees.get('en', []))
+    
+    def _append_courses(self, courses: List[Course]):
+        """Add courses to the store and extend the indexes in place."""
+        with self._lock:
+            for course in courses:
+                if isinstance(course.title, dict):
+                    for language_code in course.title.keys() - self._title_tables.keys():
+                        self._add_language(language_code)
+                self.courses.append(course)
+                for language_code, table in self._title_tables.items():
+                    title = resolve_title(course.title, language_code)
+                    table.append(title)
+                    self._title_indexes[language_code].add(title)
+                self._category_index.add(course.category, course.subcategory)
+                self._link_index.add(course.link)
+                self._id_index.add(course.id)
+            self._query_cache.clear()
+            self._sort_orders.clear()
+            self._bucket_sets.clear()
+            self._bitmaps.clear()
+            self._fuzzy_index = None
+    
+    def _load_multilingual_catalog(self, data: dict, language_code: str, trusted: bool = False) -> bool:
         """Load multilingual catalog data."""
         try:
-            # Load categories for the specified language
-            categories_data = data['categories'].get(language_code, data['categories'].get('en', []))
-            self.categories = []
-            for cat_data in categories_data:
-                category = Category(
-                    name=cat_data['name'],
-                    subcategories=cat_data.get('subcategories', [])
-                )
-                self.categories.append(category)
+            # Keep the categories of every language; the requested one is active
+            self._set_category_trees({
+                code: self._build_categories(categories) for code, categories in data['categories'].items()
+            })
             
             # Load courses (multilingual data is handled by Course model)
-            self.courses = [Course(**course_data) for course_data in data.get('courses', [])]
+            self.courses = self._make_courses(data.get('courses', []), trusted)
+            self._rebuild_indexes()
+            self._record_duplicates()
+            self._report_load_errors()
             return True
         except Exception as e:
             print(f"Error loading multilingual catalog: {e}")
             return False
     
-    def _load_legacy_catalog(self, data: dict) -> bool:
+    def _load_legacy_catalog(self, data: dict, trusted: bool = False) -> bool:
         """Load legacy single-language catalog data."""
         try:
-            self.categories = []
-            for cat_data in data.get('categories', []):
-                category = Category(
-                    name=cat_data['name'],
-                    subcategories=cat_data.get('subcategories', [])
-                )
-                self.categories.append(category)
-            
-            self.courses = [Course(**course_data) for course_data in data.get('courses', [])]
+            self._set_category_trees({'en': self._build_categories(data.get('categories', []))})
+            
+            self.courses = self._make_courses(data.get('courses', []), trusted)
+            self._rebuild_indexes()
+            self._record_duplicates()
+            self._report_load_errors()
             return True
         except Exception as e:
             print(f"Error loading legacy catalog: {e}")
             return False
     
+    def _rebuild_indexes(self):
+        """Rebuild the search indexes from the current course list.
+        
+        A display title table and a title index are built for every language
+        that occurs in a title (plus English and the active language), so
+        switching language never re-reads the catalog.
+        """
+        with self._lock:
+            self._category_index = CategoryIndex()
+            self._link_index = LinkIndex()
+            languages = {"en", self.language_code}
+            for _, title, category, subcategory, link in self._iter_rows():
+                if isinstance(title, dict):
+                    languages.update(title)
+                self._category_index.add(category, subcategory)
+                self._link_index.add(link)
+            self._id_index = UniqueIndex()
+            self._id_index.extend(self.courses.ids if isinstance(self.courses, CourseColumns)
+                                  else [course.id for course in self.courses])
+            self._title_tables = {}
+            self._title_indexes = {}
+            for language_code in sorted(languages):
+                self._add_language(language_code)
+            self._activate_language(self.language_code)
+    
+    def _add_language(self, language_code: str):
+        """Build the title table and index of one language for the stored courses."""
+        table = [resolve_title(title, language_code) for _, title, _, _, _ in self._iter_rows()]
+        index = TitleIndex()
+        for title in table:
+            index.add(title)
+        index.build_vocabulary()
+        self._title_tables[language_code] = table
+        self._title_indexes[language_code] = index
+    
+    def _activate_language(self, language_code: str):
+        """Point display, search and title sorting at one language's tables."""
+        if language_code not in self._title_tables:
+            self._add_language(language_code)
+        self.language_code = language_code
+        self._titles = self._title_tables[language_code]
+        self._title_index = self._title_indexes[language_code]
+        self._fuzzy_index = None
+        self._query_cache.clear()
+        self._sort_orders.clear()
+        self._bucket_sets.clear()
+        self._bitmaps.clear()
+    
+    def set_language(self, language_code: str):
+        """Switch the language of titles, categories, title search and title sorting.
+        
+        Every language's titles and categories are kept from load time, so
+        this only swaps the active tables and index.
+        """
+        with self._lock:
+            self._ensure_indexes()
+            if language_code != self.language_code or language_code not in self._title_tables:
+                self._activate_language(language_code)
+            self.categories = self._categories_for(language_code)
+    
+    def languages(self) -> List[str]:
+        """Languages the loaded catalog has titles or categories for."""
+        return sorted(self._category_trees.keys() | self._title_tables.keys())
+    
+    def _ensure_indexes(self):
+        """Rebuild the indexes if ``courses`` was replaced since the last build."""
+        if len(self._title_index) != len(self.courses):
+            self._rebuild_indexes()
+    
     def save_to_json(self, path: str) -> bool:
         """Save current catalog data to JSON file."""
         try:
@@ -97,7 +546,7 @@ class CatalogStore:
             print(f"Error saving catalog: {e}")
             return False
     
-    def list_all(self) -> List[Course]:
+    def list_all(self) -> Sequence[Course]:
         """Get all available courses."""
         return self.courses.copy()
     
@@ -105,28 +554,467 @@ class CatalogStore:
         """Get all available categories."""
         return self.categories.copy()
     
-    def filter(self, category: Optional[str] = None, subcategory: Optional[str] = None, text: Optional[str] = None) -> List[Course]:
-        """Filter courses by category, subcategory, and/or text search.
+    @classmethod
+    def from_courses(cls, courses: Iterable[Course], compact: bool = False) -> "CatalogStore":
+        """Create an indexed store holding the given courses."""
+        store = cls(compact=compact)
+        store.courses = store._make_course_storage(courses)
+        store._rebuild_indexes()
+        return store
+    
+    def add_courses(self, courses: Iterable[Course]):
+        """Append courses at the end; existing positions stay valid."""
+        with self._lock:
+            if not self._title_tables:
+                self._rebuild_indexes()  # a new store has no title tables to extend yet
+            else:
+                self._ensure_indexes()
+            self._append_courses(list(courses))
+    
+    def __len__(self) -> int:
+        return len(self.courses)
+    
+    def get(self, course_id: str) -> Optional[Course]:
+        """Get the course with an id, or None."""
+        position = self.position_of(course_id)
+        return None if position is None else self.course_at(position)
+    
+    def get_many(self, course_ids: Iterable[str]) -> List[Optional[Course]]:
+        """Get the courses with the given ids, in the same order (None for unknown ids)."""
+        with self._lock:
+            self._ensure_indexes()
+            positions = list(map(self._id_index.get, course_ids))
+        return [None if position is None else self.course_at(position) for position in positions]
+    
+    def find_by_link(self, url: str) -> Optional[Course]:
+        """Get the course with a link, or None.
         
-        Optimized for performance - should handle 1k+ items in under 100ms.
+        Links match regardless of scheme, "www.", host case, a trailing
+        slash or fragment (see ``link_key``).
         """
-        filtered_courses = self.courses
+        with self._lock:
+            self._ensure_indexes()
+            position = self._link_index.find(url)
+        return None if position is None else self.course_at(position)
+    
+    def position_of(self, course_id: str) -> Optional[int]:
+        """Store position of the course with an id, or None."""
+        with self._lock:
+            self._ensure_indexes()
+            return self._id_index.get(course_id)
+    
+    def course_at(self, position: int) -> Course:
+        """Get the course stored at a position returned by ``filter_positions``."""
+        return self.courses[position]
+    
+    def id_at(self, position: int) -> str:
+        if isinstance(self.courses, CourseColumns):
+            return self.courses.ids[position]
+        return self.courses[position].id
+    
+    def title_at(self, position: int, language_code: Optional[str] = None) -> str:
+        """Get the display title at a position, in the active language by default."""
+        if language_code is None or language_code == self.language_code:
+            return self._titles[position]
+        table = self._title_tables.get(language_code)
+        if table is not None:
+            return table[position]
+        if isinstance(self.courses, CourseColumns):
+            return resolve_title(self.courses.titles[position], language_code)
+        return self.courses[position].get_title(language_code)
+    
+    def category_at(self, position: int) -> str:
+        if isinstance(self.courses, CourseColumns):
+            return self.courses.category_names[self.courses.category_codes[position]]
+        return self.courses[position].category
+    
+    def subcategory_at(self, position: int) -> str:
+        if isinstance(self.courses, CourseColumns):
+            return self.courses.subcategory_names[self.courses.subcategory_codes[position]]
+        return self.courses[position].subcategory
+    
+    def link_at(self, position: int) -> str:
+        if isinstance(self.courses, CourseColumns):
+            return self.courses.links[position]
+        return self.courses[position].link
+    
+    def filter(self, category: Optional[str] = None, subcategory: Optional[str] = None, text: Optional[str] = None,
+               domain: Optional[str] = None) -> Sequence[Course]:
+        """Filter courses by category, subcategory, link domain and/or text search."""
+        with self._lock:
+            positions = self.filter_positions(category, subcategory, text, domain)
+            if isinstance(positions, range):
+                return self.courses.copy()
+            return self._select(positions)
+    
+    def filter_positions(self, category: Optional[str] = None, subcategory: Optional[str] = None,
+                         text: Optional[str] = None, domain: Optional[str] = None) -> Sequence[int]:
+        """Return the store positions of the matching courses, in catalog order.
         
-        # Filter by category (fastest filter first)
-        if category:
-            filtered_courses = [course for course in filtered_courses if course.category == category]
+        ``domain`` is a registrable domain, host or path prefix of the
+        course link (see ``LinkIndex.lookup``). The result may be shared
+        with the indexes and must not be modified. Without any filter it is
+        a ``range`` over the whole catalog.
+        """
+        with self._lock:
+            self._ensure_indexes()
+            
+            if not (category or subcategory or text or domain):
+                return range(len(self.courses))
+            
+            # Category/subcategory and domain buckets are precomputed at load time
+            positions = self._scope(category, subcategory, domain)
+            
+            if text:
+                scope = (category or None, subcategory or None, domain or None)
+                positions = self._search_text(scope, text, positions)
+            
+            return positions
+    
+    def _scope(self, category: Optional[str], subcategory: Optional[str],
+               domain: Optional[str]) -> Optional[List[int]]:
+        """Sorted positions in a category and/or domain bucket, or None without either."""
+        if domain and (category or subcategory):
+            return from_bitmap(self._scope_bitmap(category, subcategory, domain))
+        if domain:
+            return self._link_index.lookup(domain, self.link_at)
+        if category or subcategory:
+            return self._category_index.lookup(category, subcategory)
+        return None
+    
+    def _scope_bitmap(self, category: Optional[str], subcategory: Optional[str], domain: Optional[str]) -> int:
+        """Bitmap of a category and/or domain bucket (every course without either)."""
+        rows = full_bitmap(len(self.courses))
+        if category or subcategory:
+            rows &= self._bitmap(("bucket", (category or None, subcategory or None)),
+                                 lambda: self._category_index.lookup(category, subcategory))
+        if domain:
+            rows &= self._bitmap(("domain", domain), lambda: self._link_index.lookup(domain, self.link_at))
+        return rows
+    
+    def _bitmap(self, key: Tuple[str, Any], positions: Callable[[], Iterable[int]]) -> int:
+        """Bitmap of an index bucket, built from ``positions()`` and kept among the recently used."""
+        bitmap = self._bitmaps.get(key)
+        if bitmap is not None:
+            self._bitmaps.move_to_end(key)
+            return bitmap
+        bitmap = self._bitmaps[key] = to_bitmap(positions(), len(self.courses))
+        if len(self._bitmaps) > BITMAP_CACHE_SIZE:
+            self._bitmaps.popitem(last=False)
+        return bitmap
+    
+    def search(self, query: Optional[str], category: Optional[str] = None, subcategory: Optional[str] = None,
+               domain: Optional[str] = None,
+               ranked: bool = False) -> Tuple[Sequence[int], Dict[str, Dict[str, int]]]:
+        """Run a query and count its facets; returns (positions, facets).
         
-        # Filter by subcategory
-        if subcategory:
-            filtered_courses = [course for course in filtered_courses if course.subcategory == subcategory]
+        Each facet is counted with every filter except its own.
+        """
+        with self._lock:
+            plan = parse_query(query or "")
+            positions = self._run_plan(plan, category, subcategory, domain)
+            without_category = positions
+            if category or subcategory:
+                without_category = self._run_plan(plan, None, None, domain)
+            without_domain = positions
+            if domain:
+                without_domain = self._run_plan(plan, category, subcategory, None)
+            
+            pairs = self._category_index.pair_counts(self._count_positions(without_category))
+            categories: Dict[str, int] = {}
+            subcategories: Dict[str, int] = {}
+            for (pair_category, pair_subcategory), count in pairs.items():
+                categories[pair_category] = categories.get(pair_category, 0) + count
+                if not category or pair_category == category:
+                    subcategories[pair_subcategory] = subcategories.get(pair_subcategory, 0) + count
+            facets = {
+                "category": categories,
+                "subcategory": subcategories,
+                "domain": self._link_index.counts(self._count_positions(without_domain)),
+            }
+            if ranked:
+                positions = self._rank(plan, positions, category, subcategory, domain)
+            return positions, facets
+    
+    def facet_counts(self, positions: Optional[Iterable[int]] = None) -> Dict[str, Dict[str, int]]:
+        """Course counts per category, subcategory and domain over ``positions`` (default: all)."""
+        with self._lock:
+            self._ensure_indexes()
+            positions = self._count_positions(positions)
+            categories: Dict[str, int] = {}
+            subcategories: Dict[str, int] = {}
+            for (category, subcategory), count in self._category_index.pair_counts(positions).items():
+                categories[category] = categories.get(category, 0) + count
+                subcategories[subcategory] = subcategories.get(subcategory, 0) + count
+            return {
+                "category": categories,
+                "subcategory": subcategories,
+                "domain": self._link_index.counts(positions),
+            }
+    
+    def _count_positions(self, positions: Optional[Iterable[int]]) -> Optional[Iterable[int]]:
+        """None (count whole buckets) for a result covering the whole catalog."""
+        if isinstance(positions, range) and len(positions) == len(self.courses):
+            return None
+        return positions
+    
+    def domain_counts(self, positions: Optional[Iterable[int]] = None) -> Dict[str, int]:
+        """Number of courses per link domain, most common first.
+        
+        Counts the whole catalog by default (bucket sizes), or the given
+        positions, such as a filter result, in one pass over their domain codes.
+        """
+        with self._lock:
+            self._ensure_indexes()
+            counts = self._link_index.counts(positions)
+        return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+    
+    def domain_at(self, position: int) -> str:
+        """Registrable domain of the link at a position."""
+        return self._link_index.domain_at(position)
+    
+    def fuzzy_search(self, text: str, category: Optional[str] = None, subcategory: Optional[str] = None,
+                     limit: int = FUZZY_LIMIT, budget_ms: float = FUZZY_BUDGET_MS,
+                     domain: Optional[str] = None) -> List[int]:
+        """Typo-tolerant title search; returns up to ``limit`` positions, best match first.
+        
+        The search stops after ``budget_ms`` with the best matches found so far.
+        """
+        fuzzy_index = self.prepare_fuzzy_index()
+        with self._lock:
+            deadline = time.perf_counter() + budget_ms / 1000
+            within = None
+            if category or subcategory or domain:
+                within = self._scope_bitmap(category, subcategory, domain)
+            return [position for _, position in fuzzy_index.search(text, limit, deadline, within=within)]
+    
+    def prepare_fuzzy_index(self) -> FuzzyIndex:
+        """Build the trigram index of ``fuzzy_search`` unless it is current, and return it.
+        
+        The build runs outside the store lock, so other queries keep running;
+        the app calls this on a background thread once a catalog is loaded.
+        """
+        with self._fuzzy_build_lock:
+            with self._lock:
+                self._ensure_indexes()
+                if self._fuzzy_index is not None:
+                    return self._fuzzy_index
+                title_index = self._title_index
+                title_index.build_vocabulary()
+                size = len(self.courses)
+            fuzzy_index = FuzzyIndex(title_index)
+            with self._lock:
+                # Courses or the language may have changed during the build
+                if self._title_index is title_index and len(self.courses) == size:
+                    self._fuzzy_index = fuzzy_index
+            return fuzzy_index
+    
+    def query_positions(self, query: Optional[str], category: Optional[str] = None,
+                        subcategory: Optional[str] = None, domain: Optional[str] = None) -> Sequence[int]:
+        """Return the positions matching a search query (see ``core.query``), in catalog order."""
+        return self._run_plan(parse_query(query or ""), category, subcategory, domain)
+    
+    def _run_plan(self, plan: QueryPlan, category: Optional[str], subcategory: Optional[str],
+                  domain: Optional[str]) -> Sequence[int]:
+        """Execute a plan as AND / AND NOT operations on row bitmaps, cheapest clause first."""
+        plain = plan.plain_text()
+        if plain is not None or not plan:
+            return self.filter_positions(category, subcategory, plain, domain)
+        with self._lock:
+            self._ensure_indexes()
+            rows = self._scope_bitmap(category, subcategory, domain)
+            for clause in sorted(plan.included, key=self._clause_cost):
+                rows &= self._clause_bitmap(clause, rows)
+                if not rows:
+                    return []
+            for clause in plan.excluded:
+                rows &= ~self._clause_bitmap(clause, rows)
+            return from_bitmap(rows)
+    
+    def _clause_cost(self, clause: QueryClause) -> int:
+        """Estimated result size of a clause; link clauses scan, so they go last."""
+        if clause.field == "id":
+            return len(self._id_index.get_all(clause.value))
+        if clause.field == "title":
+            return self._title_index.estimate(clause.value)
+        if clause.field in ("category", "subcategory"):
+            return sum(len(bucket) for _, bucket in self._name_buckets(clause))
+        if clause.field == "domain":
+            return len(self._link_index.lookup(clause.value))
+        return len(self.courses) + 1
+    
+    def _name_buckets(self, clause: QueryClause) -> List[Tuple[str, List[int]]]:
+        """(name, bucket) of the category or subcategory names containing a clause value."""
+        value = normalize(clause.value)
+        buckets = (self._category_index.by_category if clause.field == "category"
+                   else self._category_index.by_subcategory)
+        return [(name, bucket) for name, bucket in buckets.items() if value in normalize(name)]
+    
+    def _clause_bitmap(self, clause: QueryClause, rows: int) -> int:
+        """Bitmap of the courses matching a clause; only the courses in ``rows`` are required to be exact."""
+        size = len(self.courses)
+        if clause.field == "category" or clause.field == "subcategory":
+            bitmap = 0
+            for name, bucket in self._name_buckets(clause):
+                bitmap |= self._bitmap((clause.field, name), lambda: bucket)
+            return bitmap
+        if clause.field == "domain":
+            return self._bitmap(("domain", clause.value), lambda: self._link_index.lookup(clause.value, self.link_at))
+        if clause.field == "title":
+            query = normalize(clause.value)
+            if (("title", query) not in self._bitmaps
+                    and rows.bit_count() * CLAUSE_SCAN_RATIO < self._title_index.estimate(query)):
+                # Far fewer rows left than the term matches: search only those
+                return to_bitmap(self._title_index.search(query, within=from_bitmap(rows)), size)
+            return self._bitmap(("title", query), lambda: self._search_text((None, None, None), query, None))
+        if clause.field == "id":
+            return to_bitmap(self._id_index.get_all(clause.value), size)
+        value = clause.value.casefold()
+        return to_bitmap((position for position in from_bitmap(rows) if value in self.link_at(position).casefold()), size)
+    
+    def ranked_search(self, query: Optional[str], category: Optional[str] = None,
+                      subcategory: Optional[str] = None,
+                      page_size: int = RANKED_PAGE_SIZE, domain: Optional[str] = None) -> Sequence[int]:
+        """Return the ``query_positions`` result ordered by title relevance.
+        
+        Title-start matches come first, then whole-word, word prefix and
+        mid-word matches. Pages of ``page_size`` are ranked as they are read.
+        """
+        with self._lock:
+            plan = parse_query(query or "")
+            positions = self._run_plan(plan, category, subcategory, domain)
+            return self._rank(plan, positions, category, subcategory, domain, page_size)
+    
+    def _rank(self, plan: QueryPlan, positions: Sequence[int], category: Optional[str],
+              subcategory: Optional[str], domain: Optional[str],
+              page_size: int = RANKED_PAGE_SIZE) -> Sequence[int]:
+        """Wrap the result of a plan in a RankedPositions against its first title term."""
+        with self._lock:
+            text = plan.rank_text()
+            if not text or not positions:
+                return positions
+            if plan.plain_text() is not None:
+                within = None
+                if category or subcategory or domain:
+                    within = self._bucket_set(category, subcategory, domain)
+            else:
+                # Other clauses narrowed the result below the term's matches
+                within = set(positions)
+            index = self._title_index
+            
+            def rank(limit: int) -> List[int]:
+                with self._lock:
+                    return index.rank(text, positions, limit, within)
+            
+            return RankedPositions(rank, len(positions), page_size, members=positions)
+    
+    def _bucket_set(self, category: Optional[str], subcategory: Optional[str],
+                    domain: Optional[str] = None) -> Set[int]:
+        """A category/domain bucket as a set, kept among the recently used."""
+        key = (category or None, subcategory or None, domain or None)
+        cached = self._bucket_sets.get(key)
+        if cached is not None:
+            self._bucket_sets.move_to_end(key)
+            return cached
+        cached = self._bucket_sets[key] = set(self._scope(category, subcategory, domain))
+        if len(self._bucket_sets) > BUCKET_SET_CACHE_SIZE:
+            self._bucket_sets.popitem(last=False)
+        return cached
+    
+    def sort_positions(self, positions: Sequence[int], column: Optional[str],
+                       descending: bool = False) -> Sequence[int]:
+        """Order store positions by one of SORT_COLUMNS, or by catalog order for None.
+        
+        Large results are read off a cached permutation a page at a time. Equal
+        keys keep catalog order.
+        """
+        if isinstance(positions, RankedPositions) and positions.members is not None:
+            positions = positions.members  # no need to rank what gets reordered
+        if column is None:
+            if isinstance(positions, range):
+                return positions[::-1] if descending else positions
+            return sorted(positions, reverse=descending)
+        order, rank = self._sort_order(column)
+        if len(positions) * SORT_SCAN_RATIO < len(order):
+            return sorted(positions, key=rank.__getitem__, reverse=descending)
+        if isinstance(positions, range) and len(positions) == len(order):
+            if not descending:
+                return order
+            marks = None
+        else:
+            # One byte per position marks the result, read back in C below
+            marks = to_marks(positions, len(order))
+        walk = reversed if descending else iter
+        
+        def page(limit: int) -> List[int]:
+            if marks is None:
+                return list(islice(walk(order), limit))
+            return list(islice(compress(walk(order), map(getitem, repeat(marks), walk(order))), limit))
+        
+        return RankedPositions(page, len(positions), RANKED_PAGE_SIZE, members=positions)
+    
+    def has_sort_order(self, column: str) -> bool:
+        """Whether ``column``'s sort permutation is built, so sorting by it is quick.
+        
+        Reads the cache without the lock, so the UI thread can ask while a
+        worker builds indexes.
+        """
+        return column in self._sort_orders
+    
+    def sort_rank(self, column: str) -> array:
+        """Rank of every store position when sorted by ``column``."""
+        return self._sort_order(column)[1]
+    
+    def _sort_order(self, column: str) -> Tuple[array, array]:
+        """Build (once) the sorted permutation and rank array for a column."""
+        if column not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {column!r}")
+        with self._lock:
+            self._ensure_indexes()
+            cached = self._sort_orders.get(column)
+            if cached is not None:
+                return cached
+            
+            if column == "title":
+                keys = self._title_index.keys  # already normalized
+            else:
+                field = SORT_COLUMNS.index(column) + 1
+                keys = [row[field].casefold() for row in self._iter_rows()]
+            order = array('I', sorted(range(len(keys)), key=keys.__getitem__))
+            rank = array('I', [0]) * len(order)
+            for r, position in enumerate(order):
+                rank[position] = r
+            self._sort_orders[column] = (order, rank)
+            return order, rank
+    
+    def _search_text(self, scope: Tuple[Optional[str], Optional[str], Optional[str]], text: str,
+                     positions: Optional[List[int]]) -> List[int]:
+        """Run a text search, refining a cached result when possible.
+        
+        ``scope`` is the (category, subcategory, domain) filter; "pyth" is
+        searched within the cached result of "pyt".
+        """
+        query = normalize(text)
+        key = scope + (query,)
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            self._query_cache.move_to_end(key)
+            return cached
         
-        # Filter by text search (most expensive, do last)
-        if text:
-            text_lower = text.lower()
-            # Pre-compile search terms for better performance
-            filtered_courses = [
-                course for course in filtered_courses
-                if text_lower in course.title.lower()
-            ]
+        bucket = positions
+        for cached_key, cached_positions in self._query_cache.items():
+            if cached_key[:3] != scope or cached_key[3] not in query:
+                continue
+            if positions is None or len(cached_positions) < len(positions):
+                positions = cached_positions
         
-        return filtered_courses
\ No newline at end of file
+        if positions is not bucket and self._title_index.estimate(query) <= len(positions):
+            positions = bucket  # the query's own postings narrow it down as well
+        within_set = None
+        if positions is not None and positions is bucket:
+            within_set = self._bucket_set(*scope)
+        result = self._title_index.search(query, within=positions, within_set=within_set)
+        self._query_cache[key] = result
+        if len(self._query_cache) > QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+        return result
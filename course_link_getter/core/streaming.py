@@ -0,0 +1,99 @@
+import json
+from typing import Any, Iterator, TextIO, Tuple
+
+_WHITESPACE = " \t\r\n"
+_NUMBER_CHARS = "0123456789+-.eE"
+
+
+class _ChunkReader:
+    """Buffered cursor over a text stream that is read in fixed-size chunks."""
+
+    def __init__(self, stream: TextIO, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Append the next chunk, dropping what has already been consumed."""
+        if self.eof:
+            return False
+        data = self.stream.read(self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def take(self, expected: str) -> str:
+        """Consume the next non-whitespace character, which must be in ``expected``."""
+        char = self.peek()
+        if not char or char not in expected:
+            raise json.JSONDecodeError(f"Expected one of {expected!r}", self.buffer, self.pos)
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk,
+            # even past a trailing "." or exponent that stopped the decoder
+            if (isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and not self.buffer[end:].strip(_NUMBER_CHARS) and self._fill()):
+                continue
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_object(stream: TextIO, stream_key: str, chunk_size: int = 64 * 1024) -> Iterator[Tuple[str, Any]]:
+    """Incrementally parse a top-level JSON object.
+
+    Yields ``(key, value)`` for every member of the object, except that the
+    array stored under ``stream_key`` is yielded one element at a time as
+    ``(stream_key, element)``. Only the current element has to fit in
+    memory, not the whole document.
+    """
+    reader = _ChunkReader(stream, chunk_size)
+    reader.take("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise json.JSONDecodeError("Expected an object key", reader.buffer, reader.pos)
+        reader.take(":")
+        if key == stream_key and reader.peek() == "[":
+            reader.take("[")
+            if reader.peek() == "]":
+                reader.take("]")
+            else:
+                while True:
+                    yield key, reader.value()
+                    if reader.take(",]") == "]":
+                        break
+        else:
+            yield key, reader.value()
+        if reader.take(",}") == "}":
+            return
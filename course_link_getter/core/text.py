@@ -0,0 +1,33 @@
+import unicodedata
+from typing import Dict, Optional
+
+
+def _build_strip_table() -> Dict[int, Optional[str]]:
+    """Translation table removing combining marks and folding a few letters.
+
+    Letters like Vietnamese "đ" carry no combining mark after NFKD, so they
+    are mapped explicitly. Only the Basic Multilingual Plane is scanned,
+    which covers the marks used by the catalog languages.
+    """
+    table: Dict[int, Optional[str]] = {
+        code: None for code in range(0x10000) if unicodedata.combining(chr(code))
+    }
+    table.update({ord("đ"): "d", ord("ð"): "d", ord("ł"): "l", ord("ø"): "o", ord("ħ"): "h"})
+    return table
+
+
+_STRIP_TABLE = _build_strip_table()
+
+
+def normalize(text: str) -> str:
+    """Normalize text for accent- and case-insensitive matching.
+
+    Casefolds, decomposes (NFKD), drops diacritics and collapses runs of
+    whitespace, so "  Tiếng  VIỆT " and "tieng viet" give the same key.
+    Titles are normalized once at load time and queries per search, and
+    matching is then a plain substring test on the keys.
+    """
+    text = text.casefold()
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text).translate(_STRIP_TABLE)
+    return " ".join(text.split())
@@ -0,0 +1,65 @@
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the course_link_getter directory to Python path
+app_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(app_dir))
+
+from core.models import Course
+from core.store import CatalogStore
+
+SAMPLE_CATALOG = app_dir / "assets" / "catalog.sample.json"
+
+CATEGORIES = {
+    "English": ["IELTS", "TOEIC", "Speaking"],
+    "Programming": ["Python", "Web", "Data"],
+    "Design": ["UI/UX", "Graphic"],
+}
+WORDS = ["Complete", "Guide", "Python", "Web", "Data", "IELTS", "Academic", "Design",
+         "Mastery", "Advanced", "Beginner", "Course", "Speaking", "Graphic", "Bootcamp",
+         "Tiếng", "Việt", "Café"]
+HOSTS = ["https://www.udemy.com/course", "https://coursera.org/learn", "https://learn.example.co.uk/c",
+         "http://britishcouncil.org/english", "https://www.britishcouncil.org/ielts"]
+
+
+def make_courses(count: int, seed: int = 7) -> list:
+    """Reproducible random courses over CATEGORIES, WORDS and HOSTS."""
+    rng = random.Random(seed)
+    courses = []
+    for i in range(count):
+        category = rng.choice(list(CATEGORIES))
+        courses.append(Course(
+            id=f"course-{i:05d}",
+            title=" ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))) + f" {i}",
+            category=category,
+            subcategory=rng.choice(CATEGORIES[category]),
+            link=f"{rng.choice(HOSTS)}/{i}",
+        ))
+    return courses
+
+
+@pytest.fixture
+def courses() -> list:
+    return make_courses(300)
+
+
+@pytest.fixture
+def catalog_path(tmp_path, courses) -> Path:
+    """A legacy catalog file with the CATEGORIES tree and ``courses``."""
+    path = tmp_path / "catalog.json"
+    data = {
+        "categories": [{"name": name, "subcategories": subs} for name, subs in CATEGORIES.items()],
+        "courses": [course.model_dump() for course in courses],
+    }
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+@pytest.fixture(params=[False, True], ids=["list", "compact"])
+def store(request, courses) -> CatalogStore:
+    """A store over ``courses``, with both storage backends."""
+    return CatalogStore.from_courses(courses, compact=request.param)
@@ -0,0 +1,67 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from conftest import app_dir
+
+
+def run_cli(*args, stdin: str = "") -> subprocess.CompletedProcess:
+    """Run ``python -m course_link_getter`` with ``args``."""
+    return subprocess.run([sys.executable, "-m", app_dir.name, "--no-snapshot", *map(str, args)],
+                          input=stdin, capture_output=True, text=True, encoding="utf-8",
+                          cwd=app_dir.parent, timeout=60)
+
+
+def test_single_query(catalog_path, courses):
+    result = run_cli("guide", "--catalog", catalog_path, "--category", "English", "--fields", "id,title")
+    assert result.returncode == 0, result.stderr
+    lines = result.stdout.splitlines()
+    assert lines[0] == "id\ttitle"
+    assert lines[1:] == [f"{course.id}\t{course.title}" for course in courses
+                         if course.category == "English" and "guide" in course.title.lower()]
+
+
+def test_sorted_jsonl_with_limit(catalog_path, courses):
+    result = run_cli("python", "--catalog", catalog_path, "--format", "jsonl", "--sort", "title",
+                     "--descending", "--limit", "3")
+    assert result.returncode == 0, result.stderr
+    titles = [json.loads(line)["title"] for line in result.stdout.splitlines()]
+    expected = sorted((course.title for course in courses if "python" in course.title.lower()),
+                      key=str.casefold, reverse=True)
+    assert titles == expected[:3]
+
+
+def test_stdin_batch_prints_one_header(catalog_path, courses):
+    result = run_cli("-", "--catalog", catalog_path, "--fields", "id", stdin="guide\n\nid:course-00007\n")
+    assert result.returncode == 0, result.stderr
+    lines = result.stdout.splitlines()
+    assert lines[0] == "query\tid"
+    guide = [f"guide\t{course.id}" for course in courses if "guide" in course.title.lower()]
+    assert lines[1:] == guide + ["id:course-00007\tcourse-00007"]
+
+
+def test_load_errors_go_to_stderr(tmp_path, courses):
+    rows = [course.model_dump() for course in courses[:3]]
+    del rows[1]["title"]
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps({"categories": [], "courses": rows}), encoding="utf-8")
+    result = run_cli("", "--catalog", path, "--fields", "id", "--no-header")
+    assert result.returncode == 0
+    assert result.stdout.splitlines() == [courses[0].id, courses[2].id]
+    assert "courses[1]" in result.stderr
+
+
+def test_missing_catalog_fails(tmp_path):
+    result = run_cli("x", "--catalog", tmp_path / "missing.json")
+    assert result.returncode == 1
+    assert result.stdout == ""
+    assert "Failed to load catalog" in result.stderr
+
+
+@pytest.mark.parametrize("args", [["--descending"], ["--ranked", "--descending"]])
+def test_descending_requires_sort(catalog_path, args):
+    result = run_cli("x", "--catalog", catalog_path, *args)
+    assert result.returncode == 2
+    assert "--descending requires --sort" in result.stderr
@@ -0,0 +1,81 @@
+import sys
+
+import pytest
+
+from ui_pyqt5 import clipboard
+from ui_pyqt5.clipboard import (ClipboardBackend, FakeClipboardBackend, QtClipboardBackend,
+                                SubprocessClipboardBackend, _iter_chunks)
+
+
+class NoApplication:
+    """Stands in for QGuiApplication when no Qt application is running."""
+
+    @staticmethod
+    def instance():
+        return None
+
+
+def capture_command(path) -> list:
+    """A clipboard command that writes its stdin to ``path``."""
+    return [sys.executable, "-c",
+            f"import sys; open({str(path)!r}, 'wb').write(sys.stdin.buffer.read())"]
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        ClipboardBackend()
+
+
+def test_single_copy():
+    backend = FakeClipboardBackend()
+    assert backend.copy_text("https://example.com/a")
+    assert backend.text == "https://example.com/a"
+    assert backend.copies == 1
+
+
+def test_batch_copy_is_chunked(monkeypatch):
+    monkeypatch.setattr(clipboard, "CLIPBOARD_CHUNK_LINES", 3)
+    lines = [f"https://example.com/{i}" for i in range(10)]
+    chunks = list(_iter_chunks(iter(lines)))
+    assert len(chunks) == 4
+    assert b"".join(chunks).decode("utf-8") == "\n".join(lines)
+
+    backend = FakeClipboardBackend()
+    assert backend.copy_lines(line for line in lines)
+    assert backend.text == "\n".join(lines)
+    assert backend.copies == 1
+
+
+def test_batch_copy_of_nothing():
+    backend = FakeClipboardBackend()
+    assert backend.copy_lines([])
+    assert backend.text == ""
+
+
+def test_subprocess_backend_streams_lines(tmp_path, monkeypatch):
+    monkeypatch.setattr(clipboard, "CLIPBOARD_CHUNK_LINES", 2)
+    target = tmp_path / "clipboard.txt"
+    lines = ["Café", "Tiếng Việt", "https://example.com/x"]
+    assert SubprocessClipboardBackend(capture_command(target)).copy_lines(lines)
+    assert target.read_bytes().decode("utf-8") == "\n".join(lines)
+
+
+def test_subprocess_backend_without_tool(monkeypatch, capsys):
+    monkeypatch.setattr(SubprocessClipboardBackend, "find_command", staticmethod(lambda: None))
+    assert not SubprocessClipboardBackend().copy_text("x")
+    assert "no clipboard tool found" in capsys.readouterr().out
+
+
+def test_falls_back_to_subprocess_without_qt_app(tmp_path, monkeypatch):
+    monkeypatch.setattr(clipboard, "QGuiApplication", NoApplication)
+    target = tmp_path / "clipboard.txt"
+    backend = QtClipboardBackend(fallback=SubprocessClipboardBackend(capture_command(target)))
+    assert backend.copy_text("https://example.com/one")
+    assert target.read_text(encoding="utf-8") == "https://example.com/one"
+    assert backend.copy_lines(["a", "b"])
+    assert target.read_text(encoding="utf-8") == "a\nb"
+
+
+def test_no_app_and_no_fallback(monkeypatch):
+    monkeypatch.setattr(clipboard, "QGuiApplication", NoApplication)
+    assert not QtClipboardBackend().copy_lines(["a"])
@@ -0,0 +1,123 @@
+import csv
+import json
+import threading
+
+import pytest
+
+from core.export import ExportCancelled, export_format, export_rows, read_columnar
+from core.models import Course
+from core.store import CatalogStore
+
+FIELDS = ["id", "title", "category", "subcategory", "link"]
+
+
+@pytest.fixture
+def tricky_store(courses) -> CatalogStore:
+    """``courses`` plus titles with separators, quotes, escapes and line breaks."""
+    titles = ['Tab\there', 'Line\nbreak', 'Carriage\rreturn', 'Back\\slash\\t', 'Comma, "quoted"',
+              'Tiếng Việt café', '{braces} and "json"', '']
+    tricky = [Course(id=f"tricky-{i}", title=title, category="English", subcategory="IELTS",
+                     link=f"https://example.com/{i}") for i, title in enumerate(titles)]
+    return CatalogStore.from_courses(tricky + courses)
+
+
+def expected_rows(store, positions):
+    return [[getattr(store.course_at(position), field) for field in FIELDS] for position in positions]
+
+
+def unescape_tsv(value: str) -> str:
+    escapes = {"\\": "\\", "t": "\t", "n": "\n", "r": "\r"}
+    out, chars = [], iter(value)
+    for char in chars:
+        out.append(escapes[next(chars)] if char == "\\" else char)
+    return "".join(out)
+
+
+def read_export(path, format):
+    """Rows of an export file as lists of FIELDS values."""
+    if format == "csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+    elif format == "tsv":
+        lines = path.read_bytes().decode("utf-8").split("\n")
+        assert lines.pop() == ""
+        rows = [[unescape_tsv(value) for value in line.split("\t")] for line in lines]
+    elif format == "jsonl":
+        lines = path.read_text(encoding="utf-8").splitlines()
+        return [[json.loads(line)[field] for field in FIELDS] for line in lines]
+    else:
+        return [[row[field] for field in FIELDS] for row in read_columnar(str(path))]
+    assert rows[0] == FIELDS
+    return rows[1:]
+
+
+@pytest.mark.parametrize("format", ["csv", "tsv", "jsonl", "columnar"])
+def test_round_trip(tricky_store, tmp_path, format):
+    path = tmp_path / f"export.{format}"
+    positions = list(range(0, len(tricky_store), 2)) + [1, 3]
+    progress = []
+    done = export_rows(tricky_store, positions, str(path), format, FIELDS, chunk_rows=17,
+                       progress=lambda done, total: progress.append((done, total)))
+    assert done == len(positions)
+    assert progress[-1] == (len(positions), len(positions))
+    assert read_export(path, format) == expected_rows(tricky_store, positions)
+    assert not path.with_name(path.name + ".tmp").exists()
+
+
+def test_tsv_keeps_one_line_per_course(tricky_store, tmp_path):
+    path = tmp_path / "export.tsv"
+    export_rows(tricky_store, range(8), str(path), "tsv", ["title"])
+    lines = path.read_text(encoding="utf-8").split("\n")
+    assert lines[1:4] == ["Tab\\there", "Line\\nbreak", "Carriage\\rreturn"]
+    assert lines[4] == "Back\\\\slash\\\\t"
+    assert len(lines) == 10  # header, 8 courses, trailing newline
+
+
+@pytest.mark.parametrize("format", ["csv", "tsv", "jsonl", "columnar"])
+def test_empty_export(store, tmp_path, format):
+    path = tmp_path / f"empty.{format}"
+    assert export_rows(store, [], str(path), format, FIELDS) == 0
+    assert read_export(path, format) == []
+
+
+def test_columnar_dictionary_encodes_categories(store, tmp_path):
+    path = tmp_path / "export.clgc"
+    export_rows(store, range(len(store)), str(path), "columnar", ["category"])
+    # Three distinct categories per row group: far smaller than the plain strings
+    assert path.stat().st_size < len(store) * len("Programming")
+    assert [row["category"] for row in read_columnar(str(path))] == \
+        [store.category_at(position) for position in range(len(store))]
+
+
+def test_cancel_leaves_no_file(store, tmp_path):
+    path = tmp_path / "export.csv"
+    cancel = threading.Event()
+
+    def progress(done, total):
+        cancel.set()  # after the first chunk
+
+    with pytest.raises(ExportCancelled):
+        export_rows(store, range(len(store)), str(path), "csv", progress=progress, cancel=cancel, chunk_rows=10)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failed_export_keeps_destination(store, tmp_path, monkeypatch):
+    path = tmp_path / "export.jsonl"
+    path.write_text("previous export\n", encoding="utf-8")
+
+    def broken(position):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "link_at", broken)
+    with pytest.raises(OSError):
+        export_rows(store, range(len(store)), str(path), "jsonl")
+    assert path.read_text(encoding="utf-8") == "previous export\n"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_export_format_from_suffix():
+    assert export_format("out.CSV") == "csv"
+    assert export_format("a/b.clgc") == "columnar"
+    assert export_format("notes.txt") is None
+    with pytest.raises(ValueError):
+        export_rows(CatalogStore(), [], "x.csv", "xml")
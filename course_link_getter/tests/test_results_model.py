@@ -0,0 +1,140 @@
+import random
+
+import pytest
+from PyQt5.QtCore import QCoreApplication
+
+from ui_pyqt5.widgets import results_view
+from ui_pyqt5.widgets.results_view import CourseTableModel
+
+QUERIES = ["", "g", "gu", "guide", "guide py", "guide", "-guide", "python", "p", "", "café", "data 1"]
+
+
+class Mirror:
+    """Replays a model's row signals the way a view does and counts them."""
+
+    def __init__(self, model: CourseTableModel):
+        self.model = model
+        self.rows = []
+        self.resets = self.changes = 0
+        model.rowsInserted.connect(self.inserted)
+        model.rowsRemoved.connect(self.removed)
+        model.modelReset.connect(self.reset)
+
+    def inserted(self, parent, first, last):
+        self.rows[first:first] = [self.model.rows[row] for row in range(first, last + 1)]
+        self.changes += 1
+
+    def removed(self, parent, first, last):
+        del self.rows[first:last + 1]
+        self.changes += 1
+
+    def reset(self):
+        self.rows = [self.model.rows[row] for row in range(self.model.rowCount())]
+        self.resets += 1
+
+    def check(self, rows):
+        assert self.rows == list(rows[:self.model.rowCount()])
+
+
+@pytest.fixture
+def model(store):
+    return CourseTableModel(store)
+
+
+@pytest.mark.parametrize("ranked", [False, True], ids=["catalog", "relevance"])
+def test_results_are_diffed(model, store, ranked, monkeypatch):
+    monkeypatch.setattr(results_view, "MAX_DIFF_RUNS", 10 ** 6)
+    mirror = Mirror(model)
+    for query in QUERIES:
+        rows, _ = store.search(query or None, ranked=ranked)
+        model.set_rows(rows)
+        mirror.check(rows)
+        assert model.rowCount() == len(rows)
+    assert mirror.resets == 0
+
+
+def test_reordered_result_moves_rows(model, store):
+    mirror = Mirror(model)
+    rows = list(range(0, 200, 3))
+    model.set_rows(rows)
+    reordered = rows[:5] + [rows[40]] + rows[5:40] + rows[41:]
+    model.set_rows(reordered)
+    mirror.check(reordered)
+    assert (mirror.resets, mirror.changes) == (0, 3)
+
+
+def test_random_results_are_diffed(model, store, monkeypatch):
+    monkeypatch.setattr(results_view, "FETCH_BATCH_SIZE", 50)
+    monkeypatch.setattr(results_view, "MAX_DIFF_RUNS", 10 ** 6)
+    mirror = Mirror(model)
+    rng = random.Random(5)
+    for _ in range(100):
+        rows = rng.sample(range(len(store)), rng.randint(0, 120))
+        if rng.random() < 0.5:
+            rows.sort()
+        loaded = model.rowCount()
+        model.set_rows(rows)
+        mirror.check(rows)
+        assert model.rowCount() == min(len(rows), max(loaded, 50))
+    assert mirror.resets == 0
+
+
+def test_fetched_rows_are_kept(model, store, monkeypatch):
+    monkeypatch.setattr(results_view, "FETCH_BATCH_SIZE", 50)
+    model.set_rows(range(len(store)))
+    model.fetchMore()
+    assert model.rowCount() == 100
+    model.set_rows(range(1, len(store)))
+    assert model.rowCount() == 100
+
+
+def test_too_many_changes_reset(model, store, monkeypatch):
+    monkeypatch.setattr(results_view, "MAX_DIFF_RUNS", 4)
+    mirror = Mirror(model)
+    model.set_rows(range(len(store)))
+    model.set_rows(range(0, len(store), 2))
+    mirror.check(range(0, len(store), 2))
+    assert mirror.resets == 1
+
+
+def test_set_courses_keeps_one_store(courses):
+    model = CourseTableModel()
+    mirror = Mirror(model)
+    model.set_courses(courses[:100])
+    store = model.store
+    model.set_courses(courses[10:110])
+    model.set_courses(courses[50:60] + courses[200:205])
+    assert model.store is store
+    assert mirror.resets == 1
+    shown = courses[50:60] + courses[200:205]
+    assert [model.get_course(row).id for row in range(model.rowCount())] == [course.id for course in shown]
+    assert [[model.data(model.index(row, column)) for column in range(3)] for row in range(model.rowCount())] == \
+        [[course.title, course.category, course.subcategory] for course in shown]
+
+
+def test_later_pages_are_ranked_in_background(model, store, monkeypatch):
+    monkeypatch.setattr(results_view, "FETCH_BATCH_SIZE", 20)
+    app = QCoreApplication.instance() or QCoreApplication([])
+    rows = store.ranked_search("e", page_size=20)
+    assert len(rows) > 40
+    model.set_rows(rows)
+    assert rows.ranked_count == 20
+
+    model.fetchMore()
+    assert model.rowCount() == 20  # deferred until the worker has ranked the page
+    model._rank_pool.waitForDone()
+    app.processEvents()
+    assert model.rowCount() == 40
+    assert list(model.rows[:40]) == list(store.ranked_search("e")[:40])
+
+
+def test_first_sort_builds_permutation_in_background(model, store):
+    app = QCoreApplication.instance() or QCoreApplication([])
+    model.set_rows(range(len(store)))
+    assert not store.has_sort_order("title")
+    model.sort(0)
+    assert list(model.rows) == list(range(len(store)))  # sorted once the worker is done
+    model._rank_pool.waitForDone()
+    app.processEvents()
+    assert store.has_sort_order("title")
+    assert list(model.rows) == list(store.sort_positions(range(len(store)), "title"))
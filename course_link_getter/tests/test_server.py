@@ -0,0 +1,184 @@
+import asyncio
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+from core import server as server_module
+from core.server import CatalogServer
+from core.store import CatalogStore
+
+
+@pytest.fixture
+def address(catalog_path):
+    """(host, port) of a CatalogServer on a free localhost port, run on a background loop."""
+    store = CatalogStore()
+    assert store.load_from_json(str(catalog_path))
+    loop = asyncio.new_event_loop()
+    server = CatalogServer(store, port=0)
+    host, port = loop.run_until_complete(server.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield host, port
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+@pytest.fixture
+def connection(address):
+    connection = http.client.HTTPConnection(*address, timeout=5)
+    yield connection
+    connection.close()
+
+
+def get(connection, path, method="GET"):
+    connection.request(method, path)
+    response = connection.getresponse()
+    return response, response.read()
+
+
+def raw_request(address, request: bytes) -> bytes:
+    """Send a raw request and read until the server closes the connection."""
+    with socket.create_connection(address, timeout=5) as sock:
+        sock.sendall(request)
+        data = b""
+        while True:
+            block = sock.recv(65536)
+            if not block:
+                return data
+            data += block
+
+
+def test_keep_alive_reuses_connection(connection):
+    response, _ = get(connection, "/categories")
+    assert response.status == 200
+    assert response.getheader("Connection") == "keep-alive"
+    sock = connection.sock
+    for path in ("/courses?limit=1", "/courses/course-00001", "/nope", "/courses?offset=x"):
+        get(connection, path)
+        assert connection.sock is sock
+
+
+def test_http10_closes_connection(address):
+    data = raw_request(address, b"GET /categories HTTP/1.0\r\n\r\n")
+    assert data.startswith(b"HTTP/1.1 200 OK")
+    assert b"Connection: close" in data
+
+
+def test_categories(connection):
+    response, body = get(connection, "/categories")
+    assert response.getheader("Content-Type") == "application/json"
+    assert [category["name"] for category in json.loads(body)] == ["English", "Programming", "Design"]
+
+
+def test_pagination_follows_next(connection, courses):
+    ids = []
+    path = "/courses?limit=70"
+    while path:
+        response, body = get(connection, path)
+        page = json.loads(body)
+        assert page["total"] == len(courses)
+        assert len(page["courses"]) <= 70
+        ids += [course["id"] for course in page["courses"]]
+        path = page["next"]
+    assert ids == [course.id for course in courses]
+
+
+def test_page_size_is_capped(connection, monkeypatch):
+    monkeypatch.setattr(server_module, "MAX_PAGE_SIZE", 20)
+    page = json.loads(get(connection, "/courses?limit=500")[1])
+    assert page["limit"] == 20 and len(page["courses"]) == 20
+
+
+def test_courses_query_and_filters(connection, courses):
+    page = json.loads(get(connection, "/courses?q=python&category=Programming&limit=1000&facets=1")[1])
+    expected = [course.id for course in courses
+                if "python" in course.title.lower() and course.category == "Programming"]
+    assert expected
+    assert [course["id"] for course in page["courses"]] == expected
+    assert page["facets"]["category"]["Programming"] == len(expected)
+    assert page["next"] is None
+
+
+def test_course_by_id(connection, courses):
+    response, body = get(connection, "/courses/course-00042")
+    assert response.status == 200
+    assert json.loads(body) == {
+        "id": "course-00042", "title": courses[42].title, "category": courses[42].category,
+        "subcategory": courses[42].subcategory, "link": courses[42].link,
+    }
+
+
+def test_streaming_is_chunked(address, courses, monkeypatch):
+    monkeypatch.setattr(server_module, "STREAM_CHUNK_ROWS", 100)
+    data = raw_request(address, b"GET /courses?format=jsonl HTTP/1.1\r\nConnection: close\r\n\r\n")
+    head, _, body = data.partition(b"\r\n\r\n")
+    assert b"Transfer-Encoding: chunked" in head
+    assert b"Content-Length" not in head
+    chunks = []
+    while True:
+        size, _, body = body.partition(b"\r\n")
+        size = int(size, 16)
+        if size == 0:
+            break
+        chunks.append(body[:size])
+        body = body[size + 2:]
+    assert len(chunks) == 3
+    lines = b"".join(chunks).decode("utf-8").splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [course.id for course in courses]
+
+
+def test_streaming_tsv_range(connection, courses):
+    response, body = get(connection, "/courses?format=tsv&offset=10&limit=5")
+    lines = body.decode("utf-8").splitlines()
+    assert response.getheader("Transfer-Encoding") == "chunked"
+    assert lines[0] == "id\ttitle\tcategory\tsubcategory\tlink"
+    assert [line.split("\t")[0] for line in lines[1:]] == [course.id for course in courses[10:15]]
+
+
+@pytest.mark.parametrize("method, path, status", [
+    ("GET", "/courses/missing", 404),
+    ("GET", "/nope", 404),
+    ("GET", "/courses?offset=x", 400),
+    ("GET", "/courses?limit=-1", 400),
+    ("GET", "/courses?limit=0", 400),
+    ("GET", "/courses?format=xml", 400),
+    ("POST", "/courses", 405),
+])
+def test_error_responses(connection, method, path, status):
+    response, body = get(connection, path, method)
+    assert response.status == status
+    assert json.loads(body)["status"] == status
+    # Errors keep the connection usable
+    assert get(connection, "/categories")[0].status == 200
+
+
+def test_head_has_no_body(connection):
+    response, body = get(connection, "/courses", "HEAD")
+    assert response.status == 200
+    assert int(response.getheader("Content-Length")) > 0
+    assert body == b""
+
+
+def test_concurrent_clients(address):
+    def client():
+        connection = http.client.HTTPConnection(*address, timeout=5)
+        try:
+            return [json.loads(get(connection, f"/courses?q=guide&limit=2&offset={i}")[1])["total"]
+                    for i in range(10)]
+        finally:
+            connection.close()
+
+    threads = []
+    results = []
+    for _ in range(8):
+        thread = threading.Thread(target=lambda: results.append(client()))
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join(10)
+    assert len(results) == 8 and len({total for result in results for total in result}) == 1
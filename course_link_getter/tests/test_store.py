@@ -0,0 +1,251 @@
+import json
+import threading
+import re
+
+import pytest
+
+from core import store as store_module
+from core.indexes import registrable_domain, split_link
+from core.store import CatalogStore
+from core.text import normalize
+
+from conftest import CATEGORIES
+
+TEXT_QUERIES = ["", "g", "gu", "guide", "guide ", "guide p", "guide py", "ide py", "e g", "on g",
+                "mastery 1", "12", "3 ", "café", "CAFE", "tieng viet", "-", "zzz", "python web data",
+                "web  data"]
+
+
+def reference_filter(courses, category=None, subcategory=None, text=None, domain=None):
+    """The plain scan every indexed filter must agree with."""
+    query = normalize(text or "")
+    return [
+        position for position, course in enumerate(courses)
+        if (not category or course.category == category)
+        and (not subcategory or course.subcategory == subcategory)
+        and (not domain or registrable_domain(split_link(course.link)[0]) == domain)
+        and query in normalize(course.title)
+    ]
+
+
+def title_tier(title: str, query: str) -> int:
+    """Relevance tier of a single-word query: title start, whole word, word start, elsewhere."""
+    key = normalize(title)
+    if key.startswith(query):
+        return 0
+    if re.search(r"(?<!\w)" + re.escape(query) + r"(?!\w)", key):
+        return 1
+    if re.search(r"(?<!\w)" + re.escape(query), key):
+        return 2
+    return 3
+
+
+@pytest.mark.parametrize("text", TEXT_QUERIES)
+def test_text_filter_matches_substring_scan(store, courses, text):
+    assert list(store.filter_positions(text=text)) == reference_filter(courses, text=text)
+
+
+@pytest.mark.parametrize("category,subcategory", [("English", None), ("Programming", "Web"),
+                                                  (None, "Data"), ("Design", "Python")])
+@pytest.mark.parametrize("text", ["", "g", "guide py", "on g", "café"])
+def test_bucket_filter_matches_scan(store, courses, category, subcategory, text):
+    assert list(store.filter_positions(category, subcategory, text)) == \
+        reference_filter(courses, category, subcategory, text)
+    assert [course.id for course in store.filter(category, subcategory, text)] == \
+        [courses[position].id for position in reference_filter(courses, category, subcategory, text)]
+
+
+def test_typing_refines_cached_results(store, courses):
+    query = "guide python web"
+    typed = [query[:end] for end in range(1, len(query) + 1)]
+    for text in typed + typed[::-1]:  # typing, then backspacing
+        assert list(store.filter_positions(text=text)) == reference_filter(courses, text=text)
+        assert list(store.filter_positions("English", text=text)) == reference_filter(courses, "English", text=text)
+
+
+def test_added_courses_are_indexed(courses):
+    store = CatalogStore.from_courses(courses[:200])
+    assert list(store.filter_positions(text="guide")) == reference_filter(courses[:200], text="guide")
+    store.add_courses(courses[200:])
+    assert list(store.filter_positions(text="guide")) == reference_filter(courses, text="guide")
+    assert list(store.filter_positions("English", text="ielts")) == reference_filter(courses, "English", text="ielts")
+
+
+def test_courses_added_to_a_new_store(courses):
+    store = CatalogStore()
+    store.add_courses(courses[:5])
+    assert [store.title_at(position) for position in range(5)] == [course.title for course in courses[:5]]
+    assert list(store.filter_positions(text="guide")) == reference_filter(courses[:5], text="guide")
+
+
+def test_compact_storage_keeps_courses(courses):
+    store = CatalogStore.from_courses(courses, compact=True)
+    assert len(store) == len(courses)
+    assert [store.course_at(position) for position in range(len(courses))] == courses
+    assert store.title_at(5) == courses[5].title
+    assert store.link_at(7) == courses[7].link
+
+
+@pytest.mark.parametrize("domain", ["britishcouncil.org", "udemy.com", "example.co.uk"])
+def test_domain_filter_matches_scan(store, courses, domain):
+    assert list(store.filter_positions(domain=domain)) == reference_filter(courses, domain=domain)
+    assert list(store.filter_positions("English", text="guide", domain=domain)) == \
+        reference_filter(courses, "English", text="guide", domain=domain)
+
+
+def test_lookup_by_id_and_link(store, courses):
+    assert store.get(courses[42].id) == courses[42]
+    assert store.get("missing") is None
+    assert store.get_many([courses[3].id, "missing", courses[1].id]) == [courses[3], None, courses[1]]
+    link = courses[17].link
+    assert store.find_by_link(link) == courses[17]
+    assert store.find_by_link(link.replace("https://", "http://").replace("www.", "") + "/") == courses[17]
+    assert store.find_by_link(link + "#reviews") == courses[17]
+
+
+@pytest.mark.parametrize("query,expected", [
+    ("guide -python", lambda course: "guide" in normalize(course.title) and "python" not in normalize(course.title)),
+    ('"guide python"', lambda course: "guide python" in normalize(course.title)),
+    ("category:english data", lambda course: course.category == "English" and "data" in normalize(course.title)),
+    ("sub:web -cat:design", lambda course: "web" in course.subcategory.casefold()
+                                           and "design" not in course.category.casefold()),
+    ("site:britishcouncil.org ielts", lambda course: "britishcouncil.org" in course.link and "ielts" in normalize(course.title)),
+    ("id:course-00012", lambda course: course.id == "course-00012"),
+])
+def test_query_language(store, courses, query, expected):
+    assert list(store.query_positions(query)) == [position for position, course in enumerate(courses)
+                                                  if expected(course)]
+
+
+def test_facet_counts_leave_out_their_own_filter(store, courses):
+    positions, facets = store.search("guide", category="English")
+    assert list(positions) == reference_filter(courses, "English", text="guide")
+    without_category = reference_filter(courses, text="guide")
+    for category in CATEGORIES:
+        count = sum(courses[position].category == category for position in without_category)
+        assert facets["category"].get(category, 0) == count
+    for subcategory in CATEGORIES["English"]:
+        count = sum(courses[position].subcategory == subcategory for position in positions)
+        assert facets["subcategory"].get(subcategory, 0) == count
+    assert sum(facets["domain"].values()) == len(positions)
+
+
+@pytest.mark.parametrize("query", ["gu", "data", "e", "café"])
+def test_ranked_search_orders_by_tier(store, courses, query, monkeypatch):
+    monkeypatch.setattr(store_module, "RANKED_PAGE_SIZE", 7)
+    rows = store.ranked_search(query)
+    positions = reference_filter(courses, text=query)
+    assert len(rows) == len(positions)
+    key = normalize(query)
+    assert list(rows) == sorted(positions, key=lambda position: (title_tier(courses[position].title, key), position))
+
+
+@pytest.mark.parametrize("column", ["title", "category", "subcategory"])
+@pytest.mark.parametrize("text", ["", "g", "guide"])
+def test_sort_positions(store, courses, column, text):
+    positions = store.filter_positions(text=text)
+    if column == "title":
+        key = lambda position: (normalize(courses[position].title), position)
+    else:
+        key = lambda position: (getattr(courses[position], column).casefold(), position)
+    expected = sorted(positions, key=key)
+    assert list(store.sort_positions(positions, column)) == expected
+    assert list(store.sort_positions(positions, column, descending=True)) == expected[::-1]
+    assert list(store.sort_positions(positions, None, descending=True)) == list(positions)[::-1]
+
+
+def test_fuzzy_search_tolerates_typos(store, courses):
+    positions = store.fuzzy_search("pyhton gide")
+    assert positions
+    best = normalize(store.title_at(positions[0]))
+    assert "python" in best and "guide" in best
+    assert all(courses[position].category == "Design" for position in store.fuzzy_search("grafic", category="Design"))
+    assert store.fuzzy_search("python", budget_ms=0) == []
+
+
+def test_caches_stay_bounded(store, monkeypatch):
+    monkeypatch.setattr(store_module, "QUERY_CACHE_SIZE", 4)
+    monkeypatch.setattr(store_module, "BITMAP_CACHE_SIZE", 5)
+    for number in range(40):
+        store.filter_positions(text=str(number))
+        store.query_positions(f"guide -{number}")
+    assert len(store._query_cache) <= 4
+    assert len(store._bitmaps) <= 5
+
+
+def multilingual_catalog(path, courses):
+    """Write ``courses`` as a two-language catalog: English titles and "Khóa học ..." in Vietnamese."""
+    rows = []
+    for course in courses:
+        row = course.model_dump()
+        row["title"] = {"en": course.title, "vi": "Khóa học " + course.title.lower()}
+        rows.append(row)
+    categories = [{"name": name, "subcategories": subs} for name, subs in CATEGORIES.items()]
+    data = {"metadata": {"version": 2}, "categories": {"en": categories, "vi": categories}, "courses": rows}
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def test_language_switch_swaps_title_search(tmp_path, courses):
+    path = tmp_path / "multi.json"
+    multilingual_catalog(path, courses)
+    store = CatalogStore()
+    assert store.load_from_json(str(path), "en")
+    assert store.languages() == ["en", "vi"]
+    assert store.filter_positions(text="khoa hoc") == []
+    store.set_language("vi")
+    assert list(store.filter_positions(text="khoa hoc")) == list(range(len(courses)))
+    assert list(store.filter_positions(text="hoc guide")) == \
+        [position for position, course in enumerate(courses) if normalize(course.title).startswith("guide")]
+    assert store.title_at(0).startswith("Khóa học")
+    store.set_language("en")
+    assert list(store.filter_positions(text="guide")) == reference_filter(courses, text="guide")
+
+
+@pytest.mark.parametrize("trusted", [False, True], ids=["validated", "trusted"])
+def test_invalid_rows_are_reported(tmp_path, courses, trusted):
+    rows = [course.model_dump() for course in courses[:10]]
+    del rows[3]["link"]
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps({"categories": [], "courses": rows}), encoding="utf-8")
+    store = CatalogStore()
+    assert store.load_from_json(str(path), trusted=trusted)
+    assert len(store) == 9
+    assert len(store.load_errors) == 1 and "courses[3]" in store.load_errors[0]
+
+
+def test_snapshot_round_trip(catalog_path, courses):
+    first = CatalogStore()
+    assert first.load_from_json(str(catalog_path), use_snapshot=True)
+    second = CatalogStore()
+    assert second.load_snapshot(str(catalog_path))
+    assert [second.course_at(position).id for position in range(len(second))] == [course.id for course in courses]
+    assert list(second.filter_positions("English", text="guide")) == reference_filter(courses, "English", text="guide")
+
+    # A changed catalog makes the snapshot stale
+    catalog_path.write_text(catalog_path.read_text(encoding="utf-8") + " ", encoding="utf-8")
+    assert not CatalogStore().load_snapshot(str(catalog_path))
+
+
+def test_snapshot_is_encoded_without_the_lock(catalog_path, monkeypatch):
+    store = CatalogStore()
+    assert store.load_from_json(str(catalog_path))
+    encode = store_module.encode_payload
+    locked = []
+
+    def try_lock():
+        acquired = store._lock.acquire(timeout=1)
+        if acquired:
+            store._lock.release()
+        locked.append(acquired)
+
+    def encode_and_check(payload):
+        # Another thread must be able to take the lock meanwhile
+        thread = threading.Thread(target=try_lock)
+        thread.start()
+        thread.join()
+        return encode(payload)
+
+    monkeypatch.setattr(store_module, "encode_payload", encode_and_check)
+    assert store.save_snapshot(str(catalog_path))
+    assert locked == [True]
+    assert CatalogStore().load_snapshot(str(catalog_path))
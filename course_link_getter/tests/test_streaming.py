@@ -0,0 +1,60 @@
+import functools
+import io
+import json
+
+import pytest
+
+from core import store as store_module
+from core.store import CatalogStore
+from core.streaming import iter_json_object
+
+DOCUMENTS = [
+    '{}',
+    '{"courses": []}',
+    '{"metadata": 1.5, "courses": []}',
+    '{"courses": [1.25, 300], "x": 2}',
+    '{"a": -12e-3, "b": 6.02E+23, "courses": [0, -0.5, 1e5], "c": 7}',
+    '{"a": true, "b": null, "courses": [false, "x, y", {"k": [1, {"l": "]"}]}], "z": "}"}',
+    ' { "courses" : [ { "title" : "Tiếng Việt \\u00e9\\"" } ] , "categories" : { "en" : [ ] } } ',
+    '{"courses": {"not": "an array"}, "n": 10}',
+]
+
+
+def members(document: str) -> list:
+    """(key, value) pairs ``iter_json_object`` should yield for a document, from ``json.loads``."""
+    pairs = []
+    for key, value in json.loads(document).items():
+        if key == "courses" and isinstance(value, list):
+            pairs.extend((key, element) for element in value)
+        else:
+            pairs.append((key, value))
+    return pairs
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 64 * 1024])
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_members_match_json_load(document, chunk_size):
+    assert list(iter_json_object(io.StringIO(document), "courses", chunk_size=chunk_size)) == members(document)
+
+
+@pytest.mark.parametrize("document", ['{"courses": [1, 2', '{"a" 1}', '[1]', '{"a": 1.5'])
+def test_malformed_documents_raise(document):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_object(io.StringIO(document), "courses", chunk_size=2))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_iter_load_json_matches_load_from_json(catalog_path, courses, chunk_size, monkeypatch):
+    monkeypatch.setattr(store_module, "iter_json_object", functools.partial(iter_json_object, chunk_size=chunk_size))
+    streamed = CatalogStore()
+    batches = list(streamed.iter_load_json(str(catalog_path), batch_size=64))
+    assert [len(batch) for batch in batches] == [64, 64, 64, 64, 44]
+
+    loaded = CatalogStore()
+    assert loaded.load_from_json(str(catalog_path))
+    data = json.loads(catalog_path.read_text(encoding="utf-8"))
+    assert [course.id for batch in batches for course in batch] == [row["id"] for row in data["courses"]]
+    assert [streamed.course_at(position) for position in range(len(streamed))] == courses
+    assert streamed.list_categories() == loaded.list_categories()
+    assert list(streamed.filter_positions("English", text="guide")) == \
+        list(loaded.filter_positions("English", text="guide"))
@@ -0,0 +1,24 @@
+from ui_pyqt5.workers import LanguageSignals, LanguageWorker, SnapshotSignals, SnapshotWorker
+
+
+def test_snapshot_save_failure_is_signalled(store, monkeypatch, capsys):
+    def fail(path):
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr(store, "save_snapshot", fail)
+    signals = SnapshotSignals()
+    results = []
+    signals.saved.connect(results.append)
+    SnapshotWorker(store, signals, "catalog.json", save=True).run()
+    assert results == [False]
+    assert "read-only" in capsys.readouterr().out
+
+
+def test_language_worker_builds_the_sort_order(store):
+    signals = LanguageSignals()
+    results = []
+    signals.finished.connect(results.append)
+    LanguageWorker(store, "vi", signals, sort_key="title").run()
+    assert results == ["vi"]
+    assert store.language_code == "vi"
+    assert store.has_sort_order("title")
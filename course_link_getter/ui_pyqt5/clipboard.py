@@ -0,0 +1,128 @@
+import shutil
+import subprocess
+import sys
+from abc import ABC, abstractmethod
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+from PyQt5.QtCore import QByteArray, QMimeData
+from PyQt5.QtGui import QGuiApplication
+
+# Lines encoded and appended to the clipboard data per step of a batch copy
+CLIPBOARD_CHUNK_LINES = 4096
+
+
+def _iter_chunks(lines: Iterable[str]) -> Iterator[bytes]:
+    """Encode lines as newline-separated UTF-8, a block of lines at a time."""
+    lines = iter(lines)
+    separator = b""
+    while True:
+        block = list(islice(lines, CLIPBOARD_CHUNK_LINES))
+        if not block:
+            return
+        yield separator + "\n".join(block).encode('utf-8')
+        separator = b"\n"
+
+
+class ClipboardBackend(ABC):
+    """Puts text on the system clipboard.
+
+    ``copy_lines`` takes any iterable, so large link sets are encoded
+    block by block instead of being joined into one string first.
+    """
+
+    def copy_text(self, text: str) -> bool:
+        return self.copy_lines((text,))
+
+    @abstractmethod
+    def copy_lines(self, lines: Iterable[str]) -> bool:
+        """Copy the lines, newline-separated; returns False on failure."""
+
+
+class QtClipboardBackend(ClipboardBackend):
+    """In-process clipboard of the running QGuiApplication.
+
+    Falls back to ``fallback`` when there is no application instance.
+    """
+
+    def __init__(self, fallback: Optional[ClipboardBackend] = None):
+        self.fallback = fallback
+
+    def copy_text(self, text: str) -> bool:
+        app = QGuiApplication.instance()
+        if app is None:
+            return self.fallback.copy_text(text) if self.fallback else False
+        app.clipboard().setText(text)
+        return True
+
+    def copy_lines(self, lines: Iterable[str]) -> bool:
+        app = QGuiApplication.instance()
+        if app is None:
+            return self.fallback.copy_lines(lines) if self.fallback else False
+        data = QByteArray()
+        for chunk in _iter_chunks(lines):
+            data.append(chunk)
+        mime = QMimeData()
+        mime.setData("text/plain;charset=utf-8", data)
+        mime.setData("text/plain", data)
+        app.clipboard().setMimeData(mime)
+        return True
+
+
+class SubprocessClipboardBackend(ClipboardBackend):
+    """Pipes text into pbcopy, clip, wl-copy, xclip or xsel.
+
+    Lines are streamed to the tool's stdin in blocks.
+    """
+
+    def __init__(self, command: Optional[List[str]] = None):
+        self.command = command
+
+    @staticmethod
+    def find_command() -> Optional[List[str]]:
+        """Return the first clipboard tool available on this platform."""
+        if sys.platform == "darwin":  # macOS
+            candidates = [["pbcopy"]]
+        elif sys.platform == "win32":  # Windows
+            candidates = [["clip"]]
+        else:  # Linux
+            candidates = [["wl-copy"], ["xclip", "-selection", "clipboard"], ["xsel", "--clipboard", "--input"]]
+        for command in candidates:
+            if shutil.which(command[0]):
+                return command
+        return None
+
+    def copy_lines(self, lines: Iterable[str]) -> bool:
+        command = self.command or self.find_command()
+        if command is None:
+            print("Error copying to clipboard: no clipboard tool found")
+            return False
+        try:
+            process = subprocess.Popen(command, stdin=subprocess.PIPE)
+            try:
+                for chunk in _iter_chunks(lines):
+                    process.stdin.write(chunk)
+            finally:
+                process.stdin.close()
+            return process.wait() == 0
+        except OSError as e:
+            print(f"Error copying to clipboard: {e}")
+            return False
+
+
+class FakeClipboardBackend(ClipboardBackend):
+    """Records copies in memory; for headless use and tests."""
+
+    def __init__(self):
+        self.text = ""
+        self.copies = 0
+
+    def copy_lines(self, lines: Iterable[str]) -> bool:
+        self.text = b"".join(_iter_chunks(lines)).decode('utf-8')
+        self.copies += 1
+        return True
+
+
+def default_clipboard_backend() -> ClipboardBackend:
+    """Qt's clipboard, with the platform's command-line tool as a fallback."""
+    return QtClipboardBackend(fallback=SubprocessClipboardBackend())
@@ -2,23 +2,24 @@ from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout, QVBoxLayout,
     QSplitter, QMessageBox, QFileDialog, QApplication,
     QLabel, QLineEdit, QComboBox, QPushButton, QTableView,
-    QAbstractItemView, QHeaderView, QGraphicsOpacityEffect
+    QAbstractItemView, QHeaderView, QGraphicsOpacityEffect, QProgressDialog, QCheckBox
 )
-from PyQt5.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, pyqtProperty
+from PyQt5.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, pyqtProperty, QThreadPool
 from PyQt5.QtWidgets import QAction
 from PyQt5.QtGui import QKeySequence, QFont
-from typing import List
+from typing import Dict, Optional, Sequence
 import sys
-import subprocess
-import csv
 from datetime import datetime
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from .widgets.results_view import CourseTableModel, ButtonDelegate
+from .clipboard import ClipboardBackend, default_clipboard_backend
+from .widgets.results_view import FETCH_BATCH_SIZE, CourseTableModel, ButtonDelegate
+from .workers import (ExportSignals, ExportWorker, FilterSignals, FilterWorker, FuzzyIndexWorker,
+                      LanguageSignals, LanguageWorker, SnapshotSignals, SnapshotWorker)
+from core.export import export_format
 from core.store import CatalogStore
-from core.models import Course
 # from core.translations import init_translations, tr
 
 def tr(key: str, **kwargs) -> str:
@@ -27,6 +28,7 @@ def tr(key: str, **kwargs) -> str:
         "search_placeholder": "Search courses...",
         "category_all": "All Categories",
         "subcategory_all": "All Subcategories",
+        "domain_all": "All Domains",
         "show_all": "All Results",
         "export_csv": "Export CSV",
         "copy_links": "Copy Visible Links",
@@ -45,6 +47,16 @@ def init_translations(app):
     return None
 
 
+# Delay after the last keystroke before the search runs
+SEARCH_DEBOUNCE_MS = 150
+
+# Courses parsed per event-loop turn while the catalog streams in
+LOAD_BATCH_SIZE = 2000
+
+# Names shown in the language selector; other codes are shown as-is
+LANGUAGE_NAMES = {"en": "English", "vi": "Tiếng Việt"}
+
+
 from PyQt5.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel, QGraphicsOpacityEffect
 from PyQt5.QtCore import Qt, QPropertyAnimation, QEasingCurve, QTimer, QPoint
 from PyQt5.QtGui import QGuiApplication, QCursor
@@ -214,18 +226,63 @@ class NotificationWidget(QWidget):
 class MainWindow(QMainWindow):
     """Main application window."""
     
-    def __init__(self):
+    def __init__(self, search_debounce_ms: int = SEARCH_DEBOUNCE_MS,
+                 clipboard: Optional[ClipboardBackend] = None):
         super().__init__()
         self.store = CatalogStore()
-        self.current_courses: List[Course] = []
+        self.clipboard = clipboard if clipboard is not None else default_clipboard_backend()
+        
+        # Filtering runs on a single background thread; only the result of
+        # the latest request (generation) is applied to the table
+        self.search_debounce_ms = search_debounce_ms
+        self._filter_generation = 0
+        self._filter_order = (None, False)  # (sort column, descending) of the pending result
+        # Facet counts of the current result: {"category": {name: count}, ...}
+        self._facets: Dict[str, Dict[str, int]] = {}
+        self._filter_pool = QThreadPool(self)
+        self._filter_pool.setMaxThreadCount(1)
+        self._filter_signals = FilterSignals()
+        self._filter_signals.finished.connect(self._on_filter_finished)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.timeout.connect(self._on_filters_changed)
+        
+        # Exports are written by a separate thread so filtering stays responsive
+        self._export_pool = QThreadPool(self)
+        self._export_pool.setMaxThreadCount(1)
+        self._export_signals = ExportSignals()
+        self._export_signals.progress.connect(self._on_export_progress)
+        self._export_signals.finished.connect(self._on_export_finished)
+        self._export_signals.cancelled.connect(self._on_export_cancelled)
+        self._export_signals.failed.connect(self._on_export_failed)
+        self._export_worker = None
+        self._export_progress = None
         
         # Disable translations
         self.translation_manager = init_translations(QApplication.instance())
         
-        # Load data first before setting up UI
-        self._load_initial_data()
+        # Catalog loading state (courses stream in after the window is shown)
+        self._loader = None
+        self._catalog_path: Optional[Path] = None
+        self._streaming_rows = False
+        self._load_timer = QTimer(self)
+        self._load_timer.timeout.connect(self._load_next_batch)
+        # Snapshots are read on the filter thread (queries submitted meanwhile
+        # run after the load); snapshot writes and index builds run on a
+        # background thread of their own
+        self._snapshot_signals = SnapshotSignals()
+        self._snapshot_signals.loaded.connect(self._on_snapshot_loaded)
+        self._snapshot_signals.saved.connect(self._on_snapshot_saved)
+        self._background_pool = QThreadPool(self)
+        self._background_pool.setMaxThreadCount(1)
+        # Language switches also run on the filter thread, ahead of later queries
+        self._language_signals = LanguageSignals()
+        self._language_signals.finished.connect(self._on_language_switched)
+        
+        # Show the window first, then fill the table progressively
         self._setup_ui()
         self._connect_signals()
+        self._load_initial_data()
         
         # Create notification widget
         self.notification = NotificationWidget(self)
@@ -242,6 +299,7 @@ class MainWindow(QMainWindow):
         # Update combo boxes
         self.category_combo.setItemText(0, tr("category_all"))
         self.subcategory_combo.setItemText(0, tr("subcategory_all"))
+        self.domain_combo.setItemText(0, tr("domain_all"))
         
         # Update buttons
         self.show_all_btn.setText(tr("show_all"))
@@ -260,9 +318,25 @@ class MainWindow(QMainWindow):
         # Update button delegate text
         self.button_delegate.button_text = tr("get_link")
         
+        # Titles come from the store's active language; repaint only what is on screen
+        self._refresh_visible_rows()
+        
         # Update status
         self.statusBar().showMessage(tr("status_ready"))
     
+    def _refresh_visible_rows(self):
+        """Re-read the titles of the rows currently on screen.
+        
+        Off-screen rows read the store when they are scrolled into view.
+        """
+        first = self.table_view.rowAt(0)
+        if first < 0:
+            return
+        last = self.table_view.rowAt(self.table_view.viewport().height() - 1)
+        if last < 0:
+            last = self.model.rowCount() - 1
+        self.model.refresh_titles(first, last)
+    
     def _on_window_move(self, event):
         """Handle window move event to reposition notification."""
         if hasattr(self, 'notification') and self.notification.isVisible():
@@ -551,6 +625,10 @@ class MainWindow(QMainWindow):
         
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText(tr("search_placeholder"))
+        self.search_input.setToolTip(
+            'Terms must all match. Use "quotes" for phrases, -term to exclude,\n'
+            "and category:, sub:, link:, domain: or id: to search other fields."
+        )
         self.search_input.setFixedWidth(200)
         self.search_input.setStyleSheet("""
             QLineEdit {
@@ -567,6 +645,17 @@ class MainWindow(QMainWindow):
         """)
         row1_layout.addWidget(self.search_input)
         
+        # Typo-tolerant search (ranked best match first)
+        self.fuzzy_checkbox = QCheckBox("Fuzzy")
+        self.fuzzy_checkbox.setToolTip("Tolerate typos; results are ranked by similarity")
+        self.fuzzy_checkbox.setStyleSheet("""
+            QCheckBox {
+                color: #333333;
+                font-size: 13px;
+            }
+        """)
+        row1_layout.addWidget(self.fuzzy_checkbox)
+        
         # Category section
         category_label = QLabel("Category:")
         category_label.setStyleSheet("""
@@ -580,7 +669,7 @@ class MainWindow(QMainWindow):
         
         self.category_combo = QComboBox()
         self.category_combo.addItem(tr("category_all"))
-        self.category_combo.setFixedWidth(150)
+        self.category_combo.setFixedWidth(190)
         self.category_combo.setStyleSheet("""
             QComboBox {
                 background-color: white;
@@ -637,7 +726,7 @@ class MainWindow(QMainWindow):
         
         self.subcategory_combo = QComboBox()
         self.subcategory_combo.addItem(tr("subcategory_all"))
-        self.subcategory_combo.setFixedWidth(150)
+        self.subcategory_combo.setFixedWidth(190)
         self.subcategory_combo.setStyleSheet("""
             QComboBox {
                 background-color: white;
@@ -684,11 +773,31 @@ class MainWindow(QMainWindow):
         # Add spacer to push everything to the left
         row1_layout.addStretch()
         
-        # Row 2: Language selector and Action buttons
+        # Row 2: Domain and language selectors and Action buttons
         row2_layout = QHBoxLayout()
         row2_layout.setSpacing(15)
         
-        # Language selector removed
+        domain_label = QLabel("Domain:")
+        domain_label.setStyleSheet(category_label.styleSheet())
+        row2_layout.addWidget(domain_label)
+        
+        self.domain_combo = QComboBox()
+        self.domain_combo.addItem(tr("domain_all"))
+        self.domain_combo.setFixedWidth(190)
+        self.domain_combo.setStyleSheet(self.category_combo.styleSheet())
+        row2_layout.addWidget(self.domain_combo)
+        
+        # Language selector, shown only for catalogs with several languages
+        self.language_label = QLabel("Language:")
+        self.language_label.setStyleSheet(category_label.styleSheet())
+        row2_layout.addWidget(self.language_label)
+        
+        self.language_combo = QComboBox()
+        self.language_combo.setFixedWidth(150)
+        self.language_combo.setStyleSheet(self.category_combo.styleSheet())
+        row2_layout.addWidget(self.language_combo)
+        self.language_label.setVisible(False)
+        self.language_combo.setVisible(False)
         row2_layout.addStretch()
         
         # Add spacer
@@ -879,7 +988,7 @@ class MainWindow(QMainWindow):
         """)
         
         # Set up the model
-        self.model = CourseTableModel()
+        self.model = CourseTableModel(self.store)
         self.table_view.setModel(self.model)
         
         # Set up button delegate for Actions column
@@ -897,6 +1006,8 @@ class MainWindow(QMainWindow):
         header.setSectionResizeMode(3, QHeaderView.Interactive)  # Action
         
         # Enable sorting and selection
+        # Start unsorted: enabling sorting re-sorts by the current indicator
+        self.table_view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
         self.table_view.setSortingEnabled(True)
         self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table_view.setAlternatingRowColors(True)
@@ -919,7 +1030,7 @@ class MainWindow(QMainWindow):
         file_menu = menubar.addMenu("&File")
         
         # Export action
-        export_action = QAction("&Export to CSV...", self)
+        export_action = QAction("&Export Results...", self)
         export_action.setShortcut(QKeySequence.Save)
         export_action.triggered.connect(self._export_to_csv)
         file_menu.addAction(export_action)
@@ -943,10 +1054,13 @@ class MainWindow(QMainWindow):
         """Connect all signals and slots."""
         # Search input
         self.search_input.textChanged.connect(self._on_search_changed)
+        self.fuzzy_checkbox.toggled.connect(self._on_filters_changed)
         
         # Category and subcategory dropdowns
-        self.category_combo.currentTextChanged.connect(self._on_category_changed)
-        self.subcategory_combo.currentTextChanged.connect(self._on_subcategory_changed)
+        self.category_combo.currentIndexChanged.connect(self._on_category_changed)
+        self.subcategory_combo.currentIndexChanged.connect(self._on_subcategory_changed)
+        self.domain_combo.currentIndexChanged.connect(self._on_filters_changed)
+        self.language_combo.currentIndexChanged.connect(self._on_language_changed)
         
         # Action buttons
         self.show_all_btn.clicked.connect(self._show_all_courses)
@@ -955,36 +1069,127 @@ class MainWindow(QMainWindow):
         
         # Table view signals
         self.table_view.clicked.connect(self._on_table_clicked)
-        
-        # Load initial data into the UI
-        self._load_categories()
-        self._on_filters_changed()
     
     def _load_categories(self):
-        """Load categories into the dropdown."""
+        """Load categories into the dropdown.
+        
+        Every item keeps the bare name as its data; the text may carry a
+        facet count ("Python (12,431)").
+        """
         categories = self.store.list_categories()
         
         # Clear and populate category combo
         self.category_combo.clear()
-        self.category_combo.addItem("All Categories")
+        self.category_combo.addItem(tr("category_all"))
         
         for category in categories:
-            self.category_combo.addItem(category.name)
+            self.category_combo.addItem(category.name, category.name)
         
         # Clear subcategory combo initially
         self.subcategory_combo.clear()
-        self.subcategory_combo.addItem("All Subcategories")
+        self.subcategory_combo.addItem(tr("subcategory_all"))
         self.subcategory_combo.setEnabled(False)
+        self._show_facets()
+    
+    def _load_domains(self):
+        """Load the link domains of the catalog, most common first, into the dropdown."""
+        self.domain_combo.blockSignals(True)
+        self.domain_combo.clear()
+        self.domain_combo.addItem(tr("domain_all"))
+        for domain in self.store.domain_counts():
+            if domain:
+                self.domain_combo.addItem(domain, domain)
+        self.domain_combo.blockSignals(False)
+        self._show_facets()
+    
+    def _show_facets(self, facets: Optional[Dict[str, Dict[str, int]]] = None):
+        """Show course counts next to the dropdown entries.
+        
+        Without ``facets`` the counts of the last filter result are shown
+        again, e.g. after a dropdown was refilled.
+        """
+        if facets is not None:
+            self._facets = facets
+        for combo, facet in ((self.category_combo, "category"), (self.subcategory_combo, "subcategory"),
+                             (self.domain_combo, "domain")):
+            counts = self._facets.get(facet)
+            for index in range(1, combo.count()):
+                name = combo.itemData(index)
+                combo.setItemText(index, f"{name} ({counts.get(name, 0):,})" if counts is not None else name)
+    
+    def _load_languages(self):
+        """Offer the catalog's languages; the selector stays hidden for one language."""
+        languages = self.store.languages()
+        self.language_combo.blockSignals(True)
+        self.language_combo.clear()
+        for code in languages:
+            self.language_combo.addItem(LANGUAGE_NAMES.get(code, code), code)
+        self.language_combo.setCurrentIndex(max(0, self.language_combo.findData(self.store.language_code)))
+        self.language_combo.blockSignals(False)
+        
+        multilingual = len(languages) > 1
+        self.language_label.setVisible(multilingual)
+        self.language_combo.setVisible(multilingual)
+    
+    def _on_language_changed(self, index: int):
+        """Switch the catalog language in place, without reloading it."""
+        language_code = self.language_combo.itemData(index)
+        if not language_code or language_code == self.store.language_code:
+            return
+        # Building a new language's index takes seconds; switch on the worker
+        self.language_combo.setEnabled(False)
+        self._filter_pool.start(LanguageWorker(
+            self.store, language_code, self._language_signals, sort_key=self.model.sort_key,
+        ))
+    
+    def _on_language_switched(self, language_code: str):
+        """Show the categories, results and sort order of the language a LanguageWorker switched to."""
+        self.language_combo.setEnabled(True)
+        self.language_combo.blockSignals(True)
+        self.language_combo.setCurrentIndex(max(0, self.language_combo.findData(language_code)))
+        self.language_combo.blockSignals(False)
+        self._background_pool.start(FuzzyIndexWorker(self.store))
+        
+        # Category trees are parallel across languages; keep the selection by position
+        category_index = self.category_combo.currentIndex()
+        subcategory_index = self.subcategory_combo.currentIndex()
+        self.category_combo.blockSignals(True)
+        self.subcategory_combo.blockSignals(True)
+        self._load_categories()
+        if 0 < category_index < self.category_combo.count():
+            self.category_combo.setCurrentIndex(category_index)
+            self._load_subcategories(self.category_combo.currentData())
+            if 0 < subcategory_index < self.subcategory_combo.count():
+                self.subcategory_combo.setCurrentIndex(subcategory_index)
+        self.category_combo.blockSignals(False)
+        self.subcategory_combo.blockSignals(False)
+        
+        header = self.table_view.horizontalHeader()
+        if self._has_active_filters():
+            # Title matches and category names depend on the language
+            self._on_filters_changed()
+        elif header.sortIndicatorSection() == 0:
+            self.model.sort(0, header.sortIndicatorOrder())
+        else:
+            self.model.refresh_titles(0, self.model.rowCount() - 1)
+        self._update_ui_text()
     
     def _on_search_changed(self, text):
-        """Handle search text change."""
-        self._on_filters_changed()
+        """Handle search text change (debounced while typing)."""
+        self._search_timer.start(self.search_debounce_ms)
     
-    def _on_category_changed(self, category_name):
+    def _on_category_changed(self, index: int):
         """Handle category selection change."""
-        if category_name == "All Categories":
+        self.subcategory_combo.blockSignals(True)
+        self._load_subcategories(self.category_combo.itemData(index))
+        self.subcategory_combo.blockSignals(False)
+        self._on_filters_changed()
+    
+    def _load_subcategories(self, category_name: Optional[str]):
+        """Fill the subcategory dropdown for the selected category (None for all)."""
+        if category_name is None:
             self.subcategory_combo.clear()
-            self.subcategory_combo.addItem("All Subcategories")
+            self.subcategory_combo.addItem(tr("subcategory_all"))
             self.subcategory_combo.setEnabled(False)
         else:
             # Find the selected category and populate subcategories
@@ -992,33 +1197,28 @@ class MainWindow(QMainWindow):
             for category in categories:
                 if category.name == category_name:
                     self.subcategory_combo.clear()
-                    self.subcategory_combo.addItem("All Subcategories")
+                    self.subcategory_combo.addItem(tr("subcategory_all"))
                     for subcategory in category.subcategories:
-                        self.subcategory_combo.addItem(subcategory)
+                        self.subcategory_combo.addItem(subcategory, subcategory)
                     self.subcategory_combo.setEnabled(True)
+                    self._show_facets()
                     break
-        
-        self._on_filters_changed()
     
-    def _on_subcategory_changed(self, subcategory_name):
+    def _on_subcategory_changed(self, index: int):
         """Handle subcategory selection change."""
         self._on_filters_changed()
     
     def _on_button_clicked(self, row: int):
         """Handle button click in Actions column."""
-        course = self.model.get_course(row)
-        if course:
-            self._copy_course_link(course)
+        self._copy_course_link(row)
     
     def _on_table_clicked(self, index):
         """Handle table cell click."""
         if index.column() == 5:  # Action column
-            course = self.model.get_course(index.row())
-            if course:
-                self._copy_course_link(course)
+            self._copy_course_link(index.row())
     
     def _load_initial_data(self):
-        """Load initial data from legacy single-language catalog only."""
+        """Start streaming the legacy single-language catalog into the table."""
         # Try multiple possible paths for the catalog file
         possible_paths = [
             # Development path
@@ -1036,81 +1236,206 @@ class MainWindow(QMainWindow):
             print(f"🔍 Trying catalog path: {legacy_path}")
             if legacy_path.exists():
                 print(f"✅ Found catalog at: {legacy_path}")
-                if self.store.load_from_json(str(legacy_path)):
-                    print(f"✅ Loaded {len(self.store.list_all())} courses from legacy catalog")
-                    return True
-                else:
-                    print(f"❌ Failed to load data from: {legacy_path}")
+                self._start_loading(legacy_path)
+                return True
             else:
                 print(f"❌ Catalog not found at: {legacy_path}")
         
         print("❌ Failed to load catalog data from any path")
+        self._finish_loading()
         return False
     
+    def _start_loading(self, path: Path):
+        """Load the catalog's snapshot in the background, or else parse the catalog."""
+        self.model.set_rows(range(0))
+        self._streaming_rows = True
+        self._catalog_path = path
+        # Sorting while rows stream in would re-sort every batch
+        self.table_view.horizontalHeader().setSectionsClickable(False)
+        self.statusBar().showMessage("Loading courses...")
+        self._filter_pool.start(SnapshotWorker(self.store, self._snapshot_signals, str(path)))
+    
+    def _on_snapshot_loaded(self, loaded: bool):
+        """Show a snapshot-loaded catalog, or parse the JSON one batch per event-loop turn."""
+        if loaded:
+            if self._streaming_rows:
+                self.model.append_rows(range(len(self.store.courses)))
+            self._finish_loading()
+            return
+        self._loader = self.store.iter_load_json(str(self._catalog_path), batch_size=LOAD_BATCH_SIZE)
+        self._load_timer.start(0)
+    
+    def _on_snapshot_saved(self, saved: bool):
+        """Tell the user when the next launch will have to parse the catalog again."""
+        if not saved:
+            self.statusBar().showMessage("Could not save the catalog snapshot; the next start will be slower", 5000)
+    
+    def _load_next_batch(self):
+        """Add the next parsed batch to the store and, when unfiltered, to the table."""
+        batch = next(self._loader, None)
+        if batch is None:
+            self._finish_loading()
+            # Next launch loads the snapshot instead of parsing the JSON
+            self._background_pool.start(
+                SnapshotWorker(self.store, self._snapshot_signals, str(self._catalog_path), save=True)
+            )
+            return
+        
+        # While a filter result is shown the new rows are left out; the
+        # result is refreshed once loading completes
+        if self._streaming_rows:
+            total = len(self.store.courses)
+            self.model.append_rows(range(total - len(batch), total))
+            self._update_results_summary()
+        self.statusBar().showMessage(f"Loading courses... {len(self.store.courses)} loaded")
+    
+    def _finish_loading(self):
+        """Populate the category dropdown and refresh results once loading ends."""
+        self._load_timer.stop()
+        self._loader = None
+        self.table_view.horizontalHeader().setSectionsClickable(True)
+        print(f"✅ Loaded {len(self.store.courses)} courses from legacy catalog")
+        
+        self.category_combo.blockSignals(True)
+        self.subcategory_combo.blockSignals(True)
+        self._load_categories()
+        self.category_combo.blockSignals(False)
+        self.subcategory_combo.blockSignals(False)
+        self._load_domains()
+        self._load_languages()
+        # Have the fuzzy search index ready before the first fuzzy keystroke
+        self._background_pool.start(FuzzyIndexWorker(self.store))
+        
+        if self._streaming_rows:
+            self._streaming_rows = False
+            self._show_facets(self.store.facet_counts())
+            self._update_results_summary()
+        else:
+            self._on_filters_changed()
+    
+    def _has_active_filters(self) -> bool:
+        """Whether the search box or dropdowns currently restrict the results."""
+        return bool(
+            self.search_input.text().strip()
+            or self.category_combo.currentData()
+            or self.subcategory_combo.currentData()
+            or self.domain_combo.currentData()
+        )
+    
     def _on_filters_changed(self):
-        """Handle any filter change - get filtered courses and update results."""
-        # Get current filter values
+        """Handle any filter change - filter in the background and update results."""
+        self._search_timer.stop()
+        
+        # Get current filter values (item data is None for the "All" entries)
         search_text = self.search_input.text().strip()
-        category = self.category_combo.currentText()
-        subcategory = self.subcategory_combo.currentText()
-        
-        # Apply filters
-        courses = self.store.filter(
-            category=category if category != "All Categories" else None,
-            subcategory=subcategory if subcategory != "All Subcategories" else None,
-            text=search_text if search_text else None
+        category = self.category_combo.currentData()
+        subcategory = self.subcategory_combo.currentData()
+        domain = self.domain_combo.currentData()
+        
+        self._filter_generation += 1
+        
+        # While loading without filters the table is filled batch by batch
+        if self._loader is not None and not self._has_active_filters():
+            self.model.set_rows(range(len(self.store.courses)))
+            self._streaming_rows = True
+            self._update_results_summary()
+            return
+        
+        # Apply filters on the worker thread
+        worker = FilterWorker(
+            self.store,
+            self._filter_signals,
+            self._filter_generation,
+            category=category,
+            subcategory=subcategory,
+            text=search_text if search_text else None,
+            is_current=lambda generation: generation == self._filter_generation,
+            fuzzy=self.fuzzy_checkbox.isChecked(),
+            # Without a sort column, text matches are shown best first
+            ranked=self.model.sort_key is None,
+            domain=domain,
+            sort_key=self.model.sort_key,
+            descending=self.model.sort_descending,
+            # Everything the table will show right away is ranked on the worker
+            prefetch=max(self.model.rowCount(), FETCH_BATCH_SIZE),
         )
+        self._filter_order = (worker.sort_key, worker.descending)
+        self._filter_pool.start(worker)
+    
+    def _on_filter_finished(self, generation: int, rows: Sequence[int], facets: Dict[str, Dict[str, int]]):
+        """Apply a filter result and its facet counts unless a newer query has been submitted since."""
+        if generation != self._filter_generation:
+            return
         
-        self.current_courses = courses
-        self.model.set_courses(courses)
+        self._streaming_rows = False
+        self.model.set_rows(rows, order=self._filter_order)
+        self._show_facets(facets)
+        self._update_results_summary()
+    
+    @property
+    def current_rows(self) -> Sequence[int]:
+        """Store positions of the courses in the current result."""
+        return self.model.rows
+    
+    def _update_results_summary(self):
+        """Refresh the results count, button states and status bar."""
+        count = len(self.current_rows)
         
         # Update results count
-        self.results_count_label.setText(f"Loaded {len(courses)} courses")
+        self.results_count_label.setText(f"Loaded {count} courses")
         
         # Update button states
-        self.export_csv_btn.setEnabled(len(courses) > 0)
-        self.copy_links_btn.setEnabled(len(courses) > 0)
+        self.export_csv_btn.setEnabled(count > 0)
+        self.copy_links_btn.setEnabled(count > 0)
         
         # Update status with filtered/total information
-        total_courses = len(self.store.list_all())
-        if len(courses) == total_courses:
+        total_courses = len(self.store.courses)
+        if count == total_courses:
             self.statusBar().showMessage(f"{total_courses} total courses")
         else:
-            self.statusBar().showMessage(f"{len(courses)} results (filtered from {total_courses} total)")
+            self.statusBar().showMessage(f"{count} results (filtered from {total_courses} total)")
     
     def _show_all_courses(self):
         """Show all courses without filters."""
         # Clear all filters
+        for combo in (self.category_combo, self.subcategory_combo, self.domain_combo):
+            combo.blockSignals(True)
         self.search_input.clear()
-        self.category_combo.setCurrentText("All Categories")
-        self.subcategory_combo.setCurrentText("All Subcategories")
-        self.subcategory_combo.setEnabled(False)
+        self.category_combo.setCurrentIndex(0)
+        self._load_subcategories(None)
+        self.domain_combo.setCurrentIndex(0)
+        for combo in (self.category_combo, self.subcategory_combo, self.domain_combo):
+            combo.blockSignals(False)
         self._on_filters_changed()
     
-    def _copy_course_link(self, course: Course):
-        """Copy a single course link to clipboard."""
-        if self._copy_to_clipboard(course.link):
+    def _copy_course_link(self, row: int):
+        """Copy the link of a table row to clipboard."""
+        link = self.model.get_link(row)
+        if link is None:
+            return
+        # Title in the active language; multilingual courses store a dict
+        title = self.model.get_title(row)
+        if self._copy_to_clipboard(link):
             # Show popup notification
-            self.notification.show_notification(f"✓ Copied: {course.title[:30]}...")
+            self.notification.show_notification(f"✓ Copied: {title[:30]}...")
             # Also update status bar
-            self.statusBar().showMessage(f"Copied link for: {course.title}")
+            self.statusBar().showMessage(f"Copied link for: {title}")
         else:
             self._show_error("Failed to copy link to clipboard")
     
     def _copy_all_links(self):
         """Copy all visible course links to clipboard."""
-        if not self.current_courses:
+        if not self.current_rows:
             self._show_error("No courses to copy")
             return
         
-        links = [course.link for course in self.current_courses]
-        links_text = "\n".join(links)
-        
-        if self._copy_to_clipboard(links_text):
+        # Links are streamed to the clipboard without joining them first
+        count = len(self.current_rows)
+        if self.clipboard.copy_lines(map(self.store.link_at, self.current_rows)):
             # Show popup notification
-            self.notification.show_notification(f"✓ Copied {len(links)} links to clipboard")
+            self.notification.show_notification(f"✓ Copied {count} links to clipboard")
             # Also update status bar
-            self.statusBar().showMessage(f"Copied {len(links)} links to clipboard")
+            self.statusBar().showMessage(f"Copied {count} links to clipboard")
         else:
             self._show_error("Failed to copy links to clipboard")
     
@@ -1152,7 +1477,7 @@ class MainWindow(QMainWindow):
                 opened_count += 1
             except Exception as e:
                 failed_count += 1
-                print(f"Failed to open {course.title}: {e}")
+                print(f"Failed to open {course.get_title(self.store.language_code)}: {e}")
         
         # Show result message
         if failed_count == 0:
@@ -1164,58 +1489,67 @@ class MainWindow(QMainWindow):
     
     def _copy_to_clipboard(self, text: str) -> bool:
         """Copy text to system clipboard."""
-        try:
-            if sys.platform == "darwin":  # macOS
-                subprocess.run(["pbcopy"], input=text, text=True, check=True)
-            elif sys.platform == "win32":  # Windows
-                subprocess.run(["clip"], input=text, text=True, check=True)
-            else:  # Linux
-                subprocess.run(["xclip", "-selection", "clipboard"], input=text, text=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        return self.clipboard.copy_text(text)
     
     def _export_to_csv(self):
-        """Export current courses to CSV file."""
-        if not self.current_courses:
+        """Export the current results to CSV, JSON Lines or columnar in the background."""
+        if not self.current_rows:
             self._show_error("No courses to export")
             return
+        if self._export_worker is not None:
+            self._show_error("An export is already running")
+            return
         
         # Get save file path
         file_path, _ = QFileDialog.getSaveFileName(
             self, 
-            "Export Courses to CSV", 
+            "Export Courses", 
             f"courses_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            "CSV Files (*.csv)"
+            "CSV Files (*.csv);;JSON Lines (*.jsonl);;Columnar Files (*.clgc)"
         )
         
         if not file_path:
             return
         
-        try:
-            with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                # Export only the specified columns: title, category, subcategory, link
-                fieldnames = ['title', 'category', 'subcategory', 'link']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                for course in self.current_courses:
-                    writer.writerow({
-                        'title': course.title,
-                        'category': course.category,
-                        'subcategory': course.subcategory,
-                        'link': course.link
-                    })
-            
-            QMessageBox.information(self, "Export Complete", f"Exported {len(self.current_courses)} courses to {file_path}")
-            self.statusBar().showMessage(f"Exported {len(self.current_courses)} courses to CSV")
-            
-        except PermissionError:
-            QMessageBox.critical(self, "Export Error", "Permission denied. Please choose a different location or close the file if it's open.")
-        except OSError as e:
-            QMessageBox.critical(self, "Export Error", f"File system error: {str(e)}")
-        except Exception as e:
-            QMessageBox.critical(self, "Export Error", f"Failed to export CSV: {str(e)}")
+        export_type = export_format(file_path)
+        if export_type is None:
+            file_path += ".csv"
+            export_type = "csv"
+        
+        # The result is exported as it is now, even if the filters change meanwhile
+        positions = self.current_rows
+        self._export_worker = ExportWorker(self.store, self._export_signals, positions, file_path, export_type)
+        self._export_progress = QProgressDialog("Exporting courses...", "Cancel", 0, len(positions), self)
+        self._export_progress.setWindowTitle("Export")
+        self._export_progress.setWindowModality(Qt.WindowModal)
+        self._export_progress.setMinimumDuration(300)
+        self._export_progress.canceled.connect(self._export_worker.cancel_event.set)
+        self._export_pool.start(self._export_worker)
+        self.statusBar().showMessage(f"Exporting {len(positions)} courses...")
+    
+    def _on_export_progress(self, done: int, total: int):
+        if self._export_progress is not None:
+            self._export_progress.setValue(done)
+    
+    def _on_export_finished(self, written: int, file_path: str):
+        self._close_export_progress()
+        QMessageBox.information(self, "Export Complete", f"Exported {written} courses to {file_path}")
+        self.statusBar().showMessage(f"Exported {written} courses to {Path(file_path).name}")
+    
+    def _on_export_cancelled(self):
+        self._close_export_progress()
+        self.statusBar().showMessage("Export cancelled")
+    
+    def _on_export_failed(self, message: str):
+        self._close_export_progress()
+        QMessageBox.critical(self, "Export Error", message)
+    
+    def _close_export_progress(self):
+        self._export_worker = None
+        if self._export_progress is not None:
+            self._export_progress.canceled.disconnect()
+            self._export_progress.close()
+            self._export_progress = None
     
     def _show_error(self, message: str):
         """Show an error message."""
@@ -3,17 +3,30 @@ from PyQt5.QtWidgets import (
     QPushButton, QLabel, QAbstractItemView, QMessageBox, QMenu,
     QToolTip, QApplication, QStyledItemDelegate, QStyleOptionButton, QStyle
 )
-from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal, QTimer, QRect, QSize
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal, QTimer, QRect, QSize, QThreadPool
 from PyQt5.QtWidgets import QAction
 from PyQt5.QtGui import QKeySequence, QPainter, QFontMetrics, QColor, QPen
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
+from bisect import bisect_left
 import webbrowser
-import subprocess
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from core.models import Course
+from core.ranking import RankedPositions
+from core.store import CatalogStore
+from ..clipboard import ClipboardBackend, default_clipboard_backend
+from ..workers import RankSignals, RankWorker, SortSignals, SortWorker
+
+# Rows handed to the view per fetchMore call
+FETCH_BATCH_SIZE = 1000
+
+# Above this many changed row runs a model reset is cheaper than a diff
+MAX_DIFF_RUNS = 64
+
+# Store sort column for each sortable table column
+SORT_COLUMN_KEYS = {0: "title", 1: "category", 2: "subcategory"}
 
 def tr(key: str, **kwargs) -> str:
     """Simple translation function - returns English defaults."""
@@ -101,11 +114,36 @@ class ButtonDelegate(QStyledItemDelegate):
 
 
 class CourseTableModel(QAbstractTableModel):
-    """Table model for displaying courses."""
+    """Table model for displaying courses.
     
-    def __init__(self, courses: List[Course] = None):
+    Holds only the store positions of the current result; cell text is read
+    from the store when the view paints it. Rows are handed to the view in
+    batches through canFetchMore/fetchMore, so a new result costs time in
+    proportion to the visible rows, not to the size of the result.
+    
+    Sorting reorders the positions with the store's precomputed sort
+    permutations; the sort column and order stay in effect for later results.
+    A permutation that is not built yet is built on a background thread and
+    the rows are sorted when it is ready.
+    """
+    
+    def __init__(self, store: Optional[CatalogStore] = None):
         super().__init__()
-        self.courses = courses or []
+        self.store = store if store is not None else CatalogStore()
+        self.rows: Sequence[int] = range(0)
+        self._loaded = 0  # rows exposed to the view so far
+        self._sort_key: Optional[str] = None  # store sort column, None for catalog order
+        self._sort_descending = False
+        self._course_store: Optional[CatalogStore] = None  # store behind set_courses
+        self._course_positions: Dict[int, int] = {}  # id() of a course -> its position there
+        # Later pages of lazily ranked rows, and sort permutations, are built on a background thread
+        self._ranking: Optional[RankedPositions] = None  # rows being ranked
+        self._rank_pool = QThreadPool(self)
+        self._rank_pool.setMaxThreadCount(1)
+        self._rank_signals = RankSignals()
+        self._rank_signals.finished.connect(self._on_ranked)
+        self._sort_signals = SortSignals()
+        self._sort_signals.finished.connect(self._on_sort_ready)
         # Remove Provider and Tags columns
         self.headers = [
             tr("table_headers.title"),
@@ -115,28 +153,58 @@ class CourseTableModel(QAbstractTableModel):
         ]
     
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
-        return len(self.courses)
+        if parent.isValid():
+            return 0
+        return self._loaded
     
     def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
         return len(self.headers)
     
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and self._loaded < len(self.rows)
+    
+    def fetchMore(self, parent: QModelIndex = QModelIndex()):
+        """Expose the next batch of rows to the view."""
+        if parent.isValid():
+            return
+        count = min(FETCH_BATCH_SIZE, len(self.rows) - self._loaded)
+        if count <= 0 or self._rank_pending(self._loaded + count):
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+    
+    def _rank_pending(self, count: int) -> bool:
+        """Rank lazy rows up to ``count`` in the background; True until they are ranked."""
+        rows = self.rows
+        if not isinstance(rows, RankedPositions) or rows.ranked_count >= count:
+            return False
+        if self._ranking is not rows:
+            self._ranking = rows
+            self._rank_pool.start(RankWorker(rows, count, self._rank_signals))
+        return True
+    
+    def _on_ranked(self, rows: RankedPositions, count: int):
+        """Fetch the rows a RankWorker ranked, if they are still shown."""
+        if self._ranking is rows:
+            self._ranking = None
+        if rows is self.rows and rows.ranked_count >= count:
+            self.fetchMore()
+    
     def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
         if not index.isValid():
             return None
         
-        course = self.courses[index.row()]
+        position = self.rows[index.row()]
         col = index.column()
         
-        # Get current language for multilingual data
-        current_language = "en"
-        
         if role == Qt.DisplayRole:
             if col == 0:  # Title
-                return course.get_title(current_language)
+                return self.store.title_at(position)  # store's active language
             elif col == 1:  # Category
-                return course.category
+                return self.store.category_at(position)
             elif col == 2:  # Subcategory
-                return course.subcategory
+                return self.store.subcategory_at(position)
             elif col == 3:  # Actions
                 return ""  # Empty text, button delegate will handle display
         elif role == Qt.ToolTipRole:
@@ -162,17 +230,239 @@ class CourseTableModel(QAbstractTableModel):
             return self.headers[section]
         return None
     
-    def set_courses(self, courses: List[Course]):
-        """Update the courses data."""
+    @property
+    def sort_key(self) -> Optional[str]:
+        """Store column the rows are sorted by, or None."""
+        return self._sort_key
+    
+    @property
+    def sort_descending(self) -> bool:
+        """Whether the sort column is in descending order."""
+        return self._sort_descending
+    
+    def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder):
+        """Sort the current and all later results by a column.
+        
+        Column -1 restores catalog order; the actions column is not sortable.
+        """
+        if column >= 0 and column not in SORT_COLUMN_KEYS:
+            return
+        self._sort_key = SORT_COLUMN_KEYS.get(column)
+        self._sort_descending = self._sort_key is not None and order == Qt.DescendingOrder
+        if self._sort_key is not None and not self.store.has_sort_order(self._sort_key):
+            self._rank_pool.start(SortWorker(self.store, self._sort_key, self._sort_signals))
+            return
+        self._apply_sort()
+    
+    def _on_sort_ready(self, store: CatalogStore, column: str):
+        """Sort by a column whose permutation a SortWorker built, if it is still the sort column."""
+        if store is self.store and column == self._sort_key:
+            self._apply_sort()
+    
+    def _apply_sort(self):
+        """Put the rows in the current sort order, keeping the selection on the same courses."""
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        positions = [self.rows[index.row()] for index in persistent]
+        self.rows = self.store.sort_positions(self.rows, self._sort_key, self._sort_descending)
+        
+        # Keep selected and current rows on the same courses
+        if persistent:
+            new_rows = {position: row for row, position in enumerate(self.rows[:self._loaded])}
+            self.changePersistentIndexList(persistent, [
+                self.index(new_rows[position], index.column()) if position in new_rows else QModelIndex()
+                for index, position in zip(persistent, positions)
+            ])
+        self.layoutChanged.emit()
+    
+    def refresh_titles(self, first: int, last: int):
+        """Tell the view that titles changed (e.g. language switch) in a row range."""
+        if self._loaded:
+            last = min(last, self._loaded - 1)
+            self.dataChanged.emit(self.index(first, 0), self.index(last, 0), [Qt.DisplayRole])
+    
+    def set_rows(self, rows: Sequence[int], store: Optional[CatalogStore] = None,
+                 order: Optional[tuple] = None):
+        """Show the courses at the given store positions.
+        
+        The rows are put in the current sort order first; without one they
+        are shown as given (catalog or relevance order), and lazy sequences
+        such as ranked results are only read as far as rows are fetched.
+        ``order`` is the (sort column, descending) the rows are already in,
+        e.g. when a FilterWorker sorted them.
+        For the same store, the new result is diffed against the fetched
+        rows by position and only the runs that changed are removed or
+        inserted, so the selection and scroll position survive, also when
+        the order changed (e.g. relevance order).
+        """
+        if store is not None and store is not self.store:
+            self.beginResetModel()
+            self.store = store
+            self.rows = range(0)
+            self._loaded = 0
+            self.endResetModel()
+        if self._sort_key is not None and order != (self._sort_key, self._sort_descending):
+            rows = self.store.sort_positions(rows, self._sort_key, self._sort_descending)
+        if self._apply_diff(rows):
+            return
         self.beginResetModel()
-        self.courses = courses
+        self.rows = rows
+        self._loaded = min(FETCH_BATCH_SIZE, len(rows))
         self.endResetModel()
     
+    def _diff_runs(self, rows: Sequence[int], count: int) -> Optional[List[tuple]]:
+        """Diff the fetched rows against the first ``count`` of ``rows``.
+        
+        Rows are matched by position, in whatever order either result has:
+        the longest run of old rows that keeps its relative order in the new
+        result stays, everything else is removed or inserted. Returns
+        ("keep" | "remove", count) and ("insert", count, start) runs, or
+        None when there are too many runs.
+        """
+        old = self.rows[:self._loaded]
+        new = rows[:count]
+        new_index = {position: j for j, position in enumerate(new)}
+        
+        # Longest increasing subsequence of the old rows' new indexes
+        tails: List[int] = []  # new index ending the best run of each length
+        tail_rows: List[int] = []  # old row holding that index
+        previous = [-1] * len(old)
+        for i, position in enumerate(old):
+            j = new_index.get(position)
+            if j is None:
+                continue
+            length = bisect_left(tails, j)
+            if length == len(tails):
+                tails.append(j)
+                tail_rows.append(i)
+            else:
+                tails[length] = j
+                tail_rows[length] = i
+            previous[i] = tail_rows[length - 1] if length else -1
+        kept = set()
+        i = tail_rows[-1] if tail_rows else -1
+        while i >= 0:
+            kept.add(old[i])
+            i = previous[i]
+        
+        runs = []
+        
+        def push(kind: str, start: int):
+            if runs and runs[-1][0] == kind:
+                runs[-1][1] += 1
+            else:
+                runs.append([kind, 1, start])
+        
+        i = j = 0
+        while i < len(old) or j < len(new):
+            if i < len(old) and old[i] not in kept:
+                push("remove", i)
+                i += 1
+            elif j < len(new) and new[j] not in kept:
+                push("insert", j)
+                j += 1
+            else:
+                push("keep", j)
+                i += 1
+                j += 1
+            if len(runs) > MAX_DIFF_RUNS:
+                return None
+        return runs
+    
+    def _apply_diff(self, rows: Sequence[int]) -> bool:
+        """Update the model with minimal row removals and insertions."""
+        # Keep at least as many rows fetched as before
+        runs = self._diff_runs(rows, min(len(rows), max(self._loaded, FETCH_BATCH_SIZE)))
+        if runs is None:
+            return False
+        
+        # Mutate a copy of the fetched rows so that the model stays
+        # consistent with the view after every removal and insertion
+        visible = list(self.rows[:self._loaded])
+        self.rows = visible
+        row = 0
+        for kind, count, start in runs:
+            if kind == "keep":
+                row += count
+            elif kind == "remove":
+                self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+                del visible[row:row + count]
+                self._loaded = len(visible)
+                self.endRemoveRows()
+            else:
+                self.beginInsertRows(QModelIndex(), row, row + count - 1)
+                visible[row:row] = rows[start:start + count]
+                self._loaded = len(visible)
+                self.endInsertRows()
+                row += count
+        self.rows = rows
+        return True
+    
+    def set_courses(self, courses: List[Course]):
+        """Show a plain list of courses.
+        
+        The courses go into one store kept by the model, and courses shown
+        before keep their position, so a new list is diffed like a new
+        search result instead of resetting the view.
+        """
+        courses = list(courses)
+        store = self._course_store
+        if store is None or len(store) > 2 * len(courses) + FETCH_BATCH_SIZE:
+            # Start over rather than keep growing with courses no longer shown
+            store = self._course_store = CatalogStore()
+            self._course_positions = {}
+        # Courses are matched by identity; the store keeps them alive
+        added = [course for course in courses if id(course) not in self._course_positions]
+        for position, course in enumerate(added, len(store)):
+            self._course_positions[id(course)] = position
+        store.add_courses(added)
+        self.set_rows([self._course_positions[id(course)] for course in courses], store)
+    
+    def append_rows(self, rows: Sequence[int]):
+        """Append store positions at the end without resetting the model."""
+        if not rows:
+            return
+        if self._sort_key is not None:
+            self.set_rows(list(self.rows) + list(rows))
+            return
+        if isinstance(self.rows, range) and isinstance(rows, range) and self.rows.stop == rows.start:
+            self.rows = range(self.rows.start, rows.stop)
+        else:
+            self.rows = list(self.rows) + list(rows)
+        
+        # Keep the first batch visible; later rows are fetched on scroll
+        count = min(FETCH_BATCH_SIZE - self._loaded, len(rows))
+        if count > 0:
+            self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+            self._loaded += count
+            self.endInsertRows()
+    
+    def result_count(self) -> int:
+        """Number of courses in the current result, fetched or not."""
+        return len(self.rows)
+    
     def get_course(self, row: int) -> Optional[Course]:
         """Get course at specific row."""
-        if 0 <= row < len(self.courses):
-            return self.courses[row]
+        if 0 <= row < self._loaded:
+            return self.store.course_at(self.rows[row])
         return None
+    
+    def get_title(self, row: int) -> Optional[str]:
+        """Get the display title (active language) at a specific row."""
+        if 0 <= row < self._loaded:
+            return self.store.title_at(self.rows[row])
+        return None
+    
+    def get_link(self, row: int) -> Optional[str]:
+        """Get the link at a specific row without building the course."""
+        if 0 <= row < self._loaded:
+            return self.store.link_at(self.rows[row])
+        return None
+    
+    def iter_courses(self):
+        """Iterate all courses of the current result, including unfetched rows."""
+        for position in self.rows:
+            yield self.store.course_at(position)
 
 
 class ResultsView(QWidget):
@@ -182,8 +472,9 @@ class ResultsView(QWidget):
     course_link_requested = pyqtSignal(Course)
     course_open_requested = pyqtSignal(Course)
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, clipboard: Optional[ClipboardBackend] = None):
         super().__init__(parent)
+        self.clipboard = clipboard if clipboard is not None else default_clipboard_backend()
         self._setup_ui()
         self._setup_context_menu()
         self._setup_keyboard_shortcuts()
@@ -331,6 +622,8 @@ class ResultsView(QWidget):
         self.table_view = QTableView()
         self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table_view.setAlternatingRowColors(True)
+        # Start unsorted: enabling sorting re-sorts by the current indicator
+        self.table_view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
         self.table_view.setSortingEnabled(True)
         
         # Enable multi-selection for "Open Selected" functionality
@@ -373,6 +666,11 @@ class ResultsView(QWidget):
         self.model.set_courses(courses)
         self.results_label.setText(f"Results: {len(courses)} courses")
     
+    def set_rows(self, store: CatalogStore, rows: Sequence[int]):
+        """Display the courses at the given positions of ``store``."""
+        self.model.set_rows(rows, store)
+        self.results_label.setText(f"Results: {len(rows)} courses")
+    
     def _on_double_clicked(self, index: QModelIndex):
         """Handle double-click on table row."""
         course = self.model.get_course(index.row())
@@ -392,7 +690,7 @@ class ResultsView(QWidget):
     
     def get_all_visible_courses(self) -> List[Course]:
         """Get all currently visible courses."""
-        return self.model.courses.copy()
+        return list(self.model.iter_courses())
     
     def _setup_context_menu(self):
         """Setup context menu for table rows."""
@@ -454,11 +752,11 @@ class ResultsView(QWidget):
         """Show context menu at the given position."""
         index = self.table_view.indexAt(position)
         if index.isValid():
-            course = self.model.get_course(index.row())
-            if course:
+            title = self.model.get_title(index.row())
+            if title is not None:
                 # Update action text with course title
-                self.copy_action.setText(f"Copy Link: {course.title[:30]}...")
-                self.open_action.setText(f"Open Link: {course.title[:30]}...")
+                self.copy_action.setText(f"Copy Link: {title[:30]}...")
+                self.open_action.setText(f"Open Link: {title[:30]}...")
                 
                 # Show context menu
                 self.context_menu.exec_(self.table_view.mapToGlobal(position))
@@ -500,16 +798,7 @@ class ResultsView(QWidget):
     
     def _copy_to_clipboard(self, text: str) -> bool:
         """Copy text to system clipboard."""
-        try:
-            if sys.platform == "darwin":  # macOS
-                subprocess.run(["pbcopy"], input=text, text=True, check=True)
-            elif sys.platform == "win32":  # Windows
-                subprocess.run(["clip"], input=text, text=True, check=True)
-            else:  # Linux
-                subprocess.run(["xclip", "-selection", "clipboard"], input=text, text=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        return self.clipboard.copy_text(text)
     
     def _show_feedback(self, message: str, is_error: bool = False):
         """Show non-blocking feedback message."""
@@ -0,0 +1,262 @@
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+from typing import Callable, Optional, Sequence
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.export import ExportCancelled, export_rows
+from core.store import CatalogStore
+
+
+class FilterSignals(QObject):
+    """Signals emitted by FilterWorker back to the UI thread."""
+
+    # Emits (generation, store positions of the matching courses, facet counts)
+    finished = pyqtSignal(int, object, object)
+
+
+class FilterWorker(QRunnable):
+    """Run CatalogStore.search off the UI thread.
+
+    Every request carries a generation number; the window only applies the
+    result of the latest generation, so superseded queries are discarded.
+    With ``fuzzy`` a text query runs CatalogStore.fuzzy_search instead,
+    whose result is ranked by similarity rather than in catalog order;
+    with ``ranked`` it runs CatalogStore.ranked_search, best match first.
+    ``text`` is in the query syntax of ``core.query``. The facet counts
+    (per category, subcategory and domain) come with every result.
+    With ``sort_key`` the result is put in that column's order here, and
+    the first ``prefetch`` rows of a lazily ranked or sorted result are
+    produced before it is emitted, so the UI thread only reads them.
+    """
+
+    def __init__(self, store: CatalogStore, signals: FilterSignals, generation: int,
+                 category: Optional[str], subcategory: Optional[str], text: Optional[str],
+                 is_current: Callable[[int], bool], fuzzy: bool = False, ranked: bool = False,
+                 domain: Optional[str] = None, sort_key: Optional[str] = None,
+                 descending: bool = False, prefetch: int = 0):
+        super().__init__()
+        self.store = store
+        self.signals = signals
+        self.generation = generation
+        self.category = category
+        self.subcategory = subcategory
+        self.text = text
+        self.is_current = is_current
+        self.fuzzy = fuzzy
+        self.ranked = ranked
+        self.domain = domain
+        self.sort_key = sort_key
+        self.descending = descending
+        self.prefetch = prefetch
+
+    def run(self):
+        """Filter the store unless a newer query was already submitted."""
+        if not self.is_current(self.generation):
+            return
+        try:
+            if self.fuzzy and self.text:
+                rows = self.store.fuzzy_search(
+                    self.text, category=self.category, subcategory=self.subcategory, domain=self.domain,
+                )
+                facets = self.store.facet_counts(rows)
+            else:
+                rows, facets = self.store.search(
+                    self.text,
+                    category=self.category,
+                    subcategory=self.subcategory,
+                    domain=self.domain,
+                    ranked=self.ranked,
+                )
+            if self.sort_key is not None:
+                rows = self.store.sort_positions(rows, self.sort_key, self.descending)
+            if self.prefetch and len(rows):
+                rows[min(self.prefetch, len(rows)) - 1]  # ranks lazy results up to there
+        except Exception as e:
+            print(f"Error filtering courses: {e}")
+            rows, facets = [], {}
+        self.signals.finished.emit(self.generation, rows, facets)
+
+
+class RankSignals(QObject):
+    """Signals emitted by RankWorker back to the UI thread."""
+
+    # Emits (the ranked sequence, rows ranked)
+    finished = pyqtSignal(object, int)
+
+
+class RankWorker(QRunnable):
+    """Rank a lazy result (RankedPositions) up to ``count`` rows off the UI thread."""
+
+    def __init__(self, rows: Sequence[int], count: int, signals: RankSignals):
+        super().__init__()
+        self.rows = rows
+        self.count = count
+        self.signals = signals
+
+    def run(self):
+        try:
+            self.rows[self.count - 1]
+        except Exception as e:
+            print(f"Error ranking courses: {e}")
+        self.signals.finished.emit(self.rows, self.count)
+
+
+class SortSignals(QObject):
+    """Signals emitted by SortWorker back to the UI thread."""
+
+    # Emits (the store, the column whose sort permutation was built)
+    finished = pyqtSignal(object, str)
+
+
+class SortWorker(QRunnable):
+    """Build a store's sort permutation for a column off the UI thread, ahead of sorting by it."""
+
+    def __init__(self, store: CatalogStore, column: str, signals: SortSignals):
+        super().__init__()
+        self.store = store
+        self.column = column
+        self.signals = signals
+
+    def run(self):
+        try:
+            self.store.sort_rank(self.column)
+        except Exception as e:
+            print(f"Error sorting courses: {e}")
+        self.signals.finished.emit(self.store, self.column)
+
+
+class LanguageSignals(QObject):
+    """Signals emitted by LanguageWorker back to the UI thread."""
+
+    # Emits the language code that is now active
+    finished = pyqtSignal(str)
+
+
+class LanguageWorker(QRunnable):
+    """Switch the store's language off the UI thread.
+
+    A language without title tables yet gets its index built, which takes
+    seconds on large catalogs. With ``sort_key`` the new sort permutation
+    for that column is built as well, so the UI can re-sort right away.
+    """
+
+    def __init__(self, store: CatalogStore, language_code: str, signals: LanguageSignals,
+                 sort_key: Optional[str] = None):
+        super().__init__()
+        self.store = store
+        self.language_code = language_code
+        self.signals = signals
+        self.sort_key = sort_key
+
+    def run(self):
+        try:
+            self.store.set_language(self.language_code)
+            if self.sort_key is not None:
+                self.store.sort_rank(self.sort_key)
+        except Exception as e:
+            print(f"Error switching the catalog language: {e}")
+        self.signals.finished.emit(self.store.language_code)
+
+
+class SnapshotSignals(QObject):
+    """Signals emitted by SnapshotWorker back to the UI thread."""
+
+    # Emits whether a current snapshot was loaded
+    loaded = pyqtSignal(bool)
+    # Emits whether a snapshot was written
+    saved = pyqtSignal(bool)
+
+
+class SnapshotWorker(QRunnable):
+    """Load a catalog snapshot into the store, or with ``save`` write one, off the UI thread.
+
+    Reading checks the source's content hash and unpickles the indexes,
+    and writing pickles them; both take seconds on large catalogs.
+    """
+
+    def __init__(self, store: CatalogStore, signals: SnapshotSignals, path: str, save: bool = False):
+        super().__init__()
+        self.store = store
+        self.signals = signals
+        self.path = path
+        self.save = save
+
+    def run(self):
+        if self.save:
+            try:
+                saved = self.store.save_snapshot(self.path)
+            except Exception as e:
+                print(f"Error saving catalog snapshot: {e}")
+                saved = False
+            self.signals.saved.emit(saved)
+            return
+        try:
+            loaded = self.store.load_snapshot(self.path)
+        except Exception as e:
+            print(f"Error loading catalog snapshot: {e}")
+            loaded = False
+        self.signals.loaded.emit(loaded)
+
+
+class FuzzyIndexWorker(QRunnable):
+    """Build the store's fuzzy search index off the UI thread, ahead of the first fuzzy query."""
+
+    def __init__(self, store: CatalogStore):
+        super().__init__()
+        self.store = store
+
+    def run(self):
+        try:
+            self.store.prepare_fuzzy_index()
+        except Exception as e:
+            print(f"Error building the fuzzy search index: {e}")
+
+
+class ExportSignals(QObject):
+    """Signals emitted by ExportWorker back to the UI thread."""
+
+    # Emits (rows written, total rows)
+    progress = pyqtSignal(int, int)
+    # Emits (rows written, file path)
+    finished = pyqtSignal(int, str)
+    cancelled = pyqtSignal()
+    # Emits an error message
+    failed = pyqtSignal(str)
+
+
+class ExportWorker(QRunnable):
+    """Write a result set to a file with core.export off the UI thread.
+
+    Setting ``cancel_event`` stops the export after the current chunk.
+    """
+
+    def __init__(self, store: CatalogStore, signals: ExportSignals, positions: Sequence[int],
+                 path: str, format: str):
+        super().__init__()
+        self.store = store
+        self.signals = signals
+        self.positions = positions
+        self.path = path
+        self.format = format
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        try:
+            written = export_rows(
+                self.store, self.positions, self.path, self.format,
+                progress=self.signals.progress.emit,
+                cancel=self.cancel_event,
+            )
+        except ExportCancelled:
+            self.signals.cancelled.emit()
+        except PermissionError:
+            self.signals.failed.emit("Permission denied. Please choose a different location or close the file if it's open.")
+        except OSError as e:
+            self.signals.failed.emit(f"File system error: {str(e)}")
+        except Exception as e:
+            self.signals.failed.emit(f"Failed to export: {str(e)}")
+        else:
+            self.signals.finished.emit(written, self.path)